@@ -1,19 +1,69 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.utils.translation import gettext_lazy as _
 from parler.admin import TranslatableAdmin
 
-from .models import Address, Municipality, PostalCodeArea, Street
+from .models import (
+    Address,
+    Municipality,
+    PostalCodeArea,
+    Street,
+)
+from .services.area_update import update_area
+
+
+class AddressSearchAdminMixin:
+    """
+    Tells that the changes are not seen by the API until the data derived from
+    the objects, e.g. the address search view, is refreshed with the
+    refresh_address_data command. Refreshing it takes too long to do while
+    responding.
+    """
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        self._warn_not_refreshed(request)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        self._warn_not_refreshed(request)
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        self._warn_not_refreshed(request)
+
+    def _warn_not_refreshed(self, request) -> None:
+        self.message_user(
+            request,
+            _(
+                "The API shows the changes once the address data has been "
+                "refreshed with the refresh_address_data command."
+            ),
+            messages.WARNING,
+        )
+
+
+class AreaAdmin(AddressSearchAdminMixin, TranslatableAdmin):
+    """
+    Updates the subdivision of an edited area and the addresses within it, like
+    the importers do, see services.area_update. Its simplifications and the
+    topology are updated by the refresh_address_data command.
+    """
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if "area" in form.changed_data:
+            update_area(obj)
 
 
 @admin.register(Municipality)
-class MunicipalityAdmin(TranslatableAdmin):
+class MunicipalityAdmin(AreaAdmin):
     list_display = ("id", "code")
     ordering = ("id",)
     search_fields = ("id",)
 
 
 @admin.register(Street)
-class StreetAdmin(TranslatableAdmin):
+class StreetAdmin(AddressSearchAdminMixin, TranslatableAdmin):
     list_display = ("name_column", "municipality")
     search_fields = ("translations__name",)
 
@@ -32,14 +82,14 @@ class StreetAdmin(TranslatableAdmin):
 
 
 @admin.register(PostalCodeArea)
-class PostalCodeAreaAdmin(TranslatableAdmin):
+class PostalCodeAreaAdmin(AreaAdmin):
     list_display = ("postal_code", "name")
     ordering = ("postal_code",)
     search_fields = ("postal_code",)
 
 
 @admin.register(Address)
-class AddressAdmin(admin.ModelAdmin):
+class AddressAdmin(AddressSearchAdminMixin, admin.ModelAdmin):
     list_display = ("street", "number", "municipality", "postal_code_area")
     raw_id_fields = ["street"]
     ordering = ("street", "number", "municipality")
@@ -0,0 +1,153 @@
+"""
+Address representations built as JSON by PostgreSQL, in the same format as
+AddressSearchSerializer produces them when the areas are not requested. This
+saves running the serializers in Python for every row of a page.
+
+The area geometries are also formatted by PostgreSQL, so that their full
+precision coordinates are not read into Python.
+"""
+
+from django.contrib.gis.db.models.functions import AsGeoJSON
+from django.db.models import BinaryField, Func, TextField, Value
+from django.db.models.expressions import Combinable, RawSQL
+from django.utils import timezone
+
+from ..models import AddressSearch
+from .twkb import MAX_TWKB_PRECISION
+
+
+def _translations_sql(field: str) -> str:
+    """The non-null translations of a flattened field, see _translations."""
+    return "json_strip_nulls(json_build_object({}))".format(
+        ", ".join(
+            f"'{language}', {field}_{language}" for language in AddressSearch.LANGUAGES
+        )
+    )
+
+
+def _any_translation_sql(field: str) -> str:
+    return "coalesce({}) IS NOT NULL".format(
+        ", ".join(f"{field}_{language}" for language in AddressSearch.LANGUAGES)
+    )
+
+
+def _translations_in_languages_sql(field: str) -> str:
+    """The translations of a flattened field in the postal code area languages."""
+    values = " ".join(
+        f"WHEN '{language}' THEN {field}_{language}"
+        for language in AddressSearch.LANGUAGES
+    )
+    return (
+        f"(SELECT json_object_agg(language, CASE language {values} END "
+        "ORDER BY ordinality) "
+        "FROM unnest(postal_code_area_languages) WITH ORDINALITY "
+        "AS postal_code_area_language (language, ordinality))"
+    )
+
+
+# The ISO 8601 format of DRF, e.g. 2024-05-01T12:00:00.123456+03:00, in which
+# the microseconds are left out if they are zero, and UTC is written as Z
+_MODIFIED_AT_SQL = """
+to_char(modified_at AT TIME ZONE %s, 'YYYY-MM-DD"T"HH24:MI:SS')
+|| CASE
+    WHEN mod(date_part('microseconds', modified_at)::integer, 1000000) = 0 THEN ''
+    ELSE to_char(modified_at AT TIME ZONE %s, '.US')
+END
+|| (
+    SELECT CASE
+        WHEN utc_offset = 0 THEN 'Z'
+        ELSE
+            CASE WHEN utc_offset < 0 THEN '-' ELSE '+' END
+            || to_char(make_interval(secs => abs(utc_offset)), 'HH24:MI')
+    END
+    FROM (
+        SELECT extract(
+            epoch FROM (modified_at AT TIME ZONE %s) - (modified_at AT TIME ZONE 'UTC')
+        )::integer AS utc_offset
+    ) utc_offsets
+)
+"""
+
+_ADDRESS_JSON_SQL = f"""
+json_build_object(
+    'street', CASE
+        WHEN {_any_translation_sql("street_name")}
+        THEN json_build_object('name', {_translations_sql("street_name")})
+        ELSE '{{}}'::json
+    END,
+    'number', number,
+    'number_end', number_end,
+    'letter', letter,
+    'postal_code_area', CASE
+        WHEN postal_code_area_id IS NULL THEN NULL
+        WHEN cardinality(postal_code_area_languages) = 0 THEN json_build_object(
+            'postal_code', postal_code,
+            'area', NULL
+        )
+        ELSE json_build_object(
+            'postal_code', postal_code,
+            'area', NULL,
+            'name', {_translations_in_languages_sql("postal_code_area_name")},
+            'post_office', {_translations_in_languages_sql("post_office")}
+        )
+    END,
+    'location', ST_AsGeoJSON(location, %s)::json,
+    'modified_at', {_MODIFIED_AT_SQL},
+    'municipality', CASE
+        WHEN {_any_translation_sql("municipality_name")} THEN json_build_object(
+            'code', municipality_code,
+            'area', NULL,
+            'name', {_translations_sql("municipality_name")}
+        )
+        ELSE json_build_object('code', municipality_code, 'area', NULL)
+    END
+)::text
+"""
+
+
+def address_json(precision: int) -> RawSQL:
+    """
+    The JSON representation of each address, as text, with the coordinates
+    rounded to the precision.
+    """
+    time_zone = timezone.get_current_timezone_name()
+    return RawSQL(_ADDRESS_JSON_SQL, [precision, time_zone, time_zone, time_zone])
+
+
+def _binary(function: str, *expressions) -> Func:
+    return Func(*expressions, function=function, output_field=BinaryField())
+
+
+def _base64(binary: Func) -> Func:
+    # encode() breaks the base64 into lines of 76 characters
+    return Func(
+        Func(binary, Value("base64"), function="encode", output_field=TextField()),
+        Value("\n"),
+        Value(""),
+        function="translate",
+        output_field=TextField(),
+    )
+
+
+def formatted_area(area: Combinable, area_format: str, precision: int) -> Func:
+    """
+    The area geometry in the format, see serializers.AREA_FORMATS, with the
+    coordinates rounded to the precision. WKB keeps the full precision.
+    """
+    if area_format == "geojson":
+        return AsGeoJSON(area, precision=precision)
+    if area_format == "ewkt":
+        return Func(
+            area, Value(precision), function="ST_AsEWKT", output_field=TextField()
+        )
+    if area_format == "wkb":
+        return Func(
+            _binary("ST_AsBinary", area),
+            Value("hex"),
+            function="encode",
+            output_field=TextField(),
+        )
+    if area_format == "wkb_base64":
+        return _base64(_binary("ST_AsBinary", area))
+    twkb_precision = Value(min(precision, MAX_TWKB_PRECISION))
+    return _base64(_binary("ST_AsTWKB", area, twkb_precision))
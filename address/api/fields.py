@@ -1,14 +1,45 @@
+from functools import cached_property
+
 from django.conf import settings
 from django.contrib.gis.geos import Point
 from rest_framework import serializers
+from rest_framework.exceptions import ParseError
+
+# Maximum number of decimals of the coordinates, i.e. the full double precision
+MAX_COORDINATE_PRECISION = 15
+
+
+def coordinate_precision(context: dict) -> int:
+    """
+    The number of decimals of the coordinates in the output, given by the
+    `precision` parameter or settings.COORDINATE_PRECISION.
+    """
+    request = context.get("request")
+    value = request.query_params.get("precision") if request else None
+    if value is None:
+        return settings.COORDINATE_PRECISION
+    try:
+        precision = int(value)
+    except ValueError:
+        raise ParseError("'precision' must be an integer")
+    if not 0 <= precision <= MAX_COORDINATE_PRECISION:
+        raise ParseError(
+            f"'precision' must be between 0 and {MAX_COORDINATE_PRECISION}"
+        )
+    return precision
 
 
 class LocationField(serializers.Field):
     """
     A serializer field that represents a location (a Point instance).
     This uses the projection defined in settings.PROJECTION_SRID.
+    The coordinates are rounded to the requested precision.
     """
 
+    @cached_property
+    def _precision(self) -> int:
+        return coordinate_precision(self.context)
+
     def to_internal_value(self, value: dict) -> Point:
         return Point(
             *value["coordinates"],
@@ -18,5 +49,5 @@ class LocationField(serializers.Field):
     def to_representation(self, value) -> dict:
         return {
             "type": "Point",
-            "coordinates": list(value.coords),
+            "coordinates": [round(coord, self._precision) for coord in value.coords],
         }
@@ -0,0 +1,204 @@
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.contrib.gis.geos import Polygon
+from django.db.models import Q, QuerySet, Subquery
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.exceptions import ParseError
+
+from ..models import AddressSearch, Municipality, PostalCodeArea, Street
+from ..services.name_cache import resolve_name
+
+
+@dataclass(frozen=True)
+class QueryFilter:
+    """
+    A filter from a query parameter to a condition of the queryset.
+
+    The conditions of all the filters of a request are combined into the WHERE
+    clause of a single SQL statement, so the filters must not query the database
+    themselves. Related objects are matched by their names with subqueries, or by
+    their ids if the name cache has them. Only the cache itself queries, to
+    resolve the names asked for repeatedly, see services.name_cache.
+    """
+
+    name: str
+    description: str
+    condition: Callable[[str], Q]
+
+    @property
+    def parameter(self) -> OpenApiParameter:
+        return OpenApiParameter(
+            name=self.name,
+            location=OpenApiParameter.QUERY,
+            description=self.description,
+            required=False,
+            type=str,
+        )
+
+
+def filter_queryset(
+    queryset: QuerySet, filters: Iterable[QueryFilter], query_params: Mapping
+) -> QuerySet:
+    """Filter the queryset by the filters whose parameters are in the query."""
+    condition = Q()
+    for query_filter in filters:
+        value = query_params.get(query_filter.name)
+        if value is not None:
+            condition &= query_filter.condition(value)
+    return queryset.filter(condition)
+
+
+def filter_parameters(filters: Iterable[QueryFilter]) -> list[OpenApiParameter]:
+    """OpenAPI parameters of the filters."""
+    return [query_filter.parameter for query_filter in filters]
+
+
+def _in_any_language(field: str, value: str) -> Q:
+    """Match the value case-insensitively to any translation of the flattened field."""
+    q = Q()
+    for language in AddressSearch.LANGUAGES:
+        q |= Q(**{f"{field}_{language}__iexact": value})
+    return q
+
+
+def _named(
+    model, field: str, lookup: str = "id", flattened: str | None = None
+) -> Callable[[str], Q]:
+    """
+    Match the objects of the translatable model by a translation of the field.
+    The names found in the name cache are matched by their ids. Others are
+    matched with the flattened translations of the address search view if given,
+    or else with a subquery of the translations.
+    """
+
+    def condition(value: str) -> Q:
+        ids = resolve_name(model, field, value)
+        if ids is not None:
+            return Q(**{f"{lookup}__in": ids})
+        if flattened is not None:
+            return _in_any_language(flattened, value)
+        translations = model._parler_meta.root_model.objects.filter(
+            **{f"{field}__iexact": value}
+        )
+        return Q(**{f"{lookup}__in": Subquery(translations.values("master_id"))})
+
+    return condition
+
+
+def bbox_polygon(bbox: str, parameter: str = "bbox") -> Polygon:
+    """The polygon of a bounding box parameter like 'left,bottom,right,top'."""
+    try:
+        polygon = Polygon.from_bbox(float(point) for point in bbox.split(","))
+        polygon.srid = settings.PROJECTION_SRID
+    except ValueError:
+        raise ParseError(
+            f"{parameter} values must be floating points or integers "
+            "in the format 'left,bottom,right,top'"
+        )
+    return polygon
+
+
+def _in_bbox(bbox: str) -> Q:
+    return Q(location__within=bbox_polygon(bbox))
+
+
+_STREET_NAME_DESCRIPTION = (
+    'Street name in Finnish, Swedish or English. E.g. "Mannerheimintie" or '
+    '"Mannerheimvägen".'
+)
+_POSTAL_CODE_DESCRIPTION = 'Postal code, e.g. "00100".'
+_POSTAL_CODE_AREA_DESCRIPTION = (
+    'Postal code area name in Finnish, Swedish or English. E.g. "Lappohja" or "Lappvik"'
+)
+_POST_OFFICE_DESCRIPTION = (
+    'Post office name in Finnish, Swedish or English. E.g. "HELSINKI", "HELSINGFORS".'
+)
+_MUNICIPALITY_DESCRIPTION = (
+    "Municipality name in Finnish, Swedish or English. "
+    'E.g. "Helsinki" or "Helsingfors".'
+)
+_MUNICIPALITY_CODE_DESCRIPTION = 'Municipality code, e.g. "091".'
+
+ADDRESS_FILTERS = (
+    QueryFilter(
+        "streetname",
+        _STREET_NAME_DESCRIPTION,
+        _named(Street, "name", "street_id", "street_name"),
+    ),
+    QueryFilter(
+        "streetnumber",
+        'Street number, e.g. "42".',
+        lambda value: Q(number__iexact=value) | Q(number_end__iexact=value),
+    ),
+    QueryFilter(
+        "streetletter",
+        'Street letter, e.g. "B".',
+        lambda value: Q(letter__iexact=value),
+    ),
+    QueryFilter(
+        "bbox",
+        (
+            'Bounding box in the format "left,bottom,right,top". '
+            "Each value must be a floating point number or an integer."
+        ),
+        _in_bbox,
+    ),
+    QueryFilter(
+        "postalcode",
+        _POSTAL_CODE_DESCRIPTION,
+        lambda value: Q(postal_code__iexact=value),
+    ),
+    QueryFilter(
+        "postalcodearea",
+        _POSTAL_CODE_AREA_DESCRIPTION,
+        _named(PostalCodeArea, "name", "postal_code_area_id", "postal_code_area_name"),
+    ),
+    QueryFilter(
+        "postoffice",
+        _POST_OFFICE_DESCRIPTION,
+        _named(PostalCodeArea, "post_office", "postal_code_area_id", "post_office"),
+    ),
+    QueryFilter(
+        "municipality",
+        _MUNICIPALITY_DESCRIPTION,
+        _named(Municipality, "name", "municipality_id", "municipality_name"),
+    ),
+    QueryFilter(
+        "municipalitycode",
+        _MUNICIPALITY_CODE_DESCRIPTION,
+        lambda value: Q(municipality_code=value),
+    ),
+)
+
+POSTAL_CODE_AREA_FILTERS = (
+    QueryFilter(
+        "postalcode",
+        _POSTAL_CODE_DESCRIPTION,
+        lambda value: Q(postal_code__iexact=value),
+    ),
+    QueryFilter(
+        "postalcodearea",
+        _POSTAL_CODE_AREA_DESCRIPTION,
+        _named(PostalCodeArea, "name"),
+    ),
+    QueryFilter(
+        "postoffice",
+        _POST_OFFICE_DESCRIPTION,
+        _named(PostalCodeArea, "post_office"),
+    ),
+)
+
+MUNICIPALITY_FILTERS = (
+    QueryFilter(
+        "municipality",
+        _MUNICIPALITY_DESCRIPTION,
+        _named(Municipality, "name"),
+    ),
+    QueryFilter(
+        "municipalitycode",
+        _MUNICIPALITY_CODE_DESCRIPTION,
+        lambda value: Q(code=value),
+    ),
+)
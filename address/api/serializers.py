@@ -1,11 +1,24 @@
+import base64
+import json
+import math
+from collections.abc import Callable
+from functools import cached_property
+from typing import Any
+
+from django.contrib.gis.geos import MultiPolygon, Point, Polygon, WKTWriter
 from drf_spectacular.utils import extend_schema_field
 from parler_rest.fields import TranslatedFieldsField
 from parler_rest.serializers import TranslatableModelSerializer
 from rest_framework import serializers
 
-from ..models import Address, Municipality, PostalCodeArea, Street
-from ..types import strtobool
-from .fields import LocationField
+from geo_search.renderers import JSONRenderer, RawJSON
+from geo_search.utils import strtobool
+
+from ..models import Address, AddressSearch, Municipality, PostalCodeArea, Street
+from ..services.autocomplete import SUGGESTION_TYPES, Suggestion
+from ..services.batch_geocoding import MAX_BATCH_ADDRESSES, MAX_BATCH_LOCATIONS
+from .fields import LocationField, coordinate_precision
+from .twkb import multipolygon_twkb
 
 
 class TranslationsSerializer(serializers.Serializer):
@@ -19,7 +32,68 @@ class TranslationsField(TranslatedFieldsField):
     pass
 
 
-class TranslatedModelSerializer(TranslatableModelSerializer):
+class CompiledSerializerMixin:
+    """
+    Serializes the objects with a row function compiled once per serializer
+    instance, i.e. once per request, instead of going through the serializer
+    fields for every object. The request options are resolved while compiling.
+    The declared fields of the serializer must match the compiled rows, as they
+    still describe the output in the API schema.
+    """
+
+    def compile(self) -> Callable[[Any], dict]:
+        """
+        Compile the row function. By default, the rows are serialized through
+        the readable fields like DRF does, but the fields are resolved only once.
+        """
+        return compile_fields(list(self._readable_fields))
+
+    @cached_property
+    def _row(self) -> Callable[[Any], dict]:
+        return self.compile()
+
+    def to_representation(self, obj) -> dict:
+        return self._row(obj)
+
+
+def compile_fields(fields: list[serializers.Field]) -> Callable[[Any], dict]:
+    """Compile a function serializing the object through the fields."""
+
+    def row(obj) -> dict:
+        representation = {}
+        for field in fields:
+            attribute = field.get_attribute(obj)
+            representation[field.field_name] = (
+                None if attribute is None else field.to_representation(attribute)
+            )
+        return representation
+
+    return row
+
+
+def compile_translations(model) -> Callable[[Any], dict]:
+    """
+    Compile a function collecting the prefetched translations of the object
+    under the translated field names, e.g.
+
+        {"name": {"fi": "Helsinki", "sv": "Helsingfors"}}
+    """
+    fields = model._parler_meta["translations"].get_translated_fields()
+
+    def translations(obj) -> dict:
+        translated_fields = {}
+        for translation in obj.translations.all():
+            for field in fields:
+                value = getattr(translation, field)
+                translated_fields.setdefault(field, {})[translation.language_code] = (
+                    value if value is None else str(value)
+                )
+        return translated_fields
+
+    return translations
+
+
+class TranslatedModelSerializer(CompiledSerializerMixin, TranslatableModelSerializer):
     """
     A serializer that formats translated strings under language codes, e.g.
 
@@ -30,36 +104,176 @@ class TranslatedModelSerializer(TranslatableModelSerializer):
 
     translations = TranslationsField()
 
-    def to_representation(self, obj):
-        representation = super().to_representation(obj)
-        translated_fields = {}
-        for lang_key, trans_dict in representation.pop("translations", {}).items():
-            for field_name, translation in trans_dict.items():
-                if field_name not in translated_fields:
-                    translated_fields[field_name] = {lang_key: translation}
-                else:
-                    translated_fields[field_name].update({lang_key: translation})
-        representation.update(translated_fields)
-        return representation
+    def compile(self) -> Callable[[Any], dict]:
+        fields = compile_fields(
+            [
+                field
+                for field in self._readable_fields
+                if field.field_name != "translations"
+            ]
+        )
+        translations = compile_translations(self.Meta.model)
+
+        def row(obj) -> dict:
+            representation = fields(obj)
+            representation.update(translations(obj))
+            return representation
+
+        return row
+
+
+def requested_area_summary(context: dict) -> str | None:
+    """
+    The requested summary of the area geometries, e.g. `area=bbox`, or None if
+    the full geometries or no geometries were requested.
+    """
+    request = context.get("request")
+    value = request.query_params.get("area") if request else None
+    return value if value in AREA_SUMMARIES else None
+
+
+def show_area(context: dict) -> bool:
+    """Whether the area geometries or their summaries were requested."""
+    request = context.get("request")
+    return bool(
+        request
+        and (
+            strtobool(request.query_params.get("area", None))
+            or requested_area_summary(context)
+        )
+    )
+
+
+def requested_area_format(context: dict) -> str | None:
+    """
+    The requested format of the area geometries, or None if they were not
+    requested, only their summaries were requested, or their format is unknown.
+    """
+    if not show_area(context) or requested_area_summary(context):
+        return None
+    geom_format = context["request"].query_params.get("geom_format", "geojson")
+    return geom_format if geom_format in AREA_FORMATS else None
+
+
+def _rounded(coords: tuple, precision: int) -> list:
+    if coords and isinstance(coords[0], float):
+        return [round(coord, precision) for coord in coords]
+    return [_rounded(part, precision) for part in coords]
+
+
+def _geojson(area: MultiPolygon, precision: int) -> dict:
+    return {
+        "type": "MultiPolygon",
+        "coordinates": _rounded(area.coords, precision),
+    }
+
+
+def _ewkt(area: MultiPolygon, precision: int) -> str:
+    wkt = WKTWriter(trim=True, precision=precision).write(area).decode()
+    return f"SRID={area.srid};{wkt}" if area.srid else wkt
+
+
+def _wkb(area: MultiPolygon, precision: int) -> str:
+    # WKB stores the coordinates as doubles, so they are not rounded
+    return bytes(area.wkb).hex()
+
+
+def _wkb_base64(area: MultiPolygon, precision: int) -> str:
+    return base64.b64encode(bytes(area.wkb)).decode()
+
+
+def _twkb(area: MultiPolygon, precision: int) -> str:
+    return base64.b64encode(multipolygon_twkb(area, precision)).decode()
+
+
+# Formatting of the area geometries in Python, and parsing of the ones formatted
+# by PostgreSQL, see database_json.formatted_area
+AREA_FORMATS = {
+    "geojson": (_geojson, json.loads),
+    "ewkt": (_ewkt, str),
+    "wkb": (_wkb, str),
+    "wkb_base64": (_wkb_base64, str),
+    "twkb": (_twkb, str),
+}
+
+
+def _bbox(bbox: Polygon, precision: int) -> list:
+    return [round(coord, precision) for coord in bbox.extent]
+
+
+def _point(point: Point, precision: int) -> dict:
+    return {
+        "type": "Point",
+        "coordinates": [round(coord, precision) for coord in point.coords],
+    }
+
+
+# The field and representation of each summary of the area geometries, which
+# are generated from the areas, see models.area_summary_field.
+AREA_SUMMARIES = {
+    "bbox": ("area_bbox", _bbox),
+    "centroid": ("area_centroid", _point),
+    "label_point": ("area_label_point", _point),
+}
+
+
+def _no_area(area) -> None:
+    return None
+
+
+def _compile_area_summary(summary: str, precision: int) -> Callable[[Any], Any]:
+    field, represent = AREA_SUMMARIES[summary]
+
+    def area(obj) -> Any:
+        value = getattr(obj, field)
+        return None if value is None else represent(value, precision)
+
+    return area
+
+
+def compile_area(context: dict) -> Callable[[Any], Any]:
+    """
+    Compile a function representing the area geometry of a municipality or
+    postal code area as requested, or leaving it out if it was not requested.
+    The geometry formatted by PostgreSQL is used if the view has annotated it
+    as `formatted_area`. Otherwise, the geometry is formatted in Python.
+
+    The GeoJSON formatted by PostgreSQL is not parsed if the response is
+    rendered by the JSON renderer, which splices it into the response as is.
+
+    A summary of the geometry, e.g. its bounding box, is returned in its place
+    if one was requested.
+    """
+    summary = requested_area_summary(context)
+    if summary is not None:
+        return _compile_area_summary(summary, coordinate_precision(context))
+    area_format = requested_area_format(context)
+    if area_format is None:
+        return _no_area
+    precision = coordinate_precision(context)
+    format_geometry, parse_formatted = AREA_FORMATS[area_format]
+    renderer = getattr(context.get("request"), "accepted_renderer", None)
+    if area_format == "geojson" and isinstance(renderer, JSONRenderer):
+        parse_formatted = RawJSON
+
+    def area(obj) -> Any:
+        if hasattr(obj, "formatted_area"):
+            formatted = obj.formatted_area
+            return None if formatted is None else parse_formatted(formatted)
+        return None if obj.area is None else format_geometry(obj.area, precision)
+
+    return area
 
 
 class TranslatedAreaModelSerializer(TranslatedModelSerializer):
     area = serializers.SerializerMethodField()
 
+    @cached_property
+    def _area(self) -> Callable[[Any], Any]:
+        return compile_area(self.context)
+
     def get_area(self, obj):
-        request = self.context.get("request")
-        if request:
-            query_params = request.query_params
-            show_area = strtobool(query_params.get("area", None))
-            if show_area:
-                geom_format = query_params.get("geom_format", "geojson")
-                if geom_format == "geojson":
-                    return {
-                        "type": "MultiPolygon",
-                        "coordinates": list(obj.area.coords),
-                    }
-                if geom_format == "ewkt":
-                    return obj.area.ewkt
+        return self._area(obj)
 
 
 class MunicipalitySerializer(TranslatedAreaModelSerializer):
@@ -82,7 +296,7 @@ class PostalCodeAreaSerializer(TranslatedAreaModelSerializer):
         fields = ["postal_code", "translations", "area"]
 
 
-class AddressSerializer(serializers.ModelSerializer):
+class AddressSerializer(CompiledSerializerMixin, serializers.ModelSerializer):
     street = StreetSerializer()
     postal_code_area = PostalCodeAreaSerializer()
     location = LocationField()
@@ -100,3 +314,224 @@ class AddressSerializer(serializers.ModelSerializer):
             "modified_at",
             "municipality",
         ]
+
+    def compile(self) -> Callable[[Any], dict]:
+        street = self.fields["street"].to_representation
+        postal_code_area = self.fields["postal_code_area"].to_representation
+        location = self.fields["location"].to_representation
+        modified_at = self.fields["modified_at"].to_representation
+        municipality = self.fields["municipality"].to_representation
+
+        def row(obj: Address) -> dict:
+            return {
+                "street": street(obj.street),
+                "number": obj.number,
+                "number_end": obj.number_end,
+                "letter": obj.letter,
+                "postal_code_area": (
+                    None
+                    if obj.postal_code_area is None
+                    else postal_code_area(obj.postal_code_area)
+                ),
+                "location": location(obj.location),
+                "modified_at": modified_at(obj.modified_at),
+                "municipality": municipality(obj.municipality),
+            }
+
+        return row
+
+
+def _translations(obj: AddressSearch, field: str, languages=None) -> dict:
+    """
+    Collect the translations of a flattened field into a dict, e.g.
+
+        {"fi": "Helsinki", "sv": "Helsingfors"}
+
+    If the languages of the translations are not given, the missing (null)
+    translations are left out.
+    """
+    if languages is None:
+        return {
+            language: value
+            for language in AddressSearch.LANGUAGES
+            if (value := getattr(obj, f"{field}_{language}")) is not None
+        }
+    return {language: getattr(obj, f"{field}_{language}") for language in languages}
+
+
+class AddressSearchSerializer(CompiledSerializerMixin, serializers.ModelSerializer):
+    """
+    Serializes the flattened address search rows in the same format as
+    AddressSerializer serializes the addresses.
+    """
+
+    street = serializers.SerializerMethodField()
+    postal_code_area = serializers.SerializerMethodField()
+    location = LocationField()
+    municipality = serializers.SerializerMethodField()
+
+    class Meta:
+        model = AddressSearch
+        fields = AddressSerializer.Meta.fields
+
+    @cached_property
+    def _area(self) -> Callable[[Any], Any]:
+        return compile_area(self.context)
+
+    @extend_schema_field(StreetSerializer)
+    def get_street(self, obj: AddressSearch) -> dict:
+        names = _translations(obj, "street_name")
+        return {"name": names} if names else {}
+
+    @extend_schema_field(PostalCodeAreaSerializer)
+    def get_postal_code_area(self, obj: AddressSearch) -> dict | None:
+        if obj.postal_code_area_id is None:
+            return None
+        representation = {
+            "postal_code": obj.postal_code,
+            "area": None,
+        }
+        if self._area is not _no_area:
+            representation["area"] = self._area(obj.postal_code_area)
+        languages = obj.postal_code_area_languages
+        if languages:
+            representation["name"] = _translations(
+                obj, "postal_code_area_name", languages
+            )
+            representation["post_office"] = _translations(obj, "post_office", languages)
+        return representation
+
+    @extend_schema_field(MunicipalitySerializer)
+    def get_municipality(self, obj: AddressSearch) -> dict:
+        representation = {
+            "code": obj.municipality_code,
+            "area": None,
+        }
+        if self._area is not _no_area:
+            representation["area"] = self._area(obj.municipality)
+        names = _translations(obj, "municipality_name")
+        if names:
+            representation["name"] = names
+        return representation
+
+    def compile(self) -> Callable[[AddressSearch], dict]:
+        location = self.fields["location"].to_representation
+        modified_at = self.fields["modified_at"].to_representation
+
+        def row(obj: AddressSearch) -> dict:
+            representation = {
+                "street": self.get_street(obj),
+                "number": obj.number,
+                "number_end": obj.number_end,
+                "letter": obj.letter,
+                "postal_code_area": self.get_postal_code_area(obj),
+                "location": location(obj.location),
+                "modified_at": modified_at(obj.modified_at),
+                "municipality": self.get_municipality(obj),
+            }
+            # Distance (in meters) is annotated when searching for the nearest
+            # addresses
+            distance = getattr(obj, "distance", None)
+            if distance is not None:
+                representation["distance"] = distance.m
+            return representation
+
+        return row
+
+
+class AddressQuerySerializer(serializers.Serializer):
+    """
+    An address to geocode, either as free text or as components named like the
+    address list filters.
+    """
+
+    q = serializers.CharField(required=False)
+    streetname = serializers.CharField(required=False, source="street_name")
+    streetnumber = serializers.CharField(required=False, source="number")
+    streetletter = serializers.CharField(required=False, source="letter")
+    postalcode = serializers.CharField(required=False, source="postal_code")
+    municipality = serializers.CharField(required=False)
+
+    def validate(self, data: dict) -> dict:
+        if ("q" in data) == ("street_name" in data):
+            raise serializers.ValidationError(
+                "Either 'q' or 'streetname' must be given"
+            )
+        return data
+
+
+class BatchGeocodingSerializer(serializers.Serializer):
+    addresses = AddressQuerySerializer(
+        many=True, allow_empty=False, max_length=MAX_BATCH_ADDRESSES
+    )
+
+
+def _finite(value: float) -> None:
+    # The min_value and max_value comparisons are false for nan
+    if not math.isfinite(value):
+        raise serializers.ValidationError("A finite number is required.")
+
+
+class LocationQuerySerializer(serializers.Serializer):
+    lat = serializers.FloatField(min_value=-90, max_value=90, validators=[_finite])
+    lon = serializers.FloatField(min_value=-180, max_value=180, validators=[_finite])
+
+
+class BatchReverseGeocodingSerializer(serializers.Serializer):
+    locations = LocationQuerySerializer(
+        many=True, allow_empty=False, max_length=MAX_BATCH_LOCATIONS
+    )
+    distance = serializers.FloatField(required=False, min_value=0, validators=[_finite])
+
+
+class BatchAreaLookupSerializer(serializers.Serializer):
+    locations = LocationQuerySerializer(
+        many=True, allow_empty=False, max_length=MAX_BATCH_LOCATIONS
+    )
+
+
+class AreaMatchSerializer(serializers.Serializer):
+    municipality = MunicipalitySerializer(allow_null=True)
+    postal_code_area = PostalCodeAreaSerializer(allow_null=True)
+
+
+class MunicipalitySuggestionSerializer(TranslatedModelSerializer):
+    class Meta:
+        model = Municipality
+        fields = ["code", "translations"]
+
+
+class PostalCodeAreaSuggestionSerializer(TranslatedModelSerializer):
+    class Meta:
+        model = PostalCodeArea
+        fields = ["postal_code", "translations"]
+
+
+class StreetSuggestionSerializer(TranslatedModelSerializer):
+    municipality = MunicipalitySuggestionSerializer()
+
+    class Meta:
+        model = Street
+        fields = ["translations", "municipality"]
+
+
+class SuggestionSerializer(serializers.Serializer):
+    """
+    Serializes an autocomplete suggestion with the serializer of its type, e.g.
+
+        {"type": "street", "name": {"fi": "Mannerheimintie", ...}, "municipality": ...}
+    """
+
+    type = serializers.ChoiceField(choices=list(SUGGESTION_TYPES))
+    name = TranslationsSerializer()
+
+    serializer_classes = {
+        "municipality": MunicipalitySuggestionSerializer,
+        "postal_code_area": PostalCodeAreaSuggestionSerializer,
+        "street": StreetSuggestionSerializer,
+    }
+
+    def to_representation(self, suggestion: Suggestion):
+        serializer_class = self.serializer_classes[suggestion.type]
+        serializer = serializer_class(suggestion.obj, context=self.context)
+        return {"type": suggestion.type, **serializer.data}
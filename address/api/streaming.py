@@ -0,0 +1,151 @@
+import csv
+import json
+from collections.abc import Iterator
+
+from django.db import connection
+from django.db.models import Expression, QuerySet
+from django.http import StreamingHttpResponse
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.exceptions import ParseError
+from rest_framework.request import Request
+from rest_framework.utils.encoders import JSONEncoder
+
+from geo_search.renderers import JSONRenderer, RawJSON
+
+# Number of rows fetched from the server-side cursor at a time
+STREAM_CHUNK_SIZE = 2000
+
+# Number of bytes of the FlatGeobuf file written to the response at a time
+FLATGEOBUF_CHUNK_BYTES = 64 * 1024
+
+STREAM_CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "flatgeobuf": "application/flatgeobuf",
+}
+
+stream_parameters = [
+    OpenApiParameter(
+        name="stream",
+        location=OpenApiParameter.QUERY,
+        description=(
+            "Stream all the results without pagination, one result per line. "
+            "Available values : ndjson, csv, flatgeobuf. In CSV, the nested "
+            'fields are flattened into columns like "municipality.name.fi". '
+            "FlatGeobuf downloads the results as a binary file of features with "
+            "flat properties like municipality_name_fi."
+        ),
+        required=False,
+        type=str,
+        enum=list(STREAM_CONTENT_TYPES),
+    ),
+]
+
+
+class _Echo:
+    """A file-like object returning what is written, for csv.writer."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _flatten(representation: dict, prefix: str = "") -> dict:
+    flat = {}
+    for key, value in representation.items():
+        if isinstance(value, RawJSON):
+            # Geometries formatted by PostgreSQL are already GeoJSON
+            flat[f"{prefix}{key}"] = value.text
+        elif isinstance(value, dict) and "type" not in value:
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, dict | list):
+            # Geometries are written as GeoJSON
+            flat[f"{prefix}{key}"] = json.dumps(value, cls=JSONEncoder)
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+class StreamingListMixin:
+    """
+    Lets the list be streamed as NDJSON or CSV with the `stream` parameter. The
+    rows are read from a server-side cursor in chunks and serialized one by one,
+    so the memory use does not depend on the number of results.
+
+    The CSV columns are listed in `csv_fields`.
+
+    The list can also be downloaded as FlatGeobuf, which PostGIS builds from
+    the `flatgeobuf_fields` and `flatgeobuf_expressions` of the queryset with
+    ST_AsFlatGeobuf. The file is built whole, so unlike the streams, it is held
+    in memory, and its size is bounded by allowing at most `flatgeobuf_max_rows`
+    features. It is written to the response in chunks without copying it.
+    """
+
+    csv_fields: list[str] = []
+
+    # Fields and annotations of the FlatGeobuf features, as arguments of
+    # QuerySet.values, and the field of their geometry
+    flatgeobuf_fields: list[str] = []
+    flatgeobuf_expressions: dict[str, Expression] = {}
+    flatgeobuf_geometry: str = ""
+    # The file is held in memory, and PostgreSQL cannot build one over 1 GB
+    flatgeobuf_max_rows: int | None = None
+
+    def list(self, request: Request, *args, **kwargs):
+        stream_format = request.query_params.get("stream")
+        if stream_format is None:
+            return super().list(request, *args, **kwargs)
+        if stream_format not in STREAM_CONTENT_TYPES:
+            raise ParseError(
+                f"'stream' must be one of: {', '.join(STREAM_CONTENT_TYPES)}"
+            )
+        queryset = self.filter_queryset(self.get_queryset())
+        if stream_format == "flatgeobuf" and self.flatgeobuf_max_rows is not None:
+            # Checked before streaming, while an error can still be returned
+            if queryset[: self.flatgeobuf_max_rows + 1].count() > (
+                self.flatgeobuf_max_rows
+            ):
+                raise ParseError(
+                    f"FlatGeobuf can be downloaded for at most "
+                    f"{self.flatgeobuf_max_rows} results, narrow the results "
+                    f"with the filters"
+                )
+        rows = getattr(self, f"_stream_{stream_format}")(queryset)
+        return StreamingHttpResponse(
+            rows, content_type=STREAM_CONTENT_TYPES[stream_format]
+        )
+
+    def _representations(self, queryset: QuerySet) -> Iterator[dict]:
+        serializer = self.get_serializer()
+        for obj in queryset.iterator(chunk_size=STREAM_CHUNK_SIZE):
+            yield serializer.to_representation(obj)
+
+    def _stream_ndjson(self, queryset: QuerySet) -> Iterator[bytes]:
+        renderer = JSONRenderer()
+        for representation in self._representations(queryset):
+            yield renderer.render(representation) + b"\n"
+
+    def _stream_csv(self, queryset: QuerySet) -> Iterator[str]:
+        writer = csv.DictWriter(
+            _Echo(), fieldnames=self.csv_fields, extrasaction="ignore"
+        )
+        yield writer.writeheader()
+        for representation in self._representations(queryset):
+            yield writer.writerow(_flatten(representation))
+
+    def _stream_flatgeobuf(self, queryset: QuerySet) -> Iterator[memoryview]:
+        features = queryset.prefetch_related(None).values(
+            *self.flatgeobuf_fields, **self.flatgeobuf_expressions
+        )
+        sql, params = features.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT ST_AsFlatGeobuf(features, false, %s) FROM ({sql}) features",
+                [self.flatgeobuf_geometry, *params],
+            )
+            (flatgeobuf,) = cursor.fetchone()
+        if flatgeobuf is None:
+            return
+        # The slices of the view share the buffer of the file
+        flatgeobuf = memoryview(flatgeobuf)
+        for start in range(0, len(flatgeobuf), FLATGEOBUF_CHUNK_BYTES):
+            yield flatgeobuf[start : start + FLATGEOBUF_CHUNK_BYTES]
@@ -0,0 +1,56 @@
+import gzip
+from functools import partial
+
+from django.http import HttpResponse
+from drf_spectacular.utils import extend_schema
+from rest_framework.exceptions import NotFound
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.views import APIView
+
+from ..services.tile_cache import tile_cache
+from ..services.tiles import TILE_LAYERS, is_valid_tile, render_tile
+
+MVT_CONTENT_TYPE = "application/vnd.mapbox-vector-tile"
+
+
+class IgnoreClientContentNegotiation(BaseContentNegotiation):
+    """
+    The tiles are returned as is, whatever the client accepts, and the errors
+    as JSON.
+    """
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+class TileView(APIView):
+    """
+    Mapbox vector tiles of the addresses, postal code areas and municipalities,
+    rendered by PostGIS and stored in the tile cache. The addresses are left out
+    of the tiles below zoom level 14.
+    """
+
+    renderer_classes = [JSONRenderer]
+    content_negotiation_class = IgnoreClientContentNegotiation
+
+    @extend_schema(responses={(200, MVT_CONTENT_TYPE): bytes})
+    def get(self, request: Request, layer: str, z: int, x: int, y: int):
+        tile_layer = TILE_LAYERS.get(layer)
+        if tile_layer is None or not is_valid_tile(z, x, y):
+            raise NotFound()
+        render = partial(render_tile, tile_layer, z, x, y)
+        tile = tile_cache.get(layer, z, x, y, render)
+        if "gzip" in request.headers.get("Accept-Encoding", ""):
+            response = HttpResponse(tile, content_type=MVT_CONTENT_TYPE)
+            response["Content-Encoding"] = "gzip"
+        else:
+            response = HttpResponse(
+                gzip.decompress(tile), content_type=MVT_CONTENT_TYPE
+            )
+        response["Vary"] = "Accept-Encoding"
+        return response
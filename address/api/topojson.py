@@ -0,0 +1,70 @@
+import json
+from collections.abc import Iterable
+
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import renderers
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from ..services.topology import filter_topology, stored_topology
+from .filters import QueryFilter, filter_queryset
+
+topology_parameters = [
+    OpenApiParameter(
+        name="format",
+        location=OpenApiParameter.QUERY,
+        description=(
+            "Set to topojson to return all the results, without pagination, as "
+            "a TopoJSON topology, which stores each boundary shared by the areas "
+            "only once. The coordinates are quantized to about a meter."
+        ),
+        required=False,
+        type=str,
+        enum=["topojson"],
+    ),
+]
+
+
+class TopoJSONRenderer(renderers.BaseRenderer):
+    """Renders the TopoJSON topologies, which are JSON text already."""
+
+    media_type = "application/json"
+    format = "topojson"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, str):
+            return data.encode()
+        # Errors are rendered as JSON
+        return json.dumps(data, ensure_ascii=False).encode()
+
+
+class TopologyListMixin:
+    """
+    Lets the areas be listed as a TopoJSON topology with `format=topojson`, in
+    which the boundaries shared by the areas are stored only once. The topology
+    of all the areas is built after every import, see services.topology, and
+    never while responding. It is returned as is unless the areas are filtered
+    by the `topology_filters`.
+
+    The topology has all the filtered areas, without pagination.
+    """
+
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, TopoJSONRenderer]
+
+    topology_filters: Iterable[QueryFilter] = ()
+
+    def list(self, request: Request, *args, **kwargs):
+        if request.accepted_renderer.format != TopoJSONRenderer.format:
+            return super().list(request, *args, **kwargs)
+        model = self.queryset.model
+        if not any(f.name in request.query_params for f in self.topology_filters):
+            return Response(stored_topology(model))
+        ids = set(
+            filter_queryset(
+                model.objects.all(), self.topology_filters, request.query_params
+            ).values_list("pk", flat=True)
+        )
+        topology = filter_topology(json.loads(stored_topology(model)), ids)
+        return Response(json.dumps(topology, ensure_ascii=False, separators=(",", ":")))
@@ -0,0 +1,75 @@
+"""
+Tiny Well-known Binary (TWKB) encoding of the area geometries, for the areas
+that are not formatted by PostGIS, see database_json.formatted_area.
+
+https://github.com/TWKB/Specification
+"""
+
+import math
+
+from django.contrib.gis.geos import MultiPolygon
+
+# TWKB stores the precision in four bits, so it cannot be higher than this
+MAX_TWKB_PRECISION = 7
+
+_MULTIPOLYGON_TYPE = 6
+_EMPTY_FLAG = 0x10
+
+# Number of points that PostGIS keeps in a ring even if they are repeated
+_MIN_RING_POINTS = 4
+
+
+def _varint(value: int) -> bytes:
+    encoded = bytearray()
+    while value >= 0x80:
+        encoded.append((value & 0x7F) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def _zigzag(value: int) -> int:
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _scaled(coord: float, factor: int) -> int:
+    # Rounded half away from zero like PostGIS does
+    return int(math.copysign(math.floor(abs(coord) * factor + 0.5), coord))
+
+
+def multipolygon_twkb(area: MultiPolygon, precision: int) -> bytes:
+    """
+    Encode the multipolygon as TWKB with the coordinates rounded to the
+    precision, like ST_AsTWKB. The points repeated after rounding are left out,
+    as long as the ring keeps its minimum number of points.
+    """
+    precision = min(precision, MAX_TWKB_PRECISION)
+    header = bytes([_MULTIPOLYGON_TYPE | _zigzag(precision) << 4])
+    if area.empty:
+        return header + bytes([_EMPTY_FLAG])
+    factor = 10**precision
+    encoded = bytearray(header + b"\x00")
+    encoded += _varint(len(area))
+    # The coordinates are deltas from the previous point of the whole geometry
+    previous = (0, 0)
+    for polygon in area.coords:
+        encoded += _varint(len(polygon))
+        for ring in polygon:
+            points = bytearray()
+            num_points = 0
+            max_points_left = len(ring)
+            for x, y in ring:
+                point = (_scaled(x, factor), _scaled(y, factor))
+                if (
+                    num_points
+                    and point == previous
+                    and max_points_left > _MIN_RING_POINTS
+                ):
+                    max_points_left -= 1
+                    continue
+                points += _varint(_zigzag(point[0] - previous[0]))
+                points += _varint(_zigzag(point[1] - previous[1]))
+                previous = point
+                num_points += 1
+            encoded += _varint(num_points) + points
+    return bytes(encoded)
@@ -1,54 +1,104 @@
-from math import cos, pi
+import json
 
 from django.conf import settings
+from django.contrib.gis.db.models import GeometryField, MultiPolygonField
+from django.contrib.gis.db.models.functions import Distance, GeometryDistance
 from django.contrib.gis.geos import Point, Polygon
 from django.contrib.gis.measure import D
-from django.db.models import Q, QuerySet
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import (
+    F,
+    Func,
+    OuterRef,
+    Prefetch,
+    QuerySet,
+    Subquery,
+    Value,
+    prefetch_related_objects,
+)
+from django.db.models.expressions import Combinable
+from django.db.models.functions import Coalesce
+from django.http import HttpResponse
 from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
+from rest_framework.decorators import action
 from rest_framework.exceptions import ParseError
 from rest_framework.mixins import ListModelMixin
-from rest_framework.viewsets import GenericViewSet
-
-from address.models import Street
-
-from ..models import Address, Municipality, PostalCodeArea
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.viewsets import GenericViewSet, ViewSet
+
+from ..models import (
+    FORMATTED_AREA_PRECISION,
+    STORED_AREA_FORMATS,
+    AddressSearch,
+    Municipality,
+    PostalCodeArea,
+)
+from ..services.area_lookup import area_lookup
+from ..services.autocomplete import (
+    AUTOCOMPLETE_DEFAULT_LIMIT,
+    AUTOCOMPLETE_MAX_LIMIT,
+    AUTOCOMPLETE_MIN_LENGTH,
+    autocomplete,
+)
+from ..services.batch_geocoding import (
+    MAX_BATCH_ADDRESSES,
+    MAX_BATCH_LOCATIONS,
+    AddressQuery,
+    geocode_batch,
+    reverse_geocode_batch,
+)
+from ..services.search import SEARCH_CONFIG
+from ..services.simplification import (
+    SIMPLIFICATION_TOLERANCES,
+    SIMPLIFICATIONS,
+    precomputed_tolerance,
+    tolerance_for_zoom,
+)
+from .database_json import address_json, formatted_area
+from .fields import MAX_COORDINATE_PRECISION, coordinate_precision
+from .filters import (
+    ADDRESS_FILTERS,
+    MUNICIPALITY_FILTERS,
+    POSTAL_CODE_AREA_FILTERS,
+    bbox_polygon,
+    filter_parameters,
+    filter_queryset,
+)
 from .serializers import (
-    AddressSerializer,
+    AddressSearchSerializer,
+    AreaMatchSerializer,
+    BatchAreaLookupSerializer,
+    BatchGeocodingSerializer,
+    BatchReverseGeocodingSerializer,
     MunicipalitySerializer,
     PostalCodeAreaSerializer,
+    SuggestionSerializer,
+    requested_area_format,
+    requested_area_summary,
+    show_area,
 )
+from .streaming import StreamingListMixin, stream_parameters
+from .topojson import TopologyListMixin, topology_parameters
+
+# Highest web map zoom level accepted by the `zoom` parameter
+MAX_ZOOM = 22
+
+# Upper limit for the `nearest` parameter. The KNN scan stops after this many rows,
+# so the cost of a nearest query does not depend on the density of the neighbourhood.
+MAX_NEAREST_ADDRESSES = 100
 
 _list_parameters = [
     OpenApiParameter(
-        name="streetname",
+        name="q",
         location=OpenApiParameter.QUERY,
         description=(
-            "Street name in Finnish, Swedish or English. "
-            'E.g. "Mannerheimintie" or "Mannerheimvägen".'
-        ),
-        required=False,
-        type=str,
-    ),
-    OpenApiParameter(
-        name="streetnumber",
-        location=OpenApiParameter.QUERY,
-        description='Street number, e.g. "42".',
-        required=False,
-        type=str,
-    ),
-    OpenApiParameter(
-        name="streetletter",
-        location=OpenApiParameter.QUERY,
-        description='Street letter, e.g. "B".',
-        required=False,
-        type=str,
-    ),
-    OpenApiParameter(
-        name="bbox",
-        location=OpenApiParameter.QUERY,
-        description=(
-            'Bounding box in the format "left,bottom,right,top". '
-            "Each value must be a floating point number or an integer."
+            "Free-text address in Finnish, Swedish or English, e.g. "
+            '"Mannerheimintie 42 B, 00100 Helsinki". Every word must match the '
+            "street name, number, letter, postal code, postal code area, "
+            "post office or municipality of the address. The best matches are "
+            "returned first."
         ),
         required=False,
         type=str,
@@ -78,302 +128,666 @@ _list_parameters = [
         location=OpenApiParameter.QUERY,
         description=(
             "Maximum distance (in meters) from the given location defined by"
-            "the `lat` and `lon` parameters. By default, the value is `1`. "
+            "the `lat` and `lon` parameters. By default, the value is `1`, "
+            "or unlimited when `nearest` is given. "
             "If this parameter is given, the `lat` and `lon` parameters "
             "should also be given."
         ),
         required=False,
         type=float,
     ),
+    OpenApiParameter(
+        name="nearest",
+        location=OpenApiParameter.QUERY,
+        description=(
+            "Return the given number of addresses closest to the location defined "
+            "by the `lat` and `lon` parameters, ordered by distance. Each result "
+            "includes its `distance` (in meters) from the location. "
+            f"Maximum value is {MAX_NEAREST_ADDRESSES}."
+        ),
+        required=False,
+        type=int,
+    ),
 ]
 
 _area_parameters = [
     OpenApiParameter(
         name="area",
         location=OpenApiParameter.QUERY,
-        description="Return area-geometry when set to true or 1",
+        description=(
+            "Return area-geometry when set to true or 1. Set to bbox, centroid "
+            "or label_point to return only the bounding box of the area as "
+            "[xmin, ymin, xmax, ymax], its centroid, or a point well inside it "
+            "for a label, as a GeoJSON point, regardless of geom_format."
+        ),
         required=False,
-        type=bool,
+        type=str,
     ),
     OpenApiParameter(
         name="geom_format",
         location=OpenApiParameter.QUERY,
         description=(
-            "Area geometry format. Available values : geojson, ewkt. Default : geojson"
+            "Area geometry format. Available values : geojson, ewkt, wkb (hex), "
+            "wkb_base64, twkb (base64). Default : geojson. WKB keeps the full "
+            "precision of the coordinates, and TWKB rounds them to at most 7 "
+            "decimals."
         ),
         required=False,
         type=str,
     ),
+    OpenApiParameter(
+        name="precision",
+        location=OpenApiParameter.QUERY,
+        description=(
+            "Number of decimals of the coordinates of the locations and "
+            f"area-geometries, 0-{MAX_COORDINATE_PRECISION}. "
+            f"Default : {settings.COORDINATE_PRECISION}"
+        ),
+        required=False,
+        type=int,
+    ),
 ]
 
-_postal_code_parameters = [
+
+_simplification_parameters = [
     OpenApiParameter(
-        name="postalcode",
+        name="simplify",
         location=OpenApiParameter.QUERY,
-        description='Postal code, e.g. "00100".',
+        description=(
+            "Return the area-geometry simplified with a tolerance (in meters). "
+            "The largest precomputed tolerance not exceeding the given one is "
+            "used, out of "
+            f"{', '.join(str(t) for t in SIMPLIFICATION_TOLERANCES)}. "
+            "Smaller tolerances return the full area-geometry."
+        ),
         required=False,
-        type=str,
+        type=float,
     ),
     OpenApiParameter(
-        name="postalcodearea",
+        name="zoom",
         location=OpenApiParameter.QUERY,
         description=(
-            'Postal code area name in Finnish, Swedish or English. "'
-            'E.g. "Lappohja" or "Lappvik"'
+            "Return the area-geometry simplified for a web map at the zoom level, "
+            f"0-{MAX_ZOOM}. Cannot be used with `simplify`."
         ),
         required=False,
-        type=str,
+        type=int,
     ),
+]
+
+_clip_parameters = [
     OpenApiParameter(
-        name="postoffice",
+        name="clip_bbox",
         location=OpenApiParameter.QUERY,
         description=(
-            "Post office name in Finnish, Swedish or English. "
-            'E.g. "HELSINKI", "HELSINGFORS".'
+            "Return only the areas intersecting the bounding box, with their "
+            "area-geometries clipped to it. The box is given in the format "
+            "'left,bottom,right,top' in the WGS84 (EPSG: 4326) coordinate system. "
+            "The clipped area-geometries are meant for drawing and may not be "
+            "valid."
         ),
         required=False,
         type=str,
     ),
 ]
 
-_municipality_parameters = [
+_area_lookup_parameters = [
     OpenApiParameter(
-        name="municipality",
+        name="lat",
+        location=OpenApiParameter.QUERY,
+        description="Latitude (degrees) in the WGS84 (EPSG: 4326) coordinate system.",
+        required=True,
+        type=float,
+    ),
+    OpenApiParameter(
+        name="lon",
+        location=OpenApiParameter.QUERY,
+        description="Longitude (degrees) in the WGS84 (EPSG: 4326) coordinate system.",
+        required=True,
+        type=float,
+    ),
+]
+
+_autocomplete_parameters = [
+    OpenApiParameter(
+        name="q",
         location=OpenApiParameter.QUERY,
         description=(
-            "Municipality name in Finnish, Swedish or English. "
-            'E.g. "Helsinki" or "Helsingfors".'
+            "Partial street, postal code area or municipality name in Finnish, "
+            'Swedish or English, e.g. "manner". Must be at least '
+            f"{AUTOCOMPLETE_MIN_LENGTH} characters long."
         ),
-        required=False,
+        required=True,
         type=str,
     ),
     OpenApiParameter(
-        name="municipalitycode",
+        name="limit",
         location=OpenApiParameter.QUERY,
-        description='Municipality code, e.g. "091".',
+        description=(
+            f"Maximum number of suggestions. By default, the value is "
+            f"`{AUTOCOMPLETE_DEFAULT_LIMIT}` and the maximum value is "
+            f"`{AUTOCOMPLETE_MAX_LIMIT}`."
+        ),
         required=False,
-        type=str,
+        type=int,
     ),
 ]
 
 
+def _location(lat: str | None, lon: str | None) -> Point:
+    """The location given by the `lat` and `lon` parameters in WGS84."""
+    try:
+        lat = float(lat)
+        lon = float(lon)
+    except (ValueError, TypeError):
+        raise ParseError("'lat' and 'lon' must be provided as numbers")
+    # The comparisons are false for nan as well
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ParseError(
+            "'lat' must be between -90 and 90, and 'lon' between -180 and 180"
+        )
+    return Point(lon, lat, srid=settings.PROJECTION_SRID)
+
+
+def _distance(distance: str) -> float:
+    """The maximum distance (in meters) given by the `distance` parameter."""
+    try:
+        distance = float(distance)
+    except ValueError:
+        raise ParseError("'distance' must be a number")
+    # The comparisons are false for nan as well
+    if not 0 <= distance < float("inf"):
+        raise ParseError("'distance' must be a finite number, not negative")
+    return distance
+
+
+def _simplification_tolerance(query_params) -> int | None:
+    """The precomputed tolerance requested by `simplify` or `zoom`, if any."""
+    simplify = query_params.get("simplify")
+    zoom = query_params.get("zoom")
+    if simplify is not None and zoom is not None:
+        raise ParseError("'simplify' and 'zoom' cannot be used together")
+    if simplify is not None:
+        try:
+            tolerance = float(simplify)
+        except ValueError:
+            raise ParseError("'simplify' must be a floating point or an integer")
+        if not 0 <= tolerance < float("inf"):
+            raise ParseError("'simplify' must not be negative")
+        return precomputed_tolerance(tolerance)
+    if zoom is not None:
+        try:
+            zoom = int(zoom)
+        except ValueError:
+            raise ParseError("'zoom' must be an integer")
+        if not 0 <= zoom <= MAX_ZOOM:
+            raise ParseError(f"'zoom' must be between 0 and {MAX_ZOOM}")
+        return tolerance_for_zoom(zoom)
+    return None
+
+
+def _simplified_area(model, query_params) -> Combinable | None:
+    """
+    The precomputed simplification of the area geometry of the municipalities or
+    postal code areas, if requested with `simplify` or `zoom`.
+    """
+    tolerance = _simplification_tolerance(query_params)
+    if tolerance is None:
+        return None
+    simplification_model, area_column = SIMPLIFICATIONS[model]
+    simplified_area = simplification_model.objects.filter(
+        **{area_column: OuterRef("pk"), "tolerance": tolerance}
+    ).values("area")[:1]
+    return Coalesce(Subquery(simplified_area), F("area"))
+
+
+def _clipped_area(area: Combinable | None, clip_box: Polygon) -> Func:
+    """
+    The area geometry, or its simplification, clipped to the box. ST_ClipByBox2D
+    is much faster than ST_Intersection, but may return invalid polygons.
+    """
+    srid = settings.PROJECTION_SRID
+    clipped = Func(
+        area if area is not None else F("area"),
+        Value(clip_box, output_field=GeometryField(srid=srid)),
+        function="ST_ClipByBox2D",
+        output_field=GeometryField(srid=srid),
+    )
+    return Func(clipped, function="ST_Multi", output_field=MultiPolygonField(srid=srid))
+
+
+def _with_requested_areas(queryset: QuerySet, context: dict) -> QuerySet:
+    """
+    Filter the municipalities or postal code areas to the `clip_bbox`, if any,
+    and annotate their area geometries simplified and clipped as requested.
+    """
+    query_params = context["request"].query_params
+    area = _simplified_area(queryset.model, query_params)
+    clip_bbox = query_params.get("clip_bbox")
+    if clip_bbox is not None:
+        clip_box = bbox_polygon(clip_bbox, "clip_bbox")
+        # The areas intersecting the box are found by the spatial index
+        queryset = queryset.filter(area__intersects=clip_box)
+        area = _clipped_area(area, clip_box)
+    return _with_formatted_areas(queryset, context, area)
+
+
+def _with_formatted_areas(
+    queryset: QuerySet, context: dict, area: Combinable | None = None
+) -> QuerySet:
+    """
+    Annotate the requested area geometries, or their simplified or clipped
+    versions given as `area`, formatted by PostgreSQL as `formatted_area` in
+    place of the areas, see
+    serializers.compile_area. The full areas are read as stored formatted, if
+    they are requested at the precision of the stored ones.
+
+    Only the summaries of the areas are read if they were requested instead.
+    """
+    if requested_area_summary(context):
+        # The summaries are read in place of the areas
+        return queryset.defer("area")
+    area_format = requested_area_format(context)
+    if area_format is None:
+        return queryset
+    precision = coordinate_precision(context)
+    if area is not None:
+        formatted = formatted_area(area, area_format, precision)
+    elif area_format in STORED_AREA_FORMATS and precision == FORMATTED_AREA_PRECISION:
+        formatted = F(f"area_{area_format}")
+    else:
+        formatted = formatted_area(F("area"), area_format, precision)
+    return queryset.defer("area").annotate(formatted_area=formatted)
+
+
+def _area_prefetches(context: dict) -> list[Prefetch]:
+    """Prefetches of the postal code areas and municipalities of addresses."""
+    return [
+        Prefetch(
+            "postal_code_area",
+            _with_formatted_areas(PostalCodeArea.objects.all(), context),
+        ),
+        Prefetch(
+            "municipality",
+            _with_formatted_areas(Municipality.objects.all(), context),
+        ),
+    ]
+
+
+def _translation_expressions(model, field: str) -> dict[str, Subquery]:
+    """
+    Subqueries of the translations of the field of the translated model in each
+    language, e.g. {"name_fi": ..., "name_sv": ..., "name_en": ...}.
+    """
+    translations = model._parler_meta.root_model.objects
+    return {
+        f"{field}_{language}": Subquery(
+            translations.filter(master=OuterRef("pk"), language_code=language).values(
+                field
+            )[:1]
+        )
+        for language in AddressSearch.LANGUAGES
+    }
+
+
+def _translated_columns(field: str) -> list[str]:
+    """CSV columns of a translated field in every language."""
+    return [f"{field}.{language}" for language in AddressSearch.LANGUAGES]
+
+
 @extend_schema_view(
     list=extend_schema(
         parameters=_list_parameters
+        + filter_parameters(ADDRESS_FILTERS)
         + _area_parameters
-        + _postal_code_parameters
-        + _municipality_parameters
+        + stream_parameters
     )
 )
-class AddressViewSet(ListModelMixin, GenericViewSet):
-    queryset = Address.objects.order_by("pk").prefetch_related(
-        "street__translations",
-        "postal_code_area__translations",
-        "municipality__translations",
-    )
+class AddressViewSet(StreamingListMixin, ListModelMixin, GenericViewSet):
+    # The addresses are read from the flattened address search view, which has
+    # the names of the related objects in every language on the same row.
+    queryset = AddressSearch.objects.order_by("pk")
+
+    serializer_class = AddressSearchSerializer
+
+    csv_fields = [
+        *_translated_columns("street.name"),
+        "number",
+        "number_end",
+        "letter",
+        "postal_code_area.postal_code",
+        *_translated_columns("postal_code_area.name"),
+        *_translated_columns("postal_code_area.post_office"),
+        "postal_code_area.area",
+        "location",
+        "modified_at",
+        "municipality.code",
+        *_translated_columns("municipality.name"),
+        "municipality.area",
+        "distance",
+    ]
+
+    flatgeobuf_fields = [
+        *(f"street_name_{language}" for language in AddressSearch.LANGUAGES),
+        "number",
+        "number_end",
+        "letter",
+        "postal_code",
+        *(f"postal_code_area_name_{language}" for language in AddressSearch.LANGUAGES),
+        *(f"post_office_{language}" for language in AddressSearch.LANGUAGES),
+        "municipality_code",
+        *(f"municipality_name_{language}" for language in AddressSearch.LANGUAGES),
+        "modified_at",
+        "location",
+    ]
+    flatgeobuf_geometry = "location"
+    # Some tens of MB of features
+    flatgeobuf_max_rows = 50_000
+
+    def list(self, request: Request, *args, **kwargs) -> HttpResponse:
+        if self._can_build_json_in_database(request):
+            return self._list_json_built_in_database()
+        return super().list(request, *args, **kwargs)
+
+    def _can_build_json_in_database(self, request: Request) -> bool:
+        # The areas, distances and other output formats are only serialized in
+        # Python, and the cursor pagination needs the model instances.
+        return (
+            settings.ADDRESS_JSON_IN_DATABASE
+            and request.accepted_renderer.format == "json"
+            and not show_area(self.get_serializer_context())
+            and not {"nearest", "stream", "cursor", "count_only"}
+            & request.query_params.keys()
+        )
 
-    serializer_class = AddressSerializer
+    def _list_json_built_in_database(self) -> HttpResponse:
+        precision = coordinate_precision(self.get_serializer_context())
+        addresses = self.get_queryset().annotate(json=address_json(precision))
+        page = self.paginate_queryset(addresses.values_list("json", flat=True))
+        envelope = self.get_paginated_response([]).data
+        del envelope["results"]
+        # The JSON of the rows is passed through as is
+        content = (
+            json.dumps(envelope, cls=JSONEncoder, ensure_ascii=False)[:-1]
+            + ',"results":['
+            + ",".join(page)
+            + "]}"
+        )
+        return HttpResponse(content, content_type="application/json")
 
     def get_queryset(self) -> QuerySet:
         addresses = self.queryset
-        addresses = self._filter_by_street_name(addresses)
-        addresses = self._filter_by_street_number(addresses)
-        addresses = self._filter_by_street_letter(addresses)
-        addresses = self._filter_by_municipality(addresses)
-        addresses = self._filter_by_municipality_code(addresses)
-        addresses = self._filter_by_postal_code(addresses)
-        addresses = self._filter_by_postal_code_area(addresses)
-        addresses = self._filter_by_post_office(addresses)
-        addresses = self._filter_by_bbox(addresses)
+        context = self.get_serializer_context()
+        # Validate the precision before the results are serialized or streamed
+        coordinate_precision(context)
+        if show_area(context):
+            # The area geometries are not in the view, so fetch them separately
+            addresses = addresses.prefetch_related(*_area_prefetches(context))
+        addresses = filter_queryset(
+            addresses, ADDRESS_FILTERS, self.request.query_params
+        )
+        addresses = self._filter_by_search(addresses)
         addresses = self._filter_by_location(addresses)
         return addresses
 
-    def _filter_by_street_name(self, addresses: QuerySet) -> QuerySet:
-        street_name = self.request.query_params.get("streetname")
-        if street_name is None:
+    def _filter_by_search(self, addresses: QuerySet) -> QuerySet:
+        text = self.request.query_params.get("q")
+        if text is None:
             return addresses
-        street_ids = list(
-            Street.objects.filter(translations__name__iexact=street_name).values_list(
-                "id", flat=True
-            )
+        # The text is tokenized by PostgreSQL, and every token must match
+        query = SearchQuery(text, config=SEARCH_CONFIG, search_type="plain")
+        # Normalizing the rank by the document length ranks the addresses without
+        # extra components (e.g. letters or number ranges) first.
+        rank = SearchRank(F("search_vector"), query, normalization=2)
+        return (
+            addresses.filter(search_vector=query)
+            .annotate(rank=rank)
+            .order_by("-rank", "pk")
         )
-        return addresses.filter(street_id__in=street_ids)
-
-    def _filter_by_street_number(self, addresses: QuerySet) -> QuerySet:
-        street_number = self.request.query_params.get("streetnumber")
-        if street_number is None:
-            return addresses
-        return addresses.filter(
-            Q(number__iexact=street_number) | Q(number_end__iexact=street_number)
-        )
-
-    def _filter_by_street_letter(self, addresses: QuerySet) -> QuerySet:
-        street_letter = self.request.query_params.get("streetletter")
-        if street_letter is None:
-            return addresses
-        return addresses.filter(letter__iexact=street_letter)
-
-    def _filter_by_municipality(self, addresses: QuerySet) -> QuerySet:
-        municipality = self.request.query_params.get("municipality")
-        if municipality is None:
-            return addresses
-        municipality_ids = list(
-            Municipality.objects.filter(
-                translations__name__iexact=municipality
-            ).values_list("id", flat=True)
-        )
-        return addresses.filter(municipality_id__in=municipality_ids)
-
-    def _filter_by_municipality_code(self, addresses: QuerySet) -> QuerySet:
-        municipality_code = self.request.query_params.get("municipalitycode")
-        if municipality_code is None:
-            return addresses
-        municipality_ids = list(
-            Municipality.objects.filter(code=municipality_code).values_list(
-                "id", flat=True
-            )
-        )
-        return addresses.filter(municipality_id__in=municipality_ids)
-
-    def _filter_by_postal_code(self, addresses: QuerySet) -> QuerySet:
-        postal_code = self.request.query_params.get("postalcode")
-        if postal_code is None:
-            return addresses
-        return addresses.filter(postal_code_area__postal_code__iexact=postal_code)
-
-    def _filter_by_postal_code_area(self, addresses: QuerySet) -> QuerySet:
-        postal_code_area = self.request.query_params.get("postalcodearea")
-        if postal_code_area is None:
-            return addresses
-        postal_code_area_ids = list(
-            PostalCodeArea.objects.filter(
-                translations__name__iexact=postal_code_area
-            ).values_list("id", flat=True)
-        )
-        return addresses.filter(postal_code_area_id__in=postal_code_area_ids)
-
-    def _filter_by_post_office(self, addresses: QuerySet) -> QuerySet:
-        post_office = self.request.query_params.get("postoffice")
-        if post_office is None:
-            return addresses
-        postal_code_area_ids = list(
-            PostalCodeArea.objects.filter(
-                translations__post_office__iexact=post_office
-            ).values_list("id", flat=True)
-        )
-        return addresses.filter(postal_code_area_id__in=postal_code_area_ids)
-
-    def _filter_by_bbox(self, addresses: QuerySet) -> QuerySet:
-        bbox = self.request.query_params.get("bbox")
-        if bbox is None:
-            return addresses
-        try:
-            polygon = Polygon.from_bbox(float(point) for point in bbox.split(","))
-            polygon.srid = settings.PROJECTION_SRID
-        except ValueError:
-            raise ParseError(
-                "bbox values must be floating points or integers "
-                "in the format 'left,bottom,right,top'"
-            )
-        return addresses.filter(location__within=polygon)
 
     def _filter_by_location(self, addresses: QuerySet) -> QuerySet:
         lat = self.request.query_params.get("lat")
         lon = self.request.query_params.get("lon")
+        nearest = self.request.query_params.get("nearest")
         if lat is None and lon is None:
+            if nearest is not None:
+                raise ParseError("'nearest' requires 'lat' and 'lon'")
             return addresses
+        point = _location(lat, lon)
+        # Distances are computed in a metric projection, so they are in meters
+        point.transform(settings.METRIC_PROJECTION_SRID)
+        if nearest is not None:
+            return self._find_nearest(addresses, point, nearest)
+        distance = _distance(self.request.query_params.get("distance", "1"))
+        return self._filter_by_distance(addresses, point, distance)
+
+    def _find_nearest(
+        self, addresses: QuerySet, point: Point, nearest: str
+    ) -> QuerySet:
         try:
-            lat = float(lat)
-            lon = float(lon)
-        except (ValueError, TypeError):
-            raise ParseError("'lat' and 'lon' must be provided as numbers")
-        try:
-            distance = float(self.request.query_params.get("distance", 1))
+            nearest = int(nearest)
         except ValueError:
-            raise ParseError("'distance' must be a number")
-        point = Point(lon, lat, srid=settings.PROJECTION_SRID)
-        # WGS84 uses degrees as units, so for the buffer we need the approximate degrees
-        distance_degrees = 2 * distance / 40000000 * 360 / cos(point.y / 360 * pi)
-        # To make the address lookups faster, we first use a buffer to limit the
-        # addresses to a smaller area. Then we can find the addresses by comparing
-        # their distances to the point. This way we don't have to do the comparison
-        # for every single address.
-        buffer = point.buffer(distance_degrees)
-        return addresses.filter(
-            location__intersects=buffer,
-            location__distance_lte=(point, D(m=distance)),
+            raise ParseError("'nearest' must be an integer")
+        if not 1 <= nearest <= MAX_NEAREST_ADDRESSES:
+            raise ParseError(f"'nearest' must be between 1 and {MAX_NEAREST_ADDRESSES}")
+        distance = self.request.query_params.get("distance")
+        if distance is not None:
+            addresses = self._filter_by_distance(addresses, point, _distance(distance))
+        # Ordering by the <-> operator lets PostgreSQL walk the projected location
+        # GiST index in distance order and stop after `nearest` rows, instead of
+        # sorting every candidate address.
+        return addresses.annotate(
+            distance=Distance("projected_location", point)
+        ).order_by(GeometryDistance("projected_location", point))[:nearest]
+
+    def _filter_by_distance(
+        self, addresses: QuerySet, point: Point, distance: float
+    ) -> QuerySet:
+        # ST_DWithin uses the projected location GiST index to find the candidates
+        # within the bounding box of the circle, and then compares the exact
+        # distances (in meters) only for those.
+        return addresses.filter(projected_location__dwithin=(point, D(m=distance)))
+
+    @extend_schema(
+        request=BatchGeocodingSerializer,
+        responses=AddressSearchSerializer(many=True),
+        parameters=_area_parameters,
+        description=(
+            f"Geocode up to {MAX_BATCH_ADDRESSES} addresses at once. Each address is "
+            "given either as free text (`q`) or as components named like the "
+            "filters of the address list, of which `streetname` is required. "
+            "The results contain the best matching address for each given "
+            "address in the same order, or null if nothing matches."
+        ),
+    )
+    @action(detail=False, methods=["post"])
+    def batch(self, request: Request) -> Response:
+        serializer = BatchGeocodingSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        addresses = serializer.validated_data["addresses"]
+        queries = [AddressQuery(**address) for address in addresses]
+        return self._batch_response(geocode_batch(queries))
+
+    @extend_schema(
+        request=BatchReverseGeocodingSerializer,
+        responses=AddressSearchSerializer(many=True),
+        parameters=_area_parameters,
+        description=(
+            f"Find the nearest address for each of up to {MAX_BATCH_LOCATIONS} "
+            "locations in the WGS84 (EPSG: 4326) coordinate system. The results "
+            "contain the nearest address for each location in the same order, "
+            "including its `distance` (in meters) from the location, or null if "
+            "there is no address within the optional maximum `distance`."
+        ),
+    )
+    @action(detail=False, methods=["post"], url_path="batch/reverse")
+    def reverse_batch(self, request: Request) -> Response:
+        serializer = BatchReverseGeocodingSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        locations = [
+            (location["lon"], location["lat"])
+            for location in serializer.validated_data["locations"]
+        ]
+        addresses = reverse_geocode_batch(
+            locations, serializer.validated_data.get("distance")
+        )
+        return self._batch_response(addresses)
+
+    def _batch_response(self, addresses: list[AddressSearch | None]) -> Response:
+        context = self.get_serializer_context()
+        if show_area(context):
+            prefetch_related_objects(
+                [address for address in addresses if address is not None],
+                *_area_prefetches(context),
+            )
+        serializer = AddressSearchSerializer(context=context)
+        return Response(
+            {
+                "results": [
+                    serializer.to_representation(address)
+                    if address is not None
+                    else None
+                    for address in addresses
+                ]
+            }
         )
 
 
 @extend_schema_view(
-    list=extend_schema(parameters=_area_parameters + _postal_code_parameters),
+    list=extend_schema(
+        parameters=filter_parameters(POSTAL_CODE_AREA_FILTERS)
+        + _area_parameters
+        + _simplification_parameters
+        + _clip_parameters
+        + stream_parameters
+        + topology_parameters
+    ),
 )
-class PostalCodeAreaViewSet(ListModelMixin, GenericViewSet):
+class PostalCodeAreaViewSet(
+    TopologyListMixin, StreamingListMixin, ListModelMixin, GenericViewSet
+):
     queryset = PostalCodeArea.objects.order_by("pk").prefetch_related("translations")
     serializer_class = PostalCodeAreaSerializer
+    csv_fields = [
+        "postal_code",
+        *_translated_columns("name"),
+        *_translated_columns("post_office"),
+        "area",
+    ]
+    flatgeobuf_fields = ["postal_code", "area"]
+    flatgeobuf_expressions = {
+        **_translation_expressions(PostalCodeArea, "name"),
+        **_translation_expressions(PostalCodeArea, "post_office"),
+    }
+    flatgeobuf_geometry = "area"
+    topology_filters = POSTAL_CODE_AREA_FILTERS
 
     def get_queryset(self) -> QuerySet:
-        areas = self.queryset
-        areas = self._filter_by_postal_code(areas)
-        areas = self._filter_by_postal_code_area(areas)
-        areas = self._filter_by_post_office(areas)
-        return areas
-
-    def _filter_by_postal_code(self, areas: QuerySet) -> QuerySet:
-        postal_code = self.request.query_params.get("postalcode")
-        if postal_code is None:
-            return areas
-        return areas.filter(postal_code__iexact=postal_code)
-
-    def _filter_by_postal_code_area(self, areas: QuerySet) -> QuerySet:
-        postal_code_area = self.request.query_params.get("postalcodearea")
-        if postal_code_area is None:
-            return areas
-        area_ids = list(
-            PostalCodeArea.objects.filter(
-                translations__name__iexact=postal_code_area
-            ).values_list("id", flat=True)
-        )
-        return areas.filter(id__in=area_ids)
-
-    def _filter_by_post_office(self, areas: QuerySet) -> QuerySet:
-        post_office = self.request.query_params.get("postoffice")
-        if post_office is None:
-            return areas
-        area_ids = list(
-            PostalCodeArea.objects.filter(
-                translations__post_office__iexact=post_office
-            ).values_list("id", flat=True)
+        queryset = filter_queryset(
+            self.queryset, POSTAL_CODE_AREA_FILTERS, self.request.query_params
         )
-        return areas.filter(id__in=area_ids)
+        return _with_requested_areas(queryset, self.get_serializer_context())
 
 
 @extend_schema_view(
-    list=extend_schema(parameters=_area_parameters + _municipality_parameters),
+    list=extend_schema(
+        parameters=filter_parameters(MUNICIPALITY_FILTERS)
+        + _area_parameters
+        + _simplification_parameters
+        + _clip_parameters
+        + stream_parameters
+        + topology_parameters
+    ),
 )
-class MunicipalityViewSet(ListModelMixin, GenericViewSet):
+class MunicipalityViewSet(
+    TopologyListMixin, StreamingListMixin, ListModelMixin, GenericViewSet
+):
     queryset = Municipality.objects.order_by("pk").prefetch_related("translations")
     serializer_class = MunicipalitySerializer
+    csv_fields = ["code", *_translated_columns("name"), "area"]
+    flatgeobuf_fields = ["code", "area"]
+    flatgeobuf_expressions = _translation_expressions(Municipality, "name")
+    flatgeobuf_geometry = "area"
+    topology_filters = MUNICIPALITY_FILTERS
 
     def get_queryset(self) -> QuerySet:
-        municipalities = self.queryset
-        municipalities = self._filter_by_municipality(municipalities)
-        municipalities = self._filter_by_municipality_code(municipalities)
-        return municipalities
-
-    def _filter_by_municipality(self, municipalities: QuerySet) -> QuerySet:
-        municipality = self.request.query_params.get("municipality")
-        if municipality is None:
-            return municipalities
-        municipality_ids = list(
-            Municipality.objects.filter(
-                translations__name__iexact=municipality
-            ).values_list("id", flat=True)
+        queryset = filter_queryset(
+            self.queryset, MUNICIPALITY_FILTERS, self.request.query_params
         )
-        return municipalities.filter(id__in=municipality_ids)
+        return _with_requested_areas(queryset, self.get_serializer_context())
 
-    def _filter_by_municipality_code(self, municipalities: QuerySet) -> QuerySet:
-        municipality_code = self.request.query_params.get("municipalitycode")
-        if municipality_code is None:
-            return municipalities
-        return municipalities.filter(code=municipality_code)
+
+@extend_schema_view(
+    list=extend_schema(
+        parameters=_autocomplete_parameters,
+        responses=SuggestionSerializer(many=True),
+    ),
+)
+class AutocompleteViewSet(ViewSet):
+    """
+    Suggestions of streets, postal code areas and municipalities for partial
+    names, best match first.
+    """
+
+    def list(self, request: Request) -> Response:
+        text = request.query_params.get("q", "").strip()
+        if len(text) < AUTOCOMPLETE_MIN_LENGTH:
+            raise ParseError(
+                f"'q' must be at least {AUTOCOMPLETE_MIN_LENGTH} characters long"
+            )
+        try:
+            limit = int(request.query_params.get("limit", AUTOCOMPLETE_DEFAULT_LIMIT))
+        except ValueError:
+            raise ParseError("'limit' must be an integer")
+        if not 1 <= limit <= AUTOCOMPLETE_MAX_LIMIT:
+            raise ParseError(f"'limit' must be between 1 and {AUTOCOMPLETE_MAX_LIMIT}")
+        suggestions = autocomplete(text, limit)
+        serializer = SuggestionSerializer(
+            suggestions, many=True, context={"request": request}
+        )
+        return Response({"results": serializer.data})
+
+
+@extend_schema_view(
+    list=extend_schema(
+        parameters=_area_lookup_parameters + _area_parameters,
+        responses=AreaMatchSerializer,
+    ),
+    batch=extend_schema(
+        request=BatchAreaLookupSerializer,
+        responses=AreaMatchSerializer(many=True),
+        parameters=_area_parameters,
+        description=(
+            f"Find the areas containing each of up to {MAX_BATCH_LOCATIONS} "
+            "locations in the WGS84 (EPSG: 4326) coordinate system, in the same "
+            "order."
+        ),
+    ),
+)
+class AreaLookupViewSet(ViewSet):
+    """
+    The municipality and the postal code area containing a location. Either may
+    be null if the location is outside all of them.
+    """
+
+    def list(self, request: Request) -> Response:
+        point = _location(
+            request.query_params.get("lat"), request.query_params.get("lon")
+        )
+        serializer = AreaMatchSerializer(
+            area_lookup.find(point.x, point.y), context={"request": request}
+        )
+        return Response(serializer.data)
+
+    @action(detail=False, methods=["post"])
+    def batch(self, request: Request) -> Response:
+        serializer = BatchAreaLookupSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        matches = [
+            area_lookup.find(location["lon"], location["lat"])
+            for location in serializer.validated_data["locations"]
+        ]
+        serializer = AreaMatchSerializer(
+            matches, many=True, context={"request": request}
+        )
+        return Response({"results": serializer.data})
@@ -2,11 +2,29 @@ from gisserver.features import FeatureType, ServiceDescription
 from gisserver.geometries import CRS
 from gisserver.views import WFSView
 
-from ..models import Address, Municipality, PostalCodeArea
+from ..models import (
+    AREA_SUMMARY_FIELDS,
+    FORMATTED_AREA_FIELDS,
+    Address,
+    Municipality,
+    PostalCodeArea,
+)
 
 ETRS_TM35FIN = CRS.from_srid(3067)
 
 
+def _area_fields(model) -> list[str]:
+    """
+    The fields of the area model without the formatted copies and the summaries
+    of the area.
+    """
+    return [
+        field.name
+        for field in model._meta.concrete_fields
+        if field.name not in FORMATTED_AREA_FIELDS + AREA_SUMMARY_FIELDS
+    ]
+
+
 class GeoWFSView(WFSView):
     xml_namespace = "https://paikkatietohaku.api.hel.fi/wfs"
 
@@ -22,9 +40,13 @@ class GeoWFSView(WFSView):
     feature_types = [
         FeatureType(Address.objects.all(), fields="__all__", other_crs=[ETRS_TM35FIN]),
         FeatureType(
-            Municipality.objects.all(), fields="__all__", other_crs=[ETRS_TM35FIN]
+            Municipality.objects.all(),
+            fields=_area_fields(Municipality),
+            other_crs=[ETRS_TM35FIN],
         ),
         FeatureType(
-            PostalCodeArea.objects.all(), fields="__all__", other_crs=[ETRS_TM35FIN]
+            PostalCodeArea.objects.all(),
+            fields=_area_fields(PostalCodeArea),
+            other_crs=[ETRS_TM35FIN],
         ),
     ]
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AddressConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "address"
+
+    def ready(self) -> None:
+        from . import checks  # noqa: F401
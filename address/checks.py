@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core import checks
+
+from .models import FORMATTED_AREA_PRECISION
+
+
+@checks.register()
+def check_formatted_area_precision(app_configs, **kwargs) -> list[checks.Warning]:
+    """
+    The stored formatted areas are returned only at their own precision, so they
+    are not used by default if the default precision differs from it.
+    """
+    if settings.COORDINATE_PRECISION == FORMATTED_AREA_PRECISION:
+        return []
+    return [
+        checks.Warning(
+            f"COORDINATE_PRECISION is {settings.COORDINATE_PRECISION}, but the "
+            f"areas are stored formatted at precision {FORMATTED_AREA_PRECISION}, "
+            "so the areas are formatted anew for every request.",
+            hint=(
+                "Set COORDINATE_PRECISION to FORMATTED_AREA_PRECISION, or change "
+                "FORMATTED_AREA_PRECISION and migrate the formatted areas."
+            ),
+            id="address.W001",
+        )
+    ]
@@ -0,0 +1,88 @@
+"""
+Measures the serialization time of the address, postal code area and
+municipality serializers on the data in the database. The addresses listed by
+the API are serialized from the address search view by AddressSearchSerializer.
+"""
+
+from functools import partial
+from itertools import cycle, islice
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from rest_framework import serializers
+
+from address.api.serializers import (
+    AddressSearchSerializer,
+    AddressSerializer,
+    MunicipalitySerializer,
+    PostalCodeAreaSerializer,
+)
+from address.models import Address, AddressSearch, Municipality, PostalCodeArea
+
+
+def _field_by_field(serializer: serializers.Serializer, obj) -> dict:
+    """
+    Serialize the object through the serializer fields, as DRF does. The nested
+    serializers are still compiled.
+    """
+    return serializers.Serializer.to_representation(serializer, obj)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the serialization time of the address, postal code area and "
+        "municipality serializers, compiled and field by field."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--count",
+            type=int,
+            default=10000,
+            help="Number of objects to serialize with each serializer.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        count = options["count"]
+        benchmarks = [
+            (AddressSearchSerializer, AddressSearch.objects.all()),
+            (
+                AddressSerializer,
+                Address.objects.select_related(
+                    "street", "postal_code_area", "municipality"
+                ).prefetch_related(
+                    "street__translations",
+                    "postal_code_area__translations",
+                    "municipality__translations",
+                ),
+            ),
+            (
+                PostalCodeAreaSerializer,
+                PostalCodeArea.objects.defer("area").prefetch_related("translations"),
+            ),
+            (
+                MunicipalitySerializer,
+                Municipality.objects.defer("area").prefetch_related("translations"),
+            ),
+        ]
+        for serializer_class, queryset in benchmarks:
+            objects = list(queryset[:count])
+            if not objects:
+                self.stdout.write(f"{serializer_class.__name__}: no data.")
+                continue
+            # Repeat the objects up to the count, their relations are prefetched
+            objects = list(islice(cycle(objects), count))
+            compiled = self._measure(serializer_class().to_representation, objects)
+            field_by_field = self._measure(
+                partial(_field_by_field, serializer_class()), objects
+            )
+            self.stdout.write(
+                f"{serializer_class.__name__}: {count} objects compiled in "
+                f"{compiled:.3f} s, field by field in {field_by_field:.3f} s."
+            )
+
+    def _measure(self, serialize, objects: list) -> float:
+        start_time = perf_counter()
+        for obj in objects:
+            serialize(obj)
+        return perf_counter() - start_time
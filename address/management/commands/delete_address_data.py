@@ -6,7 +6,14 @@ from time import time
 
 from django.core.management.base import BaseCommand
 
-from address.models import Address, Municipality, PostalCodeArea, Street
+from address.models import (
+    Address,
+    AreaTopology,
+    Municipality,
+    PostalCodeArea,
+    Street,
+)
+from address.services.search import refresh_address_search
 
 
 class Command(BaseCommand):
@@ -19,6 +26,8 @@ class Command(BaseCommand):
         Street.objects.all().delete()
         Address.objects.all().delete()
         PostalCodeArea.objects.all().delete()
+        AreaTopology.objects.all().delete()
+        refresh_address_search()
         self.stdout.write(
             self.style.SUCCESS(
                 f"Address data deleted in {time() - start_time:.0f} seconds."
@@ -23,6 +23,7 @@ from django.contrib.gis.gdal import DataSource
 from django.core.management.base import BaseCommand
 
 from ...services.address_import import AddressImporter
+from ...services.search import refresh_address_search
 
 
 class Command(BaseCommand):
@@ -48,6 +49,8 @@ class Command(BaseCommand):
                 num_addresses = importer.import_addresses(layer)
                 total_addresses += num_addresses
                 self.stdout.write(f"{num_addresses} addresses imported from {path}.")
+        self.stdout.write("Refreshing address search data.")
+        refresh_address_search()
         self.stdout.write(
             self.style.SUCCESS(
                 f"{total_addresses} addresses imported "
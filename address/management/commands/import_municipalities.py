@@ -14,6 +14,8 @@ from time import time
 from django.contrib.gis.gdal import DataSource
 from django.core.management.base import BaseCommand
 
+from ...models import Municipality
+from ...services.area_update import finish_area_updates
 from ...services.municipality_import import MunicipalityImporter
 
 
@@ -32,6 +34,11 @@ class Command(BaseCommand):
             self.stdout.write(f"Reading data from {path}.")
             for layer in DataSource(path, encoding="utf-8"):
                 num_addresses_updated += importer.import_municipalities(layer)
+        self.stdout.write(
+            "Simplifying the areas, building their topology and refreshing "
+            "address search data."
+        )
+        finish_area_updates(Municipality)
         self.stdout.write(
             self.style.SUCCESS(
                 f"{num_addresses_updated} addresses updated "
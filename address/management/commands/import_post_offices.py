@@ -23,6 +23,7 @@ import requests
 from django.core.management.base import BaseCommand, CommandError
 
 from address.models import PostalCodeArea
+from address.services.area_update import finish_area_updates
 
 logger = logging.getLogger(__name__)
 
@@ -60,6 +61,10 @@ class Command(BaseCommand):
                 "You must provide either a file path or a URL using --url option"
             )
 
+        # The topology of the postal code areas has their post offices
+        self.stdout.write("Building the topology and refreshing address search data.")
+        finish_area_updates(PostalCodeArea, simplify=False)
+
         self.stdout.write(
             self.style.SUCCESS(
                 f"{num_updated} postal code areas updated "
@@ -12,6 +12,8 @@ from time import time
 from django.contrib.gis.gdal import DataSource
 from django.core.management.base import BaseCommand
 
+from ...models import PostalCodeArea
+from ...services.area_update import finish_area_updates
 from ...services.postal_code_area_import import PostalCodeAreaImporter
 
 
@@ -31,6 +33,11 @@ class Command(BaseCommand):
                 num_addresses_updated += (
                     PostalCodeAreaImporter().import_postal_code_areas(layer)
                 )
+        self.stdout.write(
+            "Simplifying the areas, building their topology and refreshing "
+            "address search data."
+        )
+        finish_area_updates(PostalCodeArea)
         self.stdout.write(
             self.style.SUCCESS(
                 f"{num_addresses_updated} addresses updated "
@@ -0,0 +1,44 @@
+"""
+Updates the data derived from the addresses, streets, postal code areas and
+municipalities after they have been edited in the admin: the simplifications
+and topologies of the areas, and the address search view. The API keeps
+serving the old data until this has been run.
+"""
+
+from time import time
+
+from django.core.management.base import BaseCommand
+
+from address.models import Municipality, PostalCodeArea
+from address.services.search import refresh_address_search
+from address.services.simplification import simplify_areas
+from address.services.topology import store_topology
+
+
+class Command(BaseCommand):
+    help = "Updates the data derived from the addresses and areas edited in the admin."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--no-simplify",
+            action="store_true",
+            help="Do not simplify the areas, e.g. if only names have changed.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        start_time = time()
+        for model in (Municipality, PostalCodeArea):
+            if not options["no_simplify"]:
+                self.stdout.write(f"Simplifying the {model._meta.verbose_name_plural}.")
+                simplify_areas(model)
+            self.stdout.write(
+                f"Building the topology of the {model._meta.verbose_name_plural}."
+            )
+            store_topology(model)
+        self.stdout.write("Refreshing address search data.")
+        refresh_address_search()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Address data refreshed in {time() - start_time:.0f} seconds."
+            )
+        )
@@ -0,0 +1,69 @@
+"""
+Renders the vector tiles covering the municipalities of a province into the
+tile cache, so that the maps do not have to wait for them to be rendered.
+"""
+
+from functools import partial
+from time import time
+
+from django.contrib.gis.db.models import Extent
+from django.core.management.base import BaseCommand, CommandError
+
+from address.constants import MUNICIPALITIES
+from address.models import Municipality
+from address.services.tile_cache import tile_cache
+from address.services.tiles import (
+    ADDRESS_MIN_ZOOM,
+    MAX_TILE_ZOOM,
+    TILE_LAYERS,
+    render_tile,
+    tiles_within,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Renders the vector tiles covering the municipalities of the province "
+        "into the tile cache."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("province", choices=list(MUNICIPALITIES))
+        parser.add_argument("--min-zoom", type=int, default=0)
+        parser.add_argument("--max-zoom", type=int, default=ADDRESS_MIN_ZOOM)
+        parser.add_argument(
+            "--layer",
+            action="append",
+            choices=list(TILE_LAYERS),
+            help="Layer to render. By default, all the layers are rendered.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        if not tile_cache.enabled:
+            raise CommandError("The tile cache is disabled, set TILE_CACHE_DIR.")
+        min_zoom, max_zoom = options["min_zoom"], options["max_zoom"]
+        if not 0 <= min_zoom <= max_zoom <= MAX_TILE_ZOOM:
+            raise CommandError(
+                f"The zoom levels must be within 0-{MAX_TILE_ZOOM}, the minimum first."
+            )
+        extent = Municipality.objects.filter(
+            code__in=MUNICIPALITIES[options["province"]]
+        ).aggregate(extent=Extent("area"))["extent"]
+        if extent is None:
+            raise CommandError("The municipalities of the province have no areas.")
+        start_time = time()
+        num_tiles = 0
+        for layer in options["layer"] or TILE_LAYERS:
+            tile_layer = TILE_LAYERS[layer]
+            self.stdout.write(f"Rendering {layer} tiles.")
+            zooms = (max(min_zoom, tile_layer.min_zoom), max_zoom)
+            for z, x, y in tiles_within(extent, *zooms):
+                # The tiles already in the cache are not rendered again
+                render = partial(render_tile, tile_layer, z, x, y)
+                tile_cache.get(layer, z, x, y, render)
+                num_tiles += 1
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{num_tiles} tiles seeded in {time() - start_time:.0f} seconds."
+            )
+        )
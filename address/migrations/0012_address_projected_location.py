@@ -0,0 +1,33 @@
+# Generated by Django 6.0.5 on 2026-10-18 10:41
+
+import django.contrib.gis.db.models.fields
+import django.contrib.gis.db.models.functions
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("address", "0011_postalcodearea_post_office"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="address",
+            name="projected_location",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.contrib.gis.db.models.functions.Transform(
+                    "location", 3067
+                ),
+                output_field=django.contrib.gis.db.models.fields.PointField(srid=3067),
+                verbose_name="Projected location",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="address",
+            index=django.contrib.postgres.indexes.GistIndex(
+                fields=["projected_location"], name="idx_address_projected_location"
+            ),
+        ),
+    ]
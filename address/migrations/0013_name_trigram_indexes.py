@@ -0,0 +1,46 @@
+# Generated by Django 6.0.5 on 2026-10-18 11:27
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("address", "0012_address_projected_location"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="municipalitytranslation",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"),
+                    name="gin_trgm_ops",
+                ),
+                name="idx_municipality_name_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="streettranslation",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"),
+                    name="gin_trgm_ops",
+                ),
+                name="idx_street_name_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="postalcodeareatranslation",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"),
+                    name="gin_trgm_ops",
+                ),
+                name="idx_postal_code_area_name_trgm",
+            ),
+        ),
+    ]
@@ -0,0 +1,236 @@
+# Generated by Django 6.0.5 on 2026-10-18 13:20
+
+import django.contrib.gis.db.models.fields
+import django.contrib.postgres.fields
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+# One row per address, with the names of the street, postal code area and
+# municipality in every language and a full text search vector of all of them.
+CREATE_ADDRESS_SEARCH_SQL = """
+CREATE MATERIALIZED VIEW address_address_search AS
+WITH street_names AS (
+    SELECT
+        master_id,
+        max(name) FILTER (WHERE language_code = 'fi') AS name_fi,
+        max(name) FILTER (WHERE language_code = 'sv') AS name_sv,
+        max(name) FILTER (WHERE language_code = 'en') AS name_en
+    FROM address_street_translation
+    GROUP BY master_id
+),
+municipality_names AS (
+    SELECT
+        master_id,
+        max(name) FILTER (WHERE language_code = 'fi') AS name_fi,
+        max(name) FILTER (WHERE language_code = 'sv') AS name_sv,
+        max(name) FILTER (WHERE language_code = 'en') AS name_en
+    FROM address_municipality_translation
+    GROUP BY master_id
+),
+postal_code_area_names AS (
+    SELECT
+        master_id,
+        array_agg(language_code ORDER BY language_code) AS languages,
+        max(name) FILTER (WHERE language_code = 'fi') AS name_fi,
+        max(name) FILTER (WHERE language_code = 'sv') AS name_sv,
+        max(name) FILTER (WHERE language_code = 'en') AS name_en,
+        max(post_office) FILTER (WHERE language_code = 'fi') AS post_office_fi,
+        max(post_office) FILTER (WHERE language_code = 'sv') AS post_office_sv,
+        max(post_office) FILTER (WHERE language_code = 'en') AS post_office_en
+    FROM address_postalcodearea_translation
+    GROUP BY master_id
+)
+SELECT
+    address.id,
+    address.street_id,
+    street.name_fi AS street_name_fi,
+    street.name_sv AS street_name_sv,
+    street.name_en AS street_name_en,
+    address.number,
+    address.number_end,
+    address.letter,
+    address.postal_code_area_id,
+    postal_code_area.postal_code,
+    coalesce(postal_code_area_names.languages, '{}') AS postal_code_area_languages,
+    postal_code_area_names.name_fi AS postal_code_area_name_fi,
+    postal_code_area_names.name_sv AS postal_code_area_name_sv,
+    postal_code_area_names.name_en AS postal_code_area_name_en,
+    postal_code_area_names.post_office_fi,
+    postal_code_area_names.post_office_sv,
+    postal_code_area_names.post_office_en,
+    address.municipality_id,
+    municipality.code AS municipality_code,
+    municipality_names.name_fi AS municipality_name_fi,
+    municipality_names.name_sv AS municipality_name_sv,
+    municipality_names.name_en AS municipality_name_en,
+    address.location,
+    address.projected_location,
+    address.modified_at,
+    setweight(to_tsvector('simple', concat_ws(' ',
+        street.name_fi, street.name_sv, street.name_en
+    )), 'A')
+    || setweight(to_tsvector('simple', concat_ws(' ',
+        address.number, address.number_end, address.letter,
+        nullif(address.number || address.letter, address.number)
+    )), 'B')
+    || setweight(to_tsvector('simple', concat_ws(' ',
+        postal_code_area.postal_code,
+        postal_code_area_names.name_fi,
+        postal_code_area_names.name_sv,
+        postal_code_area_names.name_en,
+        postal_code_area_names.post_office_fi,
+        postal_code_area_names.post_office_sv,
+        postal_code_area_names.post_office_en
+    )), 'C')
+    || setweight(to_tsvector('simple', concat_ws(' ',
+        municipality_names.name_fi,
+        municipality_names.name_sv,
+        municipality_names.name_en
+    )), 'C') AS search_vector
+FROM address_address address
+JOIN address_municipality municipality
+    ON municipality.id = address.municipality_id
+LEFT JOIN street_names street
+    ON street.master_id = address.street_id
+LEFT JOIN municipality_names
+    ON municipality_names.master_id = address.municipality_id
+LEFT JOIN address_postalcodearea postal_code_area
+    ON postal_code_area.id = address.postal_code_area_id
+LEFT JOIN postal_code_area_names
+    ON postal_code_area_names.master_id = address.postal_code_area_id;
+
+-- Required for refreshing the view concurrently
+CREATE UNIQUE INDEX idx_address_search_id ON address_address_search (id);
+CREATE INDEX idx_address_search_municipality_id
+    ON address_address_search (municipality_id, id);
+CREATE INDEX idx_address_search_street_id ON address_address_search (street_id);
+CREATE INDEX idx_address_search_postal_code_area_id
+    ON address_address_search (postal_code_area_id);
+-- Case-insensitive (__iexact) lookups of the names in any language
+CREATE INDEX idx_address_search_street_name_fi_upper
+    ON address_address_search (UPPER(street_name_fi));
+CREATE INDEX idx_address_search_street_name_sv_upper
+    ON address_address_search (UPPER(street_name_sv));
+CREATE INDEX idx_address_search_street_name_en_upper
+    ON address_address_search (UPPER(street_name_en));
+CREATE INDEX idx_address_search_municipality_name_fi_upper
+    ON address_address_search (UPPER(municipality_name_fi));
+CREATE INDEX idx_address_search_municipality_name_sv_upper
+    ON address_address_search (UPPER(municipality_name_sv));
+CREATE INDEX idx_address_search_municipality_name_en_upper
+    ON address_address_search (UPPER(municipality_name_en));
+CREATE INDEX idx_address_search_postal_code_area_name_fi_upper
+    ON address_address_search (UPPER(postal_code_area_name_fi));
+CREATE INDEX idx_address_search_postal_code_area_name_sv_upper
+    ON address_address_search (UPPER(postal_code_area_name_sv));
+CREATE INDEX idx_address_search_postal_code_area_name_en_upper
+    ON address_address_search (UPPER(postal_code_area_name_en));
+CREATE INDEX idx_address_search_post_office_fi_upper
+    ON address_address_search (UPPER(post_office_fi));
+CREATE INDEX idx_address_search_post_office_sv_upper
+    ON address_address_search (UPPER(post_office_sv));
+CREATE INDEX idx_address_search_post_office_en_upper
+    ON address_address_search (UPPER(post_office_en));
+CREATE INDEX idx_address_search_location
+    ON address_address_search USING gist (location);
+CREATE INDEX idx_address_search_projected_location
+    ON address_address_search USING gist (projected_location);
+CREATE INDEX idx_address_search_search_vector
+    ON address_address_search USING gin (search_vector);
+"""
+
+DROP_ADDRESS_SEARCH_SQL = "DROP MATERIALIZED VIEW address_address_search;"
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("address", "0013_name_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AddressSearch",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("street_name_fi", models.CharField(max_length=100, null=True)),
+                ("street_name_sv", models.CharField(max_length=100, null=True)),
+                ("street_name_en", models.CharField(max_length=100, null=True)),
+                ("number", models.CharField(max_length=6)),
+                ("number_end", models.CharField(max_length=6)),
+                ("letter", models.CharField(max_length=2)),
+                ("postal_code", models.CharField(max_length=5, null=True)),
+                (
+                    "postal_code_area_languages",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.CharField(max_length=15), size=None
+                    ),
+                ),
+                (
+                    "postal_code_area_name_fi",
+                    models.CharField(max_length=100, null=True),
+                ),
+                (
+                    "postal_code_area_name_sv",
+                    models.CharField(max_length=100, null=True),
+                ),
+                (
+                    "postal_code_area_name_en",
+                    models.CharField(max_length=100, null=True),
+                ),
+                ("post_office_fi", models.CharField(max_length=100, null=True)),
+                ("post_office_sv", models.CharField(max_length=100, null=True)),
+                ("post_office_en", models.CharField(max_length=100, null=True)),
+                ("municipality_code", models.CharField(max_length=3)),
+                ("municipality_name_fi", models.CharField(max_length=100, null=True)),
+                ("municipality_name_sv", models.CharField(max_length=100, null=True)),
+                ("municipality_name_en", models.CharField(max_length=100, null=True)),
+                (
+                    "location",
+                    django.contrib.gis.db.models.fields.PointField(srid=4326),
+                ),
+                (
+                    "projected_location",
+                    django.contrib.gis.db.models.fields.PointField(srid=3067),
+                ),
+                ("modified_at", models.DateTimeField()),
+                (
+                    "search_vector",
+                    django.contrib.postgres.search.SearchVectorField(),
+                ),
+                (
+                    "municipality",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="address.municipality",
+                    ),
+                ),
+                (
+                    "postal_code_area",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="address.postalcodearea",
+                    ),
+                ),
+                (
+                    "street",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="address.street",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "address_address_search",
+                "managed": False,
+            },
+        ),
+        migrations.RunSQL(CREATE_ADDRESS_SEARCH_SQL, DROP_ADDRESS_SEARCH_SQL),
+    ]
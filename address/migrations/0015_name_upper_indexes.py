@@ -0,0 +1,60 @@
+# Generated by Django 6.0.5 on 2026-10-18 13:02
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+# Case-insensitive (__iexact) lookups of the postal codes of the address search
+# view. The names in the view are indexed in 0014.
+CREATE_ADDRESS_SEARCH_UPPER_INDEX_SQL = """
+CREATE INDEX idx_address_search_postal_code_upper
+    ON address_address_search (UPPER(postal_code));
+"""
+
+DROP_ADDRESS_SEARCH_UPPER_INDEX_SQL = "DROP INDEX idx_address_search_postal_code_upper;"
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("address", "0014_address_search"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="municipalitytranslation",
+            index=models.Index(
+                django.db.models.functions.text.Upper("name"),
+                name="idx_municipality_name_upper",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="streettranslation",
+            index=models.Index(
+                django.db.models.functions.text.Upper("name"),
+                name="idx_street_name_upper",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="postalcodeareatranslation",
+            index=models.Index(
+                django.db.models.functions.text.Upper("name"),
+                name="idx_postal_area_name_upper",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="postalcodeareatranslation",
+            index=models.Index(
+                django.db.models.functions.text.Upper("post_office"),
+                name="idx_post_office_upper",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="postalcodearea",
+            index=models.Index(
+                django.db.models.functions.text.Upper("postal_code"),
+                name="idx_postal_code_upper",
+            ),
+        ),
+        migrations.RunSQL(
+            CREATE_ADDRESS_SEARCH_UPPER_INDEX_SQL, DROP_ADDRESS_SEARCH_UPPER_INDEX_SQL
+        ),
+    ]
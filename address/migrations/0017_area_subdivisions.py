@@ -0,0 +1,94 @@
+# Generated by Django 6.0.5 on 2026-10-18 15:20
+
+import django.contrib.gis.db.models.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Subdivide the areas imported before the subdivision tables existed. The maximum
+# number of vertices is services.subdivision.MAX_SUBDIVISION_VERTICES.
+SUBDIVIDE_AREAS_SQL = """
+INSERT INTO address_municipalitysubdivision (municipality_id, geometry)
+SELECT id, (ST_Dump(ST_Subdivide(area, 256))).geom
+FROM address_municipality
+WHERE area IS NOT NULL;
+INSERT INTO address_postalcodeareasubdivision (postal_code_area_id, geometry)
+SELECT id, (ST_Dump(ST_Subdivide(area, 256))).geom
+FROM address_postalcodearea
+WHERE area IS NOT NULL;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("address", "0016_datasetversion"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MunicipalitySubdivision",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "geometry",
+                    django.contrib.gis.db.models.fields.PolygonField(
+                        srid=4326, verbose_name="Geometry"
+                    ),
+                ),
+                (
+                    "municipality",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="subdivisions",
+                        to="address.municipality",
+                        verbose_name="Municipality",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Municipality subdivision",
+                "verbose_name_plural": "Municipality subdivisions",
+            },
+        ),
+        migrations.CreateModel(
+            name="PostalCodeAreaSubdivision",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "geometry",
+                    django.contrib.gis.db.models.fields.PolygonField(
+                        srid=4326, verbose_name="Geometry"
+                    ),
+                ),
+                (
+                    "postal_code_area",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="subdivisions",
+                        to="address.postalcodearea",
+                        verbose_name="Postal code area",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Postal code area subdivision",
+                "verbose_name_plural": "Postal code area subdivisions",
+            },
+        ),
+        migrations.RunSQL(SUBDIVIDE_AREAS_SQL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,100 @@
+# Generated by Django 6.0.5 on 2026-10-18 16:40
+
+import django.contrib.gis.db.models.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("address", "0017_area_subdivisions"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MunicipalitySimplification",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "tolerance",
+                    models.PositiveIntegerField(verbose_name="Tolerance (m)"),
+                ),
+                (
+                    "area",
+                    django.contrib.gis.db.models.fields.MultiPolygonField(
+                        srid=4326, verbose_name="Area"
+                    ),
+                ),
+                (
+                    "municipality",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="simplifications",
+                        to="address.municipality",
+                        verbose_name="Municipality",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Municipality simplification",
+                "verbose_name_plural": "Municipality simplifications",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("municipality", "tolerance"),
+                        name="unique_municipality_simplification",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="PostalCodeAreaSimplification",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "tolerance",
+                    models.PositiveIntegerField(verbose_name="Tolerance (m)"),
+                ),
+                (
+                    "area",
+                    django.contrib.gis.db.models.fields.MultiPolygonField(
+                        srid=4326, verbose_name="Area"
+                    ),
+                ),
+                (
+                    "postal_code_area",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="simplifications",
+                        to="address.postalcodearea",
+                        verbose_name="Postal code area",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Postal code area simplification",
+                "verbose_name_plural": "Postal code area simplifications",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("postal_code_area", "tolerance"),
+                        name="unique_postal_code_area_simplification",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 6.0.5 on 2026-10-18 18:05
+
+import django.contrib.gis.db.models.functions
+from django.db import migrations, models
+
+
+def _formatted_area_fields(model_name: str) -> list[migrations.AddField]:
+    return [
+        migrations.AddField(
+            model_name=model_name,
+            name="area_ewkt",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Func(
+                    "area",
+                    models.Value(7),
+                    function="ST_AsEWKT",
+                    output_field=models.TextField(),
+                ),
+                output_field=models.TextField(),
+                verbose_name="Area as EWKT",
+            ),
+        ),
+        migrations.AddField(
+            model_name=model_name,
+            name="area_geojson",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.contrib.gis.db.models.functions.AsGeoJSON(
+                    "area", precision=7
+                ),
+                output_field=models.TextField(),
+                verbose_name="Area as GeoJSON",
+            ),
+        ),
+    ]
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("address", "0018_area_simplifications"),
+    ]
+
+    operations = [
+        *_formatted_area_fields("municipality"),
+        *_formatted_area_fields("postalcodearea"),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 6.0.5 on 2026-10-18 19:20
+
+import django.contrib.gis.db.models.fields
+import django.contrib.gis.db.models.functions
+from django.db import migrations, models
+
+
+def _summary_fields(model_name: str) -> list[migrations.AddField]:
+    return [
+        migrations.AddField(
+            model_name=model_name,
+            name="area_bbox",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.contrib.gis.db.models.functions.Envelope("area"),
+                output_field=django.contrib.gis.db.models.fields.PolygonField(
+                    srid=4326
+                ),
+                verbose_name="Area bounding box",
+            ),
+        ),
+        migrations.AddField(
+            model_name=model_name,
+            name="area_centroid",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.contrib.gis.db.models.functions.Transform(
+                    django.contrib.gis.db.models.functions.Centroid(
+                        django.contrib.gis.db.models.functions.Transform("area", 3067)
+                    ),
+                    4326,
+                ),
+                output_field=django.contrib.gis.db.models.fields.PointField(srid=4326),
+                verbose_name="Area centroid",
+            ),
+        ),
+        migrations.AddField(
+            model_name=model_name,
+            name="area_label_point",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.contrib.gis.db.models.functions.Transform(
+                    models.Func(
+                        django.contrib.gis.db.models.functions.Transform("area", 3067),
+                        function="ST_MaximumInscribedCircle",
+                        output_field=django.contrib.gis.db.models.fields.PointField(
+                            srid=3067
+                        ),
+                        template="(%(function)s(%(expressions)s)).center",
+                    ),
+                    4326,
+                ),
+                output_field=django.contrib.gis.db.models.fields.PointField(srid=4326),
+                verbose_name="Area label point",
+            ),
+        ),
+    ]
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("address", "0019_formatted_areas"),
+    ]
+
+    operations = [
+        *_summary_fields("municipality"),
+        *_summary_fields("postalcodearea"),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 6.0.5 on 2026-10-18 20:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("address", "0020_area_summaries"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AreaTopology",
+            fields=[
+                (
+                    "name",
+                    models.CharField(
+                        max_length=100,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="Name",
+                    ),
+                ),
+                ("topology", models.TextField(verbose_name="Topology")),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated at"),
+                ),
+            ],
+            options={
+                "verbose_name": "Area topology",
+                "verbose_name_plural": "Area topologies",
+            },
+        ),
+    ]
@@ -1,18 +1,146 @@
 from django.conf import settings
 from django.contrib.gis.db import models
+from django.contrib.gis.db.models.functions import (
+    AsGeoJSON,
+    Centroid,
+    Envelope,
+    Transform,
+)
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, GistIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
+from django.db.models import Func, Value
+from django.db.models.functions import Upper
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
+from parler.managers import TranslatableManager
 from parler.models import TranslatableModel, TranslatedFields
 
 
+def upper_index(field: str, name: str) -> models.Index:
+    """
+    An index for case-insensitive exact matching, i.e. __iexact lookups, which
+    PostgreSQL compiles to UPPER(column) = UPPER(value).
+    """
+    return models.Index(Upper(field), name=name)
+
+
+def trigram_name_index(name: str) -> GinIndex:
+    """
+    A trigram index for case-insensitive partial matching of translated names,
+    i.e. name__icontains and name__istartswith lookups.
+    """
+    return GinIndex(OpClass(Upper("name"), name="gin_trgm_ops"), name=name)
+
+
+# Formats of the areas stored in the area_<format> fields
+STORED_AREA_FORMATS = ("geojson", "ewkt")
+FORMATTED_AREA_FIELDS = ("area_geojson", "area_ewkt")
+
+# Precision of the stored formatted areas. The API returns them only when the
+# areas are requested at this precision. It is fixed in the migrations, so it is
+# not read from settings, but it must equal the default COORDINATE_PRECISION for
+# the stored areas to be used by default, see checks.check_formatted_area_precision.
+FORMATTED_AREA_PRECISION = 7
+
+
+def formatted_area_field(area_format: str) -> models.GeneratedField:
+    """
+    The area formatted as GeoJSON or EWKT, which PostgreSQL keeps up to date
+    whenever the area changes.
+    """
+    if area_format == "geojson":
+        expression = AsGeoJSON("area", precision=FORMATTED_AREA_PRECISION)
+        verbose_name = _("Area as GeoJSON")
+    else:
+        expression = Func(
+            "area",
+            Value(FORMATTED_AREA_PRECISION),
+            function="ST_AsEWKT",
+            output_field=models.TextField(),
+        )
+        verbose_name = _("Area as EWKT")
+    return models.GeneratedField(
+        expression=expression,
+        output_field=models.TextField(),
+        db_persist=True,
+        verbose_name=verbose_name,
+    )
+
+
+# The summaries of the area geometries
+AREA_SUMMARY_FIELDS = ("area_bbox", "area_centroid", "area_label_point")
+
+
+def area_summary_field(summary: str) -> models.GeneratedField:
+    """
+    The bounding box, centroid or label point of the area, which PostgreSQL
+    keeps up to date whenever the area changes.
+
+    The centroid and label point are computed in the metric projection, where
+    the area is not distorted. The label point is the center of the largest
+    circle inscribed in the area, so unlike the centroid, it is always well
+    inside the area.
+    """
+    if summary == "bbox":
+        return models.GeneratedField(
+            expression=Envelope("area"),
+            output_field=models.PolygonField(srid=settings.PROJECTION_SRID),
+            db_persist=True,
+            verbose_name=_("Area bounding box"),
+        )
+    projected_area = Transform("area", settings.METRIC_PROJECTION_SRID)
+    if summary == "centroid":
+        point = Centroid(projected_area)
+        verbose_name = _("Area centroid")
+    else:
+        point = Func(
+            projected_area,
+            function="ST_MaximumInscribedCircle",
+            template="(%(function)s(%(expressions)s)).center",
+            output_field=models.PointField(srid=settings.METRIC_PROJECTION_SRID),
+        )
+        verbose_name = _("Area label point")
+    return models.GeneratedField(
+        expression=Transform(point, settings.PROJECTION_SRID),
+        output_field=models.PointField(srid=settings.PROJECTION_SRID),
+        db_persist=True,
+        verbose_name=verbose_name,
+    )
+
+
+class AreaManager(TranslatableManager):
+    """
+    A manager leaving out the formatted area geometries, which are as large as
+    the areas themselves, unless they are asked for.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().defer(*FORMATTED_AREA_FIELDS)
+
+
 class Municipality(TranslatableModel):
     id = models.CharField(_("Id"), max_length=100, primary_key=True)
     code = models.CharField(_("Municipality code"), max_length=3)
     translations = TranslatedFields(
-        name=models.CharField(_("Name"), max_length=100, db_index=True)
+        name=models.CharField(_("Name"), max_length=100, db_index=True),
+        meta={
+            "indexes": [
+                trigram_name_index("idx_municipality_name_trgm"),
+                upper_index("name", "idx_municipality_name_upper"),
+            ]
+        },
     )
     area = models.MultiPolygonField(
         _("Area"), srid=settings.PROJECTION_SRID, null=True, blank=True
     )
+    area_geojson = formatted_area_field("geojson")
+    area_ewkt = formatted_area_field("ewkt")
+    area_bbox = area_summary_field("bbox")
+    area_centroid = area_summary_field("centroid")
+    area_label_point = area_summary_field("label_point")
+
+    objects = AreaManager()
 
     def __str__(self) -> str:
         return self.name
@@ -29,6 +157,12 @@ class Street(TranslatableModel):
     modified_at = models.DateTimeField(auto_now=True)
     translations = TranslatedFields(
         name=models.CharField(_("Name"), max_length=100, db_index=True),
+        meta={
+            "indexes": [
+                trigram_name_index("idx_street_name_trgm"),
+                upper_index("name", "idx_street_name_upper"),
+            ]
+        },
     )
 
     def __str__(self) -> str:
@@ -48,10 +182,24 @@ class PostalCodeArea(TranslatableModel):
         post_office=models.CharField(
             _("Post office"), max_length=100, null=True, blank=True
         ),
+        meta={
+            "indexes": [
+                trigram_name_index("idx_postal_code_area_name_trgm"),
+                upper_index("name", "idx_postal_area_name_upper"),
+                upper_index("post_office", "idx_post_office_upper"),
+            ]
+        },
     )
     area = models.MultiPolygonField(
         _("Area"), srid=settings.PROJECTION_SRID, null=True, blank=True
     )
+    area_geojson = formatted_area_field("geojson")
+    area_ewkt = formatted_area_field("ewkt")
+    area_bbox = area_summary_field("bbox")
+    area_centroid = area_summary_field("centroid")
+    area_label_point = area_summary_field("label_point")
+
+    objects = AreaManager()
 
     def __str__(self) -> str:
         return self.postal_code
@@ -59,6 +207,101 @@ class PostalCodeArea(TranslatableModel):
     class Meta:
         verbose_name = _("Postal code area")
         verbose_name_plural = _("Postal code areas")
+        indexes = [
+            upper_index("postal_code", "idx_postal_code_upper"),
+        ]
+
+
+class MunicipalitySubdivision(models.Model):
+    """
+    A piece of a municipality area with a bounded number of vertices, see
+    services.subdivision. Spatial predicates are much faster against the pieces
+    than against the whole area.
+    """
+
+    municipality = models.ForeignKey(
+        Municipality,
+        models.CASCADE,
+        related_name="subdivisions",
+        verbose_name=_("Municipality"),
+    )
+    geometry = models.PolygonField(_("Geometry"), srid=settings.PROJECTION_SRID)
+
+    class Meta:
+        verbose_name = _("Municipality subdivision")
+        verbose_name_plural = _("Municipality subdivisions")
+
+
+class PostalCodeAreaSubdivision(models.Model):
+    """
+    A piece of a postal code area with a bounded number of vertices, see
+    services.subdivision.
+    """
+
+    postal_code_area = models.ForeignKey(
+        PostalCodeArea,
+        models.CASCADE,
+        related_name="subdivisions",
+        verbose_name=_("Postal code area"),
+    )
+    geometry = models.PolygonField(_("Geometry"), srid=settings.PROJECTION_SRID)
+
+    class Meta:
+        verbose_name = _("Postal code area subdivision")
+        verbose_name_plural = _("Postal code area subdivisions")
+
+
+class MunicipalitySimplification(models.Model):
+    """
+    The municipality area simplified with a tolerance, see
+    services.simplification. Maps at lower zoom levels get by with far fewer
+    vertices than the full area has.
+    """
+
+    municipality = models.ForeignKey(
+        Municipality,
+        models.CASCADE,
+        related_name="simplifications",
+        verbose_name=_("Municipality"),
+    )
+    tolerance = models.PositiveIntegerField(_("Tolerance (m)"))
+    area = models.MultiPolygonField(_("Area"), srid=settings.PROJECTION_SRID)
+
+    class Meta:
+        verbose_name = _("Municipality simplification")
+        verbose_name_plural = _("Municipality simplifications")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["municipality", "tolerance"],
+                name="unique_municipality_simplification",
+            )
+        ]
+
+
+class PostalCodeAreaSimplification(models.Model):
+    """
+    The postal code area simplified with a tolerance, see
+    services.simplification.
+    """
+
+    postal_code_area = models.ForeignKey(
+        PostalCodeArea,
+        models.CASCADE,
+        related_name="simplifications",
+        verbose_name=_("Postal code area"),
+    )
+    tolerance = models.PositiveIntegerField(_("Tolerance (m)"))
+    area = models.MultiPolygonField(_("Area"), srid=settings.PROJECTION_SRID)
+
+    class Meta:
+        verbose_name = _("Postal code area simplification")
+        verbose_name_plural = _("Postal code area simplifications")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["postal_code_area", "tolerance"],
+                name="unique_postal_code_area_simplification",
+            )
+        ]
 
 
 class Address(models.Model):
@@ -84,6 +327,14 @@ class Address(models.Model):
         verbose_name=_("Postal code area"),
     )
     location = models.PointField(_("Location"), srid=settings.PROJECTION_SRID)
+    # Copy of the location in a metric projection. Distances between these points
+    # are in meters, which makes radius and nearest neighbour searches exact.
+    projected_location = models.GeneratedField(
+        expression=Transform("location", settings.METRIC_PROJECTION_SRID),
+        output_field=models.PointField(srid=settings.METRIC_PROJECTION_SRID),
+        db_persist=True,
+        verbose_name=_("Projected location"),
+    )
     modified_at = models.DateTimeField(auto_now=True)
 
     def __str__(self) -> str:
@@ -112,5 +363,112 @@ class Address(models.Model):
                     "location",
                     "modified_at",
                 ],
-            )
+            ),
+            # Used for distance filtering and index-ordered nearest neighbour (KNN)
+            # searches
+            GistIndex(
+                fields=["projected_location"], name="idx_address_projected_location"
+            ),
         ]
+
+
+class AddressSearch(models.Model):
+    """
+    A flattened, read-only copy of each address with its street, postal code area
+    and municipality names in every language. This is a materialized view, so that
+    the address searches are single table index scans without joins or prefetches
+    of the translations. The import commands refresh the view, see
+    services.search.refresh_address_search. Changes made otherwise, e.g. in the
+    admin, are not seen by the API until the refresh_address_data command is run.
+    """
+
+    LANGUAGES = ("fi", "sv", "en")
+
+    id = models.BigIntegerField(primary_key=True)
+    street = models.ForeignKey(
+        Street, models.DO_NOTHING, related_name="+", db_constraint=False
+    )
+    street_name_fi = models.CharField(max_length=100, null=True)
+    street_name_sv = models.CharField(max_length=100, null=True)
+    street_name_en = models.CharField(max_length=100, null=True)
+    number = models.CharField(max_length=6)
+    number_end = models.CharField(max_length=6)
+    letter = models.CharField(max_length=2)
+    postal_code_area = models.ForeignKey(
+        PostalCodeArea,
+        models.DO_NOTHING,
+        null=True,
+        related_name="+",
+        db_constraint=False,
+    )
+    postal_code = models.CharField(max_length=5, null=True)
+    # Languages of the postal code area translations, as their names may be empty
+    postal_code_area_languages = ArrayField(models.CharField(max_length=15))
+    postal_code_area_name_fi = models.CharField(max_length=100, null=True)
+    postal_code_area_name_sv = models.CharField(max_length=100, null=True)
+    postal_code_area_name_en = models.CharField(max_length=100, null=True)
+    post_office_fi = models.CharField(max_length=100, null=True)
+    post_office_sv = models.CharField(max_length=100, null=True)
+    post_office_en = models.CharField(max_length=100, null=True)
+    municipality = models.ForeignKey(
+        Municipality, models.DO_NOTHING, related_name="+", db_constraint=False
+    )
+    municipality_code = models.CharField(max_length=3)
+    municipality_name_fi = models.CharField(max_length=100, null=True)
+    municipality_name_sv = models.CharField(max_length=100, null=True)
+    municipality_name_en = models.CharField(max_length=100, null=True)
+    location = models.PointField(srid=settings.PROJECTION_SRID)
+    projected_location = models.PointField(srid=settings.METRIC_PROJECTION_SRID)
+    modified_at = models.DateTimeField()
+    search_vector = SearchVectorField()
+
+    class Meta:
+        managed = False
+        db_table = "address_address_search"
+
+
+class DatasetVersion(models.Model):
+    """
+    Version of the imported address data. The version is bumped after every
+    import, which invalidates the caches of the data, see
+    services.name_cache.NameCache.
+    """
+
+    version = models.PositiveIntegerField(_("Version"), default=0)
+    updated_at = models.DateTimeField(_("Updated at"), auto_now=True)
+
+    def __str__(self) -> str:
+        return str(self.version)
+
+    @classmethod
+    def current(cls) -> int:
+        return cls.objects.filter(pk=1).values_list("version", flat=True).first() or 0
+
+    @classmethod
+    def bump(cls) -> None:
+        if not cls.objects.filter(pk=1).update(
+            version=models.F("version") + 1, updated_at=timezone.now()
+        ):
+            cls.objects.create(pk=1, version=1)
+
+    class Meta:
+        verbose_name = _("Dataset version")
+        verbose_name_plural = _("Dataset versions")
+
+
+class AreaTopology(models.Model):
+    """
+    TopoJSON topology of all the municipalities or all the postal code areas,
+    built after every import of the areas, see services.topology.
+    """
+
+    name = models.CharField(_("Name"), max_length=100, primary_key=True)
+    topology = models.TextField(_("Topology"))
+    updated_at = models.DateTimeField(_("Updated at"), auto_now=True)
+
+    def __str__(self) -> str:
+        return self.name
+
+    class Meta:
+        verbose_name = _("Area topology")
+        verbose_name_plural = _("Area topologies")
@@ -0,0 +1,102 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from math import floor
+from threading import Lock
+
+from django.conf import settings
+from django.contrib.gis.geos import Point
+
+from ..models import Municipality, PostalCodeArea
+from .dataset_version import DatasetVersionCheck
+
+# Size (in degrees) of the grid cells bucketing the areas by their extents
+GRID_CELL_SIZE = 0.1
+
+
+@dataclass
+class AreaMatch:
+    municipality: Municipality | None
+    postal_code_area: PostalCodeArea | None
+
+
+class _AreaGrid:
+    """
+    Prepared geometries of areas, bucketed by the grid cells their extents
+    overlap. A point is tested only against the areas of its cell whose extents
+    contain it, so a lookup is a handful of in-memory containment tests.
+    """
+
+    def __init__(self, areas) -> None:
+        self._cells = defaultdict(list)
+        for obj in areas:
+            extent = obj.area.extent
+            entry = (extent, obj.area.prepared, obj)
+            xmin, ymin, xmax, ymax = (_cell(value) for value in extent)
+            for x in range(xmin, xmax + 1):
+                for y in range(ymin, ymax + 1):
+                    self._cells[(x, y)].append(entry)
+
+    def find(self, point: Point):
+        for extent, prepared, obj in self._cells.get(
+            (_cell(point.x), _cell(point.y)), ()
+        ):
+            if _in_extent(point, extent) and prepared.contains(point):
+                return obj
+        return None
+
+
+def _cell(coordinate: float) -> int:
+    return floor(coordinate / GRID_CELL_SIZE)
+
+
+def _in_extent(point: Point, extent: tuple) -> bool:
+    xmin, ymin, xmax, ymax = extent
+    return xmin <= point.x <= xmax and ymin <= point.y <= ymax
+
+
+class AreaLookup:
+    """
+    Finds the municipality and the postal code area containing a location from
+    their prepared area geometries held in process memory. The areas are loaded
+    on the first lookup, and loaded again after every import.
+    """
+
+    def __init__(self, version_ttl: float) -> None:
+        self._version_check = DatasetVersionCheck(version_ttl)
+        self._municipalities: _AreaGrid | None = None
+        self._postal_code_areas: _AreaGrid | None = None
+        self._lock = Lock()
+
+    def find(self, lon: float, lat: float) -> AreaMatch:
+        self._load_if_changed()
+        point = Point(lon, lat, srid=settings.PROJECTION_SRID)
+        return AreaMatch(
+            municipality=self._municipalities.find(point),
+            postal_code_area=self._postal_code_areas.find(point),
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._municipalities = None
+            self._postal_code_areas = None
+        self._version_check.reset()
+
+    def _load_if_changed(self) -> None:
+        with self._lock:
+            if not self._version_check.changed() and self._municipalities is not None:
+                return
+            self._municipalities = _AreaGrid(_with_area(Municipality))
+            self._postal_code_areas = _AreaGrid(_with_area(PostalCodeArea))
+
+
+def _with_area(model) -> list:
+    # The translations are prefetched, so that the areas can be serialized
+    # without any queries
+    return list(
+        model.objects.filter(area__isnull=False)
+        .order_by("pk")
+        .prefetch_related("translations")
+    )
+
+
+area_lookup = AreaLookup(version_ttl=settings.DATASET_VERSION_TTL)
@@ -0,0 +1,34 @@
+"""
+Updating the data derived from the municipalities and postal code areas when
+they change, the same way whether they are imported or edited in the admin.
+"""
+
+from .search import refresh_address_search
+from .simplification import simplify_areas
+from .subdivision import subdivide, update_addresses_within
+from .topology import store_topology
+
+
+def update_area(area) -> int:
+    """
+    Update the subdivision of the saved municipality or postal code area, and
+    set it as the municipality or postal code area of the addresses within its
+    area. Return the number of addresses updated.
+
+    finish_area_updates must be called once all the changed areas are updated.
+    """
+    subdivide(area)
+    return update_addresses_within(area)
+
+
+def finish_area_updates(model, simplify: bool = True) -> None:
+    """
+    Update the data derived from all the municipalities or postal code areas
+    after some of them have changed: the simplifications of their areas, unless
+    `simplify` is false, their topology and the address search view. Refreshing
+    the view also bumps the dataset version, which invalidates the caches.
+    """
+    if simplify:
+        simplify_areas(model)
+    store_topology(model)
+    refresh_address_search()
@@ -0,0 +1,91 @@
+from dataclasses import dataclass
+
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db.models import Case, IntegerField, Max, Model, Value, When
+from parler.models import TranslatableModel
+
+from ..models import Municipality, PostalCodeArea, Street
+
+# Shorter inputs would produce too few trigrams for the trigram indexes to be useful
+AUTOCOMPLETE_MIN_LENGTH = 3
+
+AUTOCOMPLETE_DEFAULT_LIMIT = 10
+
+AUTOCOMPLETE_MAX_LIMIT = 50
+
+# Suggestion types in the order they are preferred when their scores are equal
+SUGGESTION_TYPES: dict[str, type[TranslatableModel]] = {
+    "municipality": Municipality,
+    "postal_code_area": PostalCodeArea,
+    "street": Street,
+}
+
+_RELATED_TRANSLATIONS = {
+    "municipality": ["translations"],
+    "postal_code_area": ["translations"],
+    "street": ["translations", "municipality__translations"],
+}
+
+
+@dataclass
+class Suggestion:
+    type: str
+    obj: Model
+
+
+def _rank_matches(model: type[TranslatableModel], text: str, limit: int) -> list:
+    """
+    Find the best matching objects of the given model by their name in any
+    language. Names starting with the text are ranked first, then the names are
+    ranked by their trigram similarity to the text.
+    """
+    translation_model = model._parler_meta.root_model
+    return list(
+        translation_model.objects.filter(name__icontains=text)
+        .values("master_id")
+        .annotate(
+            is_prefix=Max(
+                Case(
+                    When(name__istartswith=text, then=Value(1)),
+                    default=Value(0),
+                    output_field=IntegerField(),
+                )
+            ),
+            similarity=Max(TrigramSimilarity("name", text)),
+        )
+        .order_by("-is_prefix", "-similarity", "master_id")[:limit]
+    )
+
+
+def autocomplete(
+    text: str, limit: int = AUTOCOMPLETE_DEFAULT_LIMIT
+) -> list[Suggestion]:
+    """
+    Return the best matching streets, postal code areas and municipalities
+    for the given partial name, best match first.
+    """
+    if len(text) < AUTOCOMPLETE_MIN_LENGTH:
+        return []
+
+    ranked = []
+    for type_order, suggestion_type in enumerate(SUGGESTION_TYPES):
+        model = SUGGESTION_TYPES[suggestion_type]
+        for match in _rank_matches(model, text, limit):
+            ranked.append((suggestion_type, type_order, match))
+    ranked.sort(
+        key=lambda r: (-r[2]["is_prefix"], -r[2]["similarity"], r[1], r[2]["master_id"])
+    )
+    ranked = ranked[:limit]
+
+    objects = {}
+    for suggestion_type, model in SUGGESTION_TYPES.items():
+        ids = [match["master_id"] for t, _, match in ranked if t == suggestion_type]
+        queryset = model.objects.filter(id__in=ids).prefetch_related(
+            *_RELATED_TRANSLATIONS[suggestion_type]
+        )
+        objects[suggestion_type] = {obj.id: obj for obj in queryset}
+
+    return [
+        Suggestion(suggestion_type, objects[suggestion_type][match["master_id"]])
+        for suggestion_type, _, match in ranked
+    ]
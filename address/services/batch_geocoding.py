@@ -0,0 +1,166 @@
+from dataclasses import astuple, dataclass
+
+from django.conf import settings
+from django.contrib.gis.measure import D
+
+from ..models import AddressSearch, Municipality, Street
+from .search import SEARCH_CONFIG
+
+MAX_BATCH_ADDRESSES = 1000
+
+MAX_BATCH_LOCATIONS = 1000
+
+
+@dataclass
+class AddressQuery:
+    """
+    An address to geocode, either as free text (`q`) or as structured
+    components, of which the street name is required.
+    """
+
+    q: str | None = None
+    street_name: str | None = None
+    number: str | None = None
+    letter: str | None = None
+    postal_code: str | None = None
+    municipality: str | None = None
+
+
+# Each query is joined laterally to its best matching address. A free-text query
+# uses the search vector index like the `q` filter, and a structured query uses
+# the street id index like the name filters. Only one branch of the union is
+# evaluated for each query.
+_GEOCODE_SQL = """
+WITH input AS (
+    SELECT *, plainto_tsquery(%s::regconfig, q) AS query
+    FROM (VALUES {values})
+    AS input_row (ordinality, q, street_name, number, letter, postal_code, municipality)
+)
+SELECT input.ordinality AS input_ordinality, match.*
+FROM input
+CROSS JOIN LATERAL (
+    SELECT *
+    FROM (
+        SELECT
+            address.*,
+            ts_rank(address.search_vector, input.query, 2) AS rank
+        FROM {addresses} address
+        WHERE input.q IS NOT NULL
+        AND address.search_vector @@ input.query
+        UNION ALL
+        SELECT
+            address.*,
+            CASE
+                WHEN upper(address.letter) = upper(coalesce(input.letter, ''))
+                THEN 1
+                ELSE 0
+            END::real AS rank
+        FROM {addresses} address
+        WHERE input.q IS NULL
+        AND address.street_id IN (
+            SELECT master_id FROM {streets} WHERE upper(name) = upper(input.street_name)
+        )
+        AND (
+            input.number IS NULL
+            OR upper(address.number) = upper(input.number)
+            OR upper(address.number_end) = upper(input.number)
+        )
+        AND (input.letter IS NULL OR upper(address.letter) = upper(input.letter))
+        AND (
+            input.postal_code IS NULL
+            OR upper(address.postal_code) = upper(input.postal_code)
+        )
+        AND (
+            input.municipality IS NULL
+            OR address.municipality_id IN (
+                SELECT master_id
+                FROM {municipalities}
+                WHERE upper(name) = upper(input.municipality)
+            )
+        )
+    ) candidate
+    ORDER BY rank DESC, id
+    LIMIT 1
+) match
+ORDER BY input.ordinality
+"""
+
+_VALUES_ROW = "(%s::integer, " + ", ".join(["%s::text"] * 6) + ")"
+
+
+def geocode_batch(queries: list[AddressQuery]) -> list[AddressSearch | None]:
+    """
+    Find the best matching address for each query with a single query, in the
+    order of the queries. Queries without a match get None.
+    """
+    if not queries:
+        return []
+    sql = _GEOCODE_SQL.format(
+        values=", ".join([_VALUES_ROW] * len(queries)),
+        addresses=AddressSearch._meta.db_table,
+        streets=Street._parler_meta.root_model._meta.db_table,
+        municipalities=Municipality._parler_meta.root_model._meta.db_table,
+    )
+    params = [SEARCH_CONFIG]
+    for ordinality, query in enumerate(queries):
+        params += [ordinality, *astuple(query)]
+    results = [None] * len(queries)
+    for address in AddressSearch.objects.raw(sql, params):
+        results[address.input_ordinality] = address
+    return results
+
+
+# Each point is joined laterally to its nearest address. Ordering by the <->
+# operator walks the projected location GiST index in distance order like the
+# `nearest` filter, so each point costs a single index probe.
+_REVERSE_GEOCODE_SQL = """
+WITH input AS (
+    SELECT
+        ordinality,
+        ST_Transform(ST_SetSRID(ST_MakePoint(lon, lat), %s), %s) AS point
+    FROM (VALUES {values}) AS input_row (ordinality, lon, lat)
+)
+SELECT input.ordinality AS input_ordinality, match.*
+FROM input
+CROSS JOIN LATERAL (
+    SELECT
+        address.*,
+        ST_Distance(address.projected_location, input.point) AS distance
+    FROM {addresses} address
+    {where}
+    ORDER BY address.projected_location <-> input.point
+    LIMIT 1
+) match
+ORDER BY input.ordinality
+"""
+
+
+def reverse_geocode_batch(
+    locations: list[tuple[float, float]], max_distance: float | None = None
+) -> list[AddressSearch | None]:
+    """
+    Find the nearest address for each (lon, lat) location with a single query, in
+    the order of the locations. The distance (in meters) of each address from its
+    location is annotated as `distance`. Locations without an address within the
+    maximum distance get None.
+    """
+    if not locations:
+        return []
+    where = ""
+    if max_distance is not None:
+        where = "WHERE ST_DWithin(address.projected_location, input.point, %s)"
+    sql = _REVERSE_GEOCODE_SQL.format(
+        values=", ".join(["(%s::integer, %s::float8, %s::float8)"] * len(locations)),
+        addresses=AddressSearch._meta.db_table,
+        where=where,
+    )
+    params = [settings.PROJECTION_SRID, settings.METRIC_PROJECTION_SRID]
+    for ordinality, (lon, lat) in enumerate(locations):
+        params += [ordinality, lon, lat]
+    if max_distance is not None:
+        params.append(max_distance)
+    results = [None] * len(locations)
+    for address in AddressSearch.objects.raw(sql, params):
+        address.distance = D(m=address.distance)
+        results[address.input_ordinality] = address
+    return results
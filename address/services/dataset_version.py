@@ -0,0 +1,30 @@
+from time import monotonic
+
+from ..models import DatasetVersion
+
+
+class DatasetVersionCheck:
+    """
+    Tells the in-memory caches of the data when the data has been imported
+    again. The version is read from the database at most once per `ttl` seconds,
+    so that the caches can be used without any queries in between.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self.version: int | None = None
+        self._checked_at = float("-inf")
+
+    def changed(self) -> bool:
+        """Whether the version has changed since the previous check."""
+        if monotonic() - self._checked_at < self.ttl:
+            return False
+        version = DatasetVersion.current()
+        self._checked_at = monotonic()
+        changed = version != self.version
+        self.version = version
+        return changed
+
+    def reset(self) -> None:
+        self.version = None
+        self._checked_at = float("-inf")
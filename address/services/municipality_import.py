@@ -5,7 +5,7 @@ from django.conf import settings
 from django.contrib.gis.gdal.feature import Feature
 from django.contrib.gis.geos import MultiPolygon
 
-from ..models import Address
+from .area_update import update_area
 from .import_utils import create_municipality, value_or_empty
 
 logger = logging.getLogger(__name__)
@@ -48,11 +48,7 @@ class MunicipalityImporter:
 
             total_municipalities_updated += 1
 
-            addresses = Address.objects.filter(
-                location__intersects=geometry,
-            )
-
-            num_addresses_updated = addresses.update(municipality=municipality)
+            num_addresses_updated = update_area(municipality)
 
             logger.info(f"{code}, {name_fi}, {name_sv}, {num_addresses_updated}")
             total_addresses_updated += num_addresses_updated
@@ -0,0 +1,126 @@
+import logging
+from collections import OrderedDict
+from collections.abc import Callable
+from threading import Lock
+from typing import NamedTuple
+
+from django.conf import settings
+
+from .dataset_version import DatasetVersionCheck
+
+logger = logging.getLogger(__name__)
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    max_size: int
+    size: int
+    version: int | None
+
+
+class NameCache:
+    """
+    A per-process, size-bounded LRU cache of names resolved to object ids.
+
+    A name is resolved, with a query of its own, only when it is missed for the
+    second time, so the names asked for only once never cost an extra query. The
+    callers match the missed names without the ids, e.g. with subqueries.
+
+    The names change only when the data is imported, so the cache is valid until
+    the dataset version is bumped. The version is read from the database at most
+    once per `version_ttl` seconds, so the cached names are resolved without any
+    queries in between. The hits and misses of each version are logged when the
+    cache is invalidated.
+    """
+
+    def __init__(self, max_size: int, version_ttl: float) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, frozenset[int]] = OrderedDict()
+        # The keys missed once, which are resolved when they are missed again
+        self._missed: OrderedDict[tuple, None] = OrderedDict()
+        self._version_check = DatasetVersionCheck(version_ttl)
+        self._lock = Lock()
+
+    def get(
+        self, key: tuple, resolve: Callable[[], frozenset[int]]
+    ) -> frozenset[int] | None:
+        """
+        Return the cached ids of the key, or None if they are not cached. The ids
+        of a key missed before are resolved and cached.
+        """
+        with self._lock:
+            if key not in self._entries and key not in self._missed:
+                self.misses += 1
+                self._missed[key] = None
+                while len(self._missed) > self.max_size:
+                    self._missed.popitem(last=False)
+                return None
+        previous_version = self._version_check.version
+        if self._version_check.changed():
+            with self._lock:
+                if previous_version is not None:
+                    logger.info(
+                        "Name cache of dataset version %s: %s hits, %s misses, "
+                        "%s names cached",
+                        previous_version,
+                        self.hits,
+                        self.misses,
+                        len(self._entries),
+                    )
+                    self.hits = self.misses = 0
+                self._entries.clear()
+        with self._lock:
+            ids = self._entries.get(key)
+            if ids is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return ids
+            self.misses += 1
+            self._missed.pop(key, None)
+        ids = resolve()
+        with self._lock:
+            self._entries[key] = ids
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return ids
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._missed.clear()
+        self._version_check.reset()
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(
+            self.hits,
+            self.misses,
+            self.max_size,
+            len(self._entries),
+            self._version_check.version,
+        )
+
+
+name_cache = NameCache(
+    max_size=settings.NAME_CACHE_SIZE, version_ttl=settings.DATASET_VERSION_TTL
+)
+
+
+def resolve_name(model, field: str, name: str) -> frozenset[int] | None:
+    """
+    Return the ids of the objects of the translatable model having a translation
+    of the field that matches the name case-insensitively, if they are cached.
+    """
+    translation_model = model._parler_meta.root_model
+
+    def resolve() -> frozenset[int]:
+        return frozenset(
+            translation_model.objects.filter(**{f"{field}__iexact": name}).values_list(
+                "master_id", flat=True
+            )
+        )
+
+    return name_cache.get((model._meta.label, field, name.upper()), resolve)
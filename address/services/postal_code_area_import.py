@@ -5,7 +5,8 @@ from django.conf import settings
 from django.contrib.gis.gdal.feature import Feature
 from django.contrib.gis.geos import MultiPolygon
 
-from ..models import Address, PostalCodeArea
+from ..models import PostalCodeArea
+from .area_update import update_area
 from .import_utils import value_or_empty
 
 logger = logging.getLogger(__name__)
@@ -55,11 +56,7 @@ class PostalCodeAreaImporter:
             postal_code_area.area = area
             postal_code_area.save()
 
-            addresses = Address.objects.filter(
-                location__intersects=geometry,
-            )
-
-            num_addresses_updated = addresses.update(postal_code_area=postal_code_area)
+            num_addresses_updated = update_area(postal_code_area)
 
             logger.info(
                 "%s, %s, %s, %s"
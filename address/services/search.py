@@ -0,0 +1,24 @@
+from django.db import connection
+
+from ..models import AddressSearch, DatasetVersion
+
+# Text search configuration of the address search vectors. Address components are
+# proper names and numbers, so they are indexed as is without stemming. This must
+# match the configuration used in the address search view (migration 0014).
+SEARCH_CONFIG = "simple"
+
+
+def refresh_address_search() -> None:
+    """
+    Rebuild the flattened address search view from the address, street, postal
+    code area and municipality tables. This should be done after every import.
+
+    The view is refreshed concurrently, so that the API can keep reading the old
+    rows until the new ones are ready. The dataset version is bumped afterwards
+    to invalidate the caches of the old data.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"REFRESH MATERIALIZED VIEW CONCURRENTLY {AddressSearch._meta.db_table}"
+        )
+    DatasetVersion.bump()
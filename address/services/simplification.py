@@ -0,0 +1,136 @@
+import math
+
+from django.conf import settings
+from django.contrib.gis.db.models.functions import Transform
+from django.contrib.gis.geos import GEOSGeometry, LineString, MultiPolygon, Polygon
+from django.db import transaction
+
+from ..models import (
+    Municipality,
+    MunicipalitySimplification,
+    PostalCodeArea,
+    PostalCodeAreaSimplification,
+)
+from .topology import Point, topology_arcs
+
+# Tolerances (in meters) of the precomputed simplifications of each area
+SIMPLIFICATION_TOLERANCES = (10, 50, 250, 1000)
+
+# Simplification model and its foreign key column of each area model
+SIMPLIFICATIONS = {
+    Municipality: (MunicipalitySimplification, "municipality_id"),
+    PostalCodeArea: (PostalCodeAreaSimplification, "postal_code_area_id"),
+}
+
+# Size (in meters) of a pixel of a 256 pixel web map tile at zoom level 0 at the
+# latitude of 60 degrees, i.e. in southern Finland. Each zoom level halves it.
+_PIXEL_SIZE_AT_ZOOM_0 = 2 * math.pi * 6378137 / 256 * math.cos(math.radians(60))
+
+# Size (in meters) of the grid to which the areas are snapped before they are
+# simplified, so that the vertices shared by neighbouring areas coincide
+_GRID_SIZE = 1.0
+
+
+def _simplified_arcs(arcs: list[list[Point]], tolerance: float) -> list[list[Point]]:
+    # The Douglas-Peucker algorithm keeps the end points, where the arcs meet
+    return [
+        list(LineString(arc).simplify(tolerance).coords) if len(arc) > 2 else arc
+        for arc in arcs
+    ]
+
+
+def _polygons(geometry: GEOSGeometry) -> list[Polygon]:
+    if geometry.geom_type == "Polygon":
+        return [] if geometry.empty else [geometry]
+    if geometry.geom_type in ("MultiPolygon", "GeometryCollection"):
+        return [polygon for part in geometry for polygon in _polygons(part)]
+    return []
+
+
+def _assembled_area(
+    polygons: list[list[list[int]]], arcs: list[list[Point]]
+) -> MultiPolygon | None:
+    """
+    The area from the rings of its polygons given as arc indices, see
+    services.topology.topology_arcs. The rings that collapsed are left out, as
+    are the polygons of such exterior rings.
+    """
+    assembled = []
+    for rings in polygons:
+        assembled_rings = []
+        for ring in rings:
+            points = []
+            for index in ring:
+                arc = arcs[index] if index >= 0 else arcs[~index][::-1]
+                points.extend(arc if not points else arc[1:])
+            if len(points) >= 4:
+                assembled_rings.append(
+                    [(x * _GRID_SIZE, y * _GRID_SIZE) for x, y in points]
+                )
+            elif not assembled_rings:
+                break
+        if assembled_rings:
+            assembled.append(Polygon(*assembled_rings))
+    area = MultiPolygon(assembled, srid=settings.METRIC_PROJECTION_SRID)
+    if not area.valid:
+        # Simplified arcs may cross each other where they run close together
+        area = MultiPolygon(
+            _polygons(area.make_valid()), srid=settings.METRIC_PROJECTION_SRID
+        )
+    return area if not area.empty else None
+
+
+def simplify_areas(model) -> None:
+    """
+    Replace the simplifications of all the municipalities or postal code areas
+    with ones of their current areas. This must be done whenever the areas
+    change.
+
+    The boundaries are simplified as the arcs of the topology of the areas, see
+    services.topology. A boundary shared by neighbouring areas is one arc, which
+    is simplified only once, so the simplified areas have no gaps or overlaps
+    between them. The areas are simplified in the metric projection, so that
+    the tolerances are in meters.
+    """
+    simplification_model, area_column = SIMPLIFICATIONS[model]
+    rows = list(
+        model.objects.exclude(area=None)
+        .annotate(projected_area=Transform("area", settings.METRIC_PROJECTION_SRID))
+        .order_by("pk")
+        .values_list("pk", "projected_area")
+    )
+    arcs, area_arcs = topology_arcs(
+        [area for _, area in rows], (_GRID_SIZE, _GRID_SIZE), (0.0, 0.0)
+    )
+    simplifications = []
+    for tolerance in SIMPLIFICATION_TOLERANCES:
+        simplified_arcs = _simplified_arcs(arcs, tolerance / _GRID_SIZE)
+        for (pk, _), polygons in zip(rows, area_arcs, strict=True):
+            area = _assembled_area(polygons, simplified_arcs)
+            if area is not None:
+                simplifications.append(
+                    simplification_model(
+                        **{area_column: pk, "tolerance": tolerance, "area": area}
+                    )
+                )
+    with transaction.atomic():
+        simplification_model.objects.all().delete()
+        # The areas are transformed back to the projection of the field
+        simplification_model.objects.bulk_create(simplifications, batch_size=1000)
+
+
+def precomputed_tolerance(tolerance: float) -> int | None:
+    """
+    The largest precomputed tolerance not exceeding the given tolerance, or None
+    if the full area should be used.
+    """
+    tolerances = [t for t in SIMPLIFICATION_TOLERANCES if t <= tolerance]
+    return max(tolerances, default=None)
+
+
+def tolerance_for_zoom(zoom: int) -> int | None:
+    """
+    The precomputed tolerance for showing the areas on a web map at the zoom
+    level, at which a vertex closer than a pixel to the full area is not seen.
+    """
+    return precomputed_tolerance(_PIXEL_SIZE_AT_ZOOM_0 / 2**zoom)
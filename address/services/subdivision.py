@@ -0,0 +1,71 @@
+from django.db import connection
+
+from ..models import (
+    Address,
+    Municipality,
+    MunicipalitySubdivision,
+    PostalCodeArea,
+    PostalCodeAreaSubdivision,
+)
+
+# Maximum number of vertices in each piece of a subdivided area
+MAX_SUBDIVISION_VERTICES = 256
+
+# Subdivision model and its foreign key column of each area model
+SUBDIVISIONS = {
+    Municipality: (MunicipalitySubdivision, "municipality_id"),
+    PostalCodeArea: (PostalCodeAreaSubdivision, "postal_code_area_id"),
+}
+
+_SUBDIVIDE_SQL = """
+INSERT INTO {subdivisions} ({area_column}, geometry)
+SELECT id, (ST_Dump(ST_Subdivide(area, %s))).geom
+FROM {areas}
+WHERE id = %s AND area IS NOT NULL
+"""
+
+# An address on the border of two pieces matches both, but it is updated once
+_UPDATE_ADDRESSES_SQL = """
+UPDATE {addresses} address
+SET {area_column} = %s
+FROM {subdivisions} subdivision
+WHERE subdivision.{area_column} = %s
+AND ST_Intersects(address.location, subdivision.geometry)
+"""
+
+
+def subdivide(area) -> None:
+    """
+    Replace the subdivision of the municipality or postal code area with
+    pieces of its current area. This must be done whenever the area changes.
+    """
+    subdivision_model, area_column = SUBDIVISIONS[type(area)]
+    subdivision_model.objects.filter(**{area_column: area.id}).delete()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            _SUBDIVIDE_SQL.format(
+                subdivisions=subdivision_model._meta.db_table,
+                area_column=area_column,
+                areas=type(area)._meta.db_table,
+            ),
+            [MAX_SUBDIVISION_VERTICES, area.id],
+        )
+
+
+def update_addresses_within(area) -> int:
+    """
+    Set the municipality or postal code area of the addresses within its area,
+    matching the addresses against the subdivision of the area. Return the
+    number of addresses updated.
+    """
+    subdivision_model, area_column = SUBDIVISIONS[type(area)]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            _UPDATE_ADDRESSES_SQL.format(
+                addresses=Address._meta.db_table,
+                area_column=area_column,
+                subdivisions=subdivision_model._meta.db_table,
+            ),
+            [area.id, area.id],
+        )
+        return cursor.rowcount
@@ -0,0 +1,151 @@
+import gzip
+import sqlite3
+from collections.abc import Callable
+from contextlib import closing
+from pathlib import Path
+from threading import Lock
+
+from django.conf import settings
+
+from ..models import DatasetVersion
+from .dataset_version import DatasetVersionCheck
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS tiles (
+    zoom_level INTEGER,
+    tile_column INTEGER,
+    tile_row INTEGER,
+    tile_data BLOB,
+    PRIMARY KEY (zoom_level, tile_column, tile_row)
+);
+"""
+
+
+class TileCache:
+    """
+    Rendered vector tiles stored on disk in an MBTiles (SQLite) file per layer,
+    shared by the processes of the server. The tiles are stored gzipped, as
+    MBTiles requires.
+
+    The tiles are looked up with read-only connections. The files are in WAL
+    mode, so the lookups are not blocked while a tile is stored. Each process
+    creates the tables of a file only the first time it uses the file.
+
+    The tiles of a layer are deleted when the dataset version differs from the
+    one they were rendered for. Like the other caches, this checks the version
+    at most once per `version_ttl` seconds. The cache is disabled if there is no
+    directory.
+    """
+
+    def __init__(self, directory: str, version_ttl: float) -> None:
+        self.directory = directory
+        self._version_check = DatasetVersionCheck(version_ttl)
+        self._created: set[Path] = set()
+        self._lock = Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory)
+
+    def get(self, layer: str, z: int, x: int, y: int, render: Callable[[], bytes]):
+        """
+        Return the gzipped tile, rendering and storing it if it is not stored.
+        """
+        if not self.enabled:
+            return gzip.compress(render())
+        if self._version_check.changed():
+            self._invalidate(self._version_check.version)
+        version = self._version_check.version
+        # MBTiles numbers the rows from the south like TMS
+        key = (z, x, 2**z - 1 - y)
+        self._create(layer)
+        with closing(self._connect(layer, read_only=True)) as connection:
+            row = connection.execute(
+                "SELECT tile_data FROM tiles "
+                "WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?",
+                key,
+            ).fetchone()
+        if row is not None:
+            return row[0]
+        tile = gzip.compress(render())
+        # The data may have been imported again while the tile was rendered
+        if DatasetVersion.current() == version:
+            self._store(layer, key, tile, version)
+        return tile
+
+    def _path(self, layer: str) -> Path:
+        return Path(self.directory) / f"{layer}.mbtiles"
+
+    def _connect(self, layer: str, read_only: bool = False) -> sqlite3.Connection:
+        if read_only:
+            return sqlite3.connect(
+                f"{self._path(layer).resolve().as_uri()}?mode=ro", uri=True, timeout=30
+            )
+        return sqlite3.connect(self._path(layer), timeout=30)
+
+    def _create(self, layer: str) -> None:
+        """Create the file of the layer with its tables, unless it is created."""
+        path = self._path(layer)
+        with self._lock:
+            if path in self._created:
+                return
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with closing(self._connect(layer)) as connection:
+                connection.execute("PRAGMA journal_mode = WAL")
+                connection.executescript(_SCHEMA_SQL)
+                connection.execute(
+                    "INSERT OR IGNORE INTO metadata VALUES "
+                    "('name', ?), ('format', 'pbf'), ('dataset_version', ?)",
+                    (layer, str(self._version_check.version)),
+                )
+                connection.commit()
+            self._created.add(path)
+
+    def _store(
+        self, layer: str, key: tuple[int, int, int], tile: bytes, version: int | None
+    ) -> None:
+        """Store the tile unless the layer was invalidated for another version."""
+        with closing(self._connect(layer)) as connection, connection:
+            # Locks the file, so that it is not invalidated before the insert
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute(
+                "SELECT value FROM metadata WHERE name = 'dataset_version'"
+            ).fetchone()
+            if row is None or row[0] != str(version):
+                return
+            connection.execute(
+                "INSERT OR REPLACE INTO tiles VALUES (?, ?, ?, ?)", (*key, tile)
+            )
+
+    def _invalidate(self, version: int | None) -> None:
+        """Delete the tiles of the layers rendered for another dataset version."""
+        for path in Path(self.directory).glob("*.mbtiles"):
+            self._invalidate_layer(path.stem, version)
+
+    def _invalidate_layer(self, layer: str, version: int | None) -> None:
+        self._create(layer)
+        with closing(self._connect(layer)) as connection, connection:
+            row = connection.execute(
+                "SELECT value FROM metadata WHERE name = 'dataset_version'"
+            ).fetchone()
+            if row is not None and row[0] == str(version):
+                return
+            connection.execute("DELETE FROM tiles")
+            connection.execute(
+                "INSERT OR REPLACE INTO metadata VALUES ('dataset_version', ?)",
+                (str(version),),
+            )
+
+    def clear(self) -> None:
+        if self.enabled:
+            for path in Path(self.directory).glob("*.mbtiles*"):
+                path.unlink()
+        with self._lock:
+            self._created.clear()
+        self._version_check.reset()
+
+
+tile_cache = TileCache(
+    directory=settings.TILE_CACHE_DIR, version_ttl=settings.DATASET_VERSION_TTL
+)
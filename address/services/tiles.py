@@ -0,0 +1,182 @@
+from collections.abc import Iterator
+from dataclasses import dataclass
+from math import asinh, floor, pi, radians, tan
+
+from django.conf import settings
+from django.db import connection
+
+from ..models import (
+    AddressSearch,
+    Municipality,
+    MunicipalitySimplification,
+    PostalCodeArea,
+    PostalCodeAreaSimplification,
+)
+from .simplification import tolerance_for_zoom
+
+# Highest zoom level of the tiles
+MAX_TILE_ZOOM = 22
+
+# Lowest zoom level at which the addresses are rendered. Below it, a tile would
+# have too many addresses to be of use, so the address tiles are empty.
+ADDRESS_MIN_ZOOM = 14
+
+# Size of the tiles in the integer coordinates of the vector tile geometries
+TILE_EXTENT = 4096
+
+_TILE_SQL = """
+WITH bounds AS (SELECT ST_TileEnvelope(%s, %s, %s) AS tile)
+SELECT ST_AsMVT(features, %s, {extent}, 'geom')
+FROM (
+    SELECT
+        {columns},
+        ST_AsMVTGeom(ST_Transform({geometry}, 3857), bounds.tile, {extent})
+            AS geom
+    FROM {source}
+    CROSS JOIN bounds
+    WHERE {indexed_geometry} && ST_Transform(bounds.tile, {srid})
+) features
+"""
+
+_AREA_SOURCE_SQL = """
+{areas} area
+LEFT JOIN {simplifications} simplification
+    ON simplification.{area_column} = area.id AND simplification.tolerance = %s
+"""
+
+_TRANSLATION_SQL = """
+(SELECT {field} FROM {translations}
+WHERE master_id = area.id AND language_code = '{language}') AS {field}_{language}
+"""
+
+
+@dataclass(frozen=True)
+class TileLayer:
+    """The SQL selecting the features of a vector tile layer."""
+
+    name: str
+    sql: str
+    min_zoom: int = 0
+    # Whether the areas are replaced by their simplifications at low zoom levels
+    simplified: bool = False
+
+
+def _address_layer() -> TileLayer:
+    columns = [
+        "id",
+        *(f"street_name_{language}" for language in AddressSearch.LANGUAGES),
+        "number",
+        "number_end",
+        "letter",
+        "postal_code",
+        "municipality_code",
+    ]
+    return TileLayer(
+        "address",
+        _TILE_SQL.format(
+            columns=", ".join(columns),
+            geometry="location",
+            indexed_geometry="location",
+            srid=settings.PROJECTION_SRID,
+            source=AddressSearch._meta.db_table,
+            extent=TILE_EXTENT,
+        ),
+        min_zoom=ADDRESS_MIN_ZOOM,
+    )
+
+
+def _area_layer(
+    name: str, model, simplification_model, area_column: str, columns: list[str]
+) -> TileLayer:
+    translations = model._parler_meta.root_model._meta.db_table
+    translated_columns = [
+        _TRANSLATION_SQL.format(
+            field=field, translations=translations, language=language
+        ).strip()
+        for field in model._parler_meta.get_translated_fields()
+        for language in AddressSearch.LANGUAGES
+    ]
+    source = _AREA_SOURCE_SQL.format(
+        areas=model._meta.db_table,
+        simplifications=simplification_model._meta.db_table,
+        area_column=area_column,
+    ).strip()
+    return TileLayer(
+        name,
+        _TILE_SQL.format(
+            columns=", ".join(
+                [f"area.{column}" for column in columns] + translated_columns
+            ),
+            geometry="coalesce(simplification.area, area.area)",
+            # The simplified areas are within about a meter of the extents of
+            # the full areas
+            indexed_geometry="area.area",
+            srid=settings.PROJECTION_SRID,
+            source=source,
+            extent=TILE_EXTENT,
+        ),
+        simplified=True,
+    )
+
+
+TILE_LAYERS = {
+    layer.name: layer
+    for layer in [
+        _address_layer(),
+        _area_layer(
+            "postal_code_area",
+            PostalCodeArea,
+            PostalCodeAreaSimplification,
+            "postal_code_area_id",
+            ["postal_code"],
+        ),
+        _area_layer(
+            "municipality",
+            Municipality,
+            MunicipalitySimplification,
+            "municipality_id",
+            ["code"],
+        ),
+    ]
+}
+
+
+def is_valid_tile(z: int, x: int, y: int) -> bool:
+    return 0 <= z <= MAX_TILE_ZOOM and 0 <= x < 2**z and 0 <= y < 2**z
+
+
+def render_tile(layer: TileLayer, z: int, x: int, y: int) -> bytes:
+    """
+    Render the Mapbox vector tile of the layer in PostGIS. The areas are read
+    from their precomputed simplifications for the zoom level, if any.
+    """
+    if z < layer.min_zoom:
+        return b""
+    params = [z, x, y, layer.name]
+    if layer.simplified:
+        params.append(tolerance_for_zoom(z))
+    with connection.cursor() as cursor:
+        cursor.execute(layer.sql, params)
+        (tile,) = cursor.fetchone()
+    return bytes(tile) if tile is not None else b""
+
+
+def _tile_xy(lon: float, lat: float, z: int) -> tuple[int, int]:
+    n = 2**z
+    x = floor((lon + 180) / 360 * n)
+    y = floor((1 - asinh(tan(radians(lat))) / pi) / 2 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tiles_within(
+    extent: tuple[float, float, float, float], min_zoom: int, max_zoom: int
+) -> Iterator[tuple[int, int, int]]:
+    """The z, x and y of the tiles covering the WGS84 extent at each zoom level."""
+    xmin, ymin, xmax, ymax = extent
+    for z in range(min_zoom, max_zoom + 1):
+        # The tile rows grow southwards
+        x0, y0 = _tile_xy(xmin, ymax, z)
+        x1, y1 = _tile_xy(xmax, ymin, z)
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                yield z, x, y
@@ -0,0 +1,279 @@
+"""
+TopoJSON topologies of the municipalities and postal code areas. Neighbouring
+areas share most of their boundaries, which a topology stores only once, as arcs
+shared by the areas.
+
+https://github.com/topojson/topojson-specification
+"""
+
+import json
+from collections.abc import Iterable
+
+from django.contrib.gis.geos import MultiPolygon
+
+from ..models import AddressSearch, AreaTopology, Municipality, PostalCodeArea
+
+# Number of distinct values of each quantized coordinate. Over the extent of
+# Finland, this rounds the coordinates to about a meter.
+TOPOLOGY_QUANTIZATION = 1_000_000
+
+# Name of the topology, and the untranslated properties of the areas, of each area
+# model. The name is also the name of the geometry collection of the areas.
+TOPOLOGIES = {
+    Municipality: ("municipality", ["code"]),
+    PostalCodeArea: ("postal_code_area", ["postal_code"]),
+}
+
+Point = tuple[int, int]
+
+
+def _quantized_rings(
+    area: MultiPolygon, scale: tuple[float, float], translate: tuple[float, float]
+) -> list[list[list[Point]]]:
+    """
+    The rings of the polygons of the area with their coordinates quantized,
+    without the repeated points or the closing point of each ring. The rings that
+    collapse when quantized are left out, as are the polygons of such exterior
+    rings.
+    """
+    (kx, ky), (x0, y0) = scale, translate
+    polygons = []
+    for polygon in area.coords:
+        rings = []
+        for ring in polygon:
+            points: list[Point] = []
+            for x, y in ring:
+                point = (round((x - x0) / kx), round((y - y0) / ky))
+                if not points or point != points[-1]:
+                    points.append(point)
+            if points[0] == points[-1]:
+                points.pop()
+            if len(points) >= 3:
+                rings.append(points)
+            elif not rings:
+                break
+        if rings:
+            polygons.append(rings)
+    return polygons
+
+
+def _junctions(rings: Iterable[list[Point]]) -> set[Point]:
+    """
+    The points where the rings meet or part, i.e. the points visited with
+    different neighbours. The shared boundaries are cut into arcs at them.
+    """
+    neighbours: dict[Point, frozenset] = {}
+    junctions = set()
+    for ring in rings:
+        for i, point in enumerate(ring):
+            pair = frozenset((ring[i - 1], ring[(i + 1) % len(ring)]))
+            if neighbours.setdefault(point, pair) != pair:
+                junctions.add(point)
+    return junctions
+
+
+def _ring_arcs(ring: list[Point], junctions: set[Point]) -> list[list[Point]]:
+    """Cut the ring into arcs at the junctions."""
+    starts = [i for i, point in enumerate(ring) if point in junctions]
+    if not starts:
+        # A ring sharing no boundary with another one is a closed arc. It starts
+        # from its smallest point, so that it is found if it is shared whole.
+        start = ring.index(min(ring))
+        return [ring[start:] + ring[: start + 1]]
+    ring = ring[starts[0] :] + ring[: starts[0]]
+    arcs = []
+    arc = [ring[0]]
+    for point in ring[1:]:
+        arc.append(point)
+        if point in junctions:
+            arcs.append(arc)
+            arc = [point]
+    arc.append(ring[0])
+    arcs.append(arc)
+    return arcs
+
+
+def _delta_encoded(arc: list[Point]) -> list[list[int]]:
+    encoded = [list(arc[0])]
+    for (x0, y0), (x1, y1) in zip(arc, arc[1:], strict=False):
+        encoded.append([x1 - x0, y1 - y0])
+    return encoded
+
+
+def topology_arcs(
+    areas: list[MultiPolygon | None],
+    scale: tuple[float, float],
+    translate: tuple[float, float],
+) -> tuple[list[list[Point]], list[list[list[list[int]]]]]:
+    """
+    Cut the boundaries of the areas, with their coordinates quantized, into arcs
+    shared by the areas. Return the arcs, and the rings of the polygons of each
+    area as the indices of their arcs. An arc traversed in reverse is given as
+    the ones' complement of its index.
+    """
+    polygons_by_area = [
+        _quantized_rings(area, scale, translate) if area is not None else []
+        for area in areas
+    ]
+    junctions = _junctions(
+        ring for polygons in polygons_by_area for rings in polygons for ring in rings
+    )
+
+    arcs: list[list[Point]] = []
+    arc_indices: dict[tuple[Point, ...], int] = {}
+
+    def arc_index(arc: list[Point]) -> int:
+        key = tuple(arc)
+        if key in arc_indices:
+            return arc_indices[key]
+        # An arc shared by two areas is traversed in opposite directions
+        if key[::-1] in arc_indices:
+            return ~arc_indices[key[::-1]]
+        arc_indices[key] = len(arcs)
+        arcs.append(arc)
+        return arc_indices[key]
+
+    area_arcs = [
+        [
+            [[arc_index(arc) for arc in _ring_arcs(ring, junctions)] for ring in rings]
+            for rings in polygons
+        ]
+        for polygons in polygons_by_area
+    ]
+    return arcs, area_arcs
+
+
+def build_topology(
+    name: str, areas: Iterable[tuple[object, dict, MultiPolygon | None]]
+) -> dict:
+    """
+    Build the TopoJSON topology of the areas given as their ids, properties and
+    geometries. The areas are in a geometry collection of the name.
+    """
+    areas = list(areas)
+    extents = [area.extent for _, _, area in areas if area is not None and area]
+    if extents:
+        xmin = min(extent[0] for extent in extents)
+        ymin = min(extent[1] for extent in extents)
+        xmax = max(extent[2] for extent in extents)
+        ymax = max(extent[3] for extent in extents)
+    else:
+        xmin = ymin = xmax = ymax = 0.0
+    scale = (
+        (xmax - xmin) / (TOPOLOGY_QUANTIZATION - 1) or 1.0,
+        (ymax - ymin) / (TOPOLOGY_QUANTIZATION - 1) or 1.0,
+    )
+    translate = (xmin, ymin)
+    arcs, area_arcs = topology_arcs([area for _, _, area in areas], scale, translate)
+
+    geometries = []
+    for (area_id, properties, _), polygons in zip(areas, area_arcs, strict=True):
+        geometry = {"type": None, "id": area_id, "properties": properties}
+        if polygons:
+            geometry["type"] = "MultiPolygon"
+            geometry["arcs"] = polygons
+        geometries.append(geometry)
+
+    return {
+        "type": "Topology",
+        "bbox": [xmin, ymin, xmax, ymax],
+        "transform": {"scale": list(scale), "translate": list(translate)},
+        "objects": {name: {"type": "GeometryCollection", "geometries": geometries}},
+        "arcs": [_delta_encoded(arc) for arc in arcs],
+    }
+
+
+def filter_topology(topology: dict, ids: set) -> dict:
+    """
+    The topology with only the areas of the ids, and only the arcs of those
+    areas.
+    """
+    objects = {}
+    used_arcs: set[int] = set()
+    for name, collection in topology["objects"].items():
+        geometries = [
+            geometry for geometry in collection["geometries"] if geometry["id"] in ids
+        ]
+        for geometry in geometries:
+            for rings in geometry.get("arcs", []):
+                for ring in rings:
+                    used_arcs.update(index if index >= 0 else ~index for index in ring)
+        objects[name] = {**collection, "geometries": geometries}
+
+    new_indices = {old: new for new, old in enumerate(sorted(used_arcs))}
+
+    def new_index(index: int) -> int:
+        return new_indices[index] if index >= 0 else ~new_indices[~index]
+
+    for collection in objects.values():
+        collection["geometries"] = [
+            {
+                **geometry,
+                "arcs": [
+                    [[new_index(index) for index in ring] for ring in rings]
+                    for rings in geometry["arcs"]
+                ],
+            }
+            if "arcs" in geometry
+            else geometry
+            for geometry in collection["geometries"]
+        ]
+    return {
+        **topology,
+        "objects": objects,
+        "arcs": [topology["arcs"][index] for index in sorted(used_arcs)],
+    }
+
+
+def _areas(model) -> Iterable[tuple[object, dict, MultiPolygon | None]]:
+    _, fields = TOPOLOGIES[model]
+    translations = model._parler_meta.root_model
+    translated_fields = model._parler_meta.get_translated_fields()
+    properties: dict[object, dict] = {}
+    for row in translations.objects.filter(
+        language_code__in=AddressSearch.LANGUAGES
+    ).values("master_id", "language_code", *translated_fields):
+        properties.setdefault(row["master_id"], {}).update(
+            {
+                f"{field}_{row['language_code']}": row[field]
+                for field in translated_fields
+            }
+        )
+    for obj in model.objects.only(*fields, "area").order_by("pk").iterator():
+        yield (
+            obj.pk,
+            {
+                **{field: getattr(obj, field) for field in fields},
+                **properties.get(obj.pk, {}),
+            },
+            obj.area,
+        )
+
+
+def store_topology(model) -> str:
+    """
+    Build the topology of all the municipalities or postal code areas, and
+    store it for the API. This must be done whenever the areas change.
+    """
+    name, _ = TOPOLOGIES[model]
+    topology = json.dumps(
+        build_topology(name, _areas(model)), ensure_ascii=False, separators=(",", ":")
+    )
+    AreaTopology.objects.update_or_create(name=name, defaults={"topology": topology})
+    return topology
+
+
+def stored_topology(model) -> str:
+    """
+    The stored topology of the areas as JSON, or an empty topology if none is
+    stored, i.e. no areas have been imported.
+    """
+    name, _ = TOPOLOGIES[model]
+    topology = (
+        AreaTopology.objects.filter(name=name)
+        .values_list("topology", flat=True)
+        .first()
+    )
+    if topology is None:
+        return json.dumps(build_topology(name, []), separators=(",", ":"))
+    return topology
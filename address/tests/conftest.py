@@ -8,6 +8,10 @@ from pytest import fixture
 from rest_framework.test import APIClient
 from rest_framework_api_key.models import APIKey
 
+from address.services.area_lookup import area_lookup
+from address.services.name_cache import name_cache
+from address.services.tile_cache import tile_cache
+
 
 @fixture
 def api_client() -> APIClient:
@@ -15,6 +19,14 @@ def api_client() -> APIClient:
     return APIClient(HTTP_API_KEY=api_key)
 
 
+@fixture(autouse=True)
+def clear_caches():
+    # The data cached in one test must not leak to the next one
+    name_cache.clear()
+    area_lookup.clear()
+    tile_cache.clear()
+
+
 @fixture
 def shapefile() -> Path:
     return Path(__file__).resolve().parent / "fixtures" / "shapefile.shp"
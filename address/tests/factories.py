@@ -2,6 +2,7 @@ from factory import Faker, LazyAttribute, SubFactory, post_generation
 from factory.django import DjangoModelFactory
 
 from ..models import Address, Municipality, PostalCodeArea, Street
+from ..services.search import refresh_address_search
 
 
 class MunicipalityFactory(DjangoModelFactory):
@@ -69,5 +70,11 @@ class AddressFactory(DjangoModelFactory):
     postal_code_area = SubFactory(PostalCodeAreaFactory)
     location = Faker("location", country_code="FI")
 
+    @post_generation
+    def refresh_search(self, *_, **__):
+        # The API reads the addresses from the address search view
+        refresh_address_search()
+
     class Meta:
         model = Address
+        skip_postgeneration_save = True
@@ -18,3 +18,10 @@ def test_location_field_to_representation():
     expected = {"type": "Point", "coordinates": coords}
     actual = LocationField(initial=expected).to_representation(value)
     assert actual == expected
+
+
+def test_location_field_to_representation_rounds_coordinates(settings):
+    settings.COORDINATE_PRECISION = 3
+    value = Point(25.0708149, 60.4129251, srid=settings.PROJECTION_SRID)
+    actual = LocationField().to_representation(value)
+    assert actual == {"type": "Point", "coordinates": [25.071, 60.413]}
@@ -1,11 +1,21 @@
+import re
+from io import StringIO
+
+from django.core.management import call_command
 from pytest import mark
+from rest_framework import serializers
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
 
 from ..api.serializers import (
+    AddressSearchSerializer,
     AddressSerializer,
+    CompiledSerializerMixin,
     MunicipalitySerializer,
     PostalCodeAreaSerializer,
     StreetSerializer,
 )
+from ..models import AddressSearch
 from ..tests.factories import (
     AddressFactory,
     MunicipalityFactory,
@@ -88,3 +98,80 @@ def test_address_serializer():
         },
         "modified_at": address.modified_at.astimezone().isoformat(),
     }
+
+
+@mark.django_db
+def test_address_search_serializer_matches_address_serializer():
+    address = AddressFactory()
+    address_search = AddressSearch.objects.get(pk=address.pk)
+    actual = AddressSearchSerializer().to_representation(address_search)
+    assert actual == AddressSerializer().to_representation(address)
+
+
+@mark.django_db
+def test_address_search_serializer_without_postal_code_area():
+    address = AddressFactory(postal_code_area=None)
+    address_search = AddressSearch.objects.get(pk=address.pk)
+    actual = AddressSearchSerializer().to_representation(address_search)
+    assert actual["postal_code_area"] is None
+    assert actual == AddressSerializer().to_representation(address)
+
+
+@mark.django_db
+@mark.parametrize(
+    "params",
+    [{}, {"area": "true"}, {"area": "true", "geom_format": "ewkt"}],
+)
+def test_compiled_serializer_matches_field_by_field_serialization(params: dict):
+    municipality = MunicipalityFactory()
+    request = Request(APIRequestFactory().get("/", params))
+    serializer = MunicipalitySerializer(context={"request": request})
+    field_by_field = serializers.Serializer.to_representation(serializer, municipality)
+    translations = field_by_field.pop("translations")
+    assert serializer.to_representation(municipality) == {
+        **field_by_field,
+        "name": {language: fields["name"] for language, fields in translations.items()},
+    }
+
+
+def test_compiled_serializer_serializes_fields_by_default():
+    class PairSerializer(CompiledSerializerMixin, serializers.Serializer):
+        first = serializers.IntegerField()
+        second = serializers.CharField(source="last")
+
+    serializer = PairSerializer()
+
+    assert serializer.to_representation({"first": 1, "last": 2}) == {
+        "first": 1,
+        "second": "2",
+    }
+    assert serializer.to_representation({"first": None, "last": "b"}) == {
+        "first": None,
+        "second": "b",
+    }
+
+
+@mark.django_db
+def test_benchmark_serializers_command():
+    AddressFactory()
+    stdout = StringIO()
+
+    call_command("benchmark_serializers", count=10, stdout=stdout)
+
+    lines = stdout.getvalue().splitlines()
+    assert len(lines) == 4
+    for line, serializer_class in zip(
+        lines,
+        [
+            AddressSearchSerializer,
+            AddressSerializer,
+            PostalCodeAreaSerializer,
+            MunicipalitySerializer,
+        ],
+        strict=True,
+    ):
+        assert re.fullmatch(
+            rf"{serializer_class.__name__}: 10 objects compiled in \d+\.\d{{3}} s, "
+            r"field by field in \d+\.\d{3} s\.",
+            line,
+        )
@@ -1,14 +1,19 @@
 from django.conf import settings
-from django.contrib.gis.geos import Point
+from django.contrib.gis.geos import MultiPolygon, Point, Polygon
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from pytest import mark
 from rest_framework.test import APIClient
 
+from geo_search.pagination import CappedCount, EstimatedCount
+
 from ..api.serializers import (
     AddressSerializer,
     MunicipalitySerializer,
     PostalCodeAreaSerializer,
 )
+from ..api.views import AddressViewSet
 from ..tests.factories import (
     AddressFactory,
     MunicipalityFactory,
@@ -31,6 +36,57 @@ def test_get_address_list(api_client: APIClient):
     }
 
 
+@mark.django_db
+def test_search_addresses_by_free_text(api_client: APIClient):
+    municipality = MunicipalityFactory(name="Helsinki")
+    street = StreetFactory(name="Mannerheimintie", municipality=municipality)
+    postal_code_area = PostalCodeAreaFactory(postal_code="00100")
+    match = AddressFactory(
+        street=street,
+        municipality=municipality,
+        postal_code_area=postal_code_area,
+        number="42",
+        number_end="",
+        letter="B",
+    )
+    AddressFactory(
+        street=street,
+        municipality=municipality,
+        postal_code_area=postal_code_area,
+        number="42",
+        number_end="",
+        letter="A",
+    )
+    AddressFactory(street=StreetFactory(name="Aleksanterinkatu"), number="42")
+    serializer = AddressSerializer()
+    response = api_client.get(
+        reverse("address:address-list"),
+        {"q": "Mannerheimintie 42 B, 00100 Helsinki"},
+    )
+    assert response.status_code == 200
+    assert response.data == {
+        "count": 1,
+        "next": None,
+        "previous": None,
+        "results": [serializer.to_representation(match)],
+    }
+
+
+@mark.django_db
+def test_search_addresses_ranks_exact_matches_first(api_client: APIClient):
+    street = StreetFactory(name="Mannerheimintie")
+    with_letter = AddressFactory(street=street, number="42", number_end="", letter="A")
+    exact = AddressFactory(street=street, number="42", number_end="", letter="")
+    response = api_client.get(
+        reverse("address:address-list"), {"q": "mannerheimintie 42"}
+    )
+    assert response.status_code == 200
+    assert [result["letter"] for result in response.data["results"]] == [
+        exact.letter,
+        with_letter.letter,
+    ]
+
+
 @mark.django_db
 def test_filter_addresses_by_street_name(api_client: APIClient):
     match = AddressFactory(street=StreetFactory(name="Matching Street"))
@@ -238,21 +294,92 @@ def test_filter_addresses_by_location_with_distance(api_client: APIClient):
 
 
 @mark.django_db
+@mark.parametrize(
+    "params",
+    [
+        {"lat": "60.1666"},
+        {"lat": "91", "lon": "24.9428"},
+        {"lat": "60.1666", "lon": "-180.5"},
+        {"lat": "nan", "lon": "24.9428"},
+        {"lat": "60.1666", "lon": "inf"},
+    ],
+)
 def test_filter_addresses_returns_bad_request_if_location_is_invalid(
-    api_client: APIClient,
+    api_client: APIClient, params: dict
 ):
-    response = api_client.get(reverse("address:address-list"), {"lat": "60.1666"})
+    response = api_client.get(reverse("address:address-list"), params)
     assert response.status_code == 400
 
 
 @mark.django_db
+@mark.parametrize("distance", ["", "-1", "nan", "inf"])
+@mark.parametrize("nearest", [None, 5])
 def test_filter_addresses_returns_bad_request_if_distance_is_invalid(
-    api_client: APIClient,
+    api_client: APIClient, distance: str, nearest: int | None
 ):
+    params = {"lat": "60.1666", "lon": "24.9428", "distance": distance}
+    if nearest is not None:
+        params["nearest"] = nearest
+    response = api_client.get(reverse("address:address-list"), params)
+    assert response.status_code == 400
+
+
+@mark.django_db
+def test_find_nearest_addresses(api_client: APIClient):
+    lat, lon = 60.1666, 24.9428
+    closest = AddressFactory(
+        # 9.8 meters away
+        location=Point(x=24.942952094, y=60.16664523, srid=settings.PROJECTION_SRID)
+    )
+    second = AddressFactory(
+        # 10.2 meters away
+        location=Point(x=24.942984201, y=60.166600058, srid=settings.PROJECTION_SRID)
+    )
+    AddressFactory(location=Point(x=27, y=67, srid=settings.PROJECTION_SRID))
+    serializer = AddressSerializer()
+    response = api_client.get(
+        reverse("address:address-list"), {"lat": lat, "lon": lon, "nearest": 2}
+    )
+    assert response.status_code == 200
+    assert response.data["count"] == 2
+    results = response.data["results"]
+    for result, match in zip(results, [closest, second], strict=True):
+        distance = result.pop("distance")
+        assert result == serializer.to_representation(match)
+        assert 9.5 < distance < 10.5
+
+
+@mark.django_db
+def test_find_nearest_addresses_within_distance(api_client: APIClient):
+    lat, lon = 60.1666, 24.9428
+    match = AddressFactory(
+        # 9.8 meters away
+        location=Point(x=24.942952094, y=60.16664523, srid=settings.PROJECTION_SRID)
+    )
+    AddressFactory(location=Point(x=27, y=67, srid=settings.PROJECTION_SRID))
     response = api_client.get(
         reverse("address:address-list"),
-        {"lat": "60.1666", "lon": "24.9428", "distance": ""},
+        {"lat": lat, "lon": lon, "nearest": 5, "distance": 10},
     )
+    assert response.status_code == 200
+    assert response.data["count"] == 1
+    assert response.data["results"][0]["number"] == match.number
+
+
+@mark.django_db
+@mark.parametrize(
+    "params",
+    [
+        {"nearest": 5},
+        {"lat": "60.1666", "lon": "24.9428", "nearest": "five"},
+        {"lat": "60.1666", "lon": "24.9428", "nearest": 0},
+        {"lat": "60.1666", "lon": "24.9428", "nearest": 1000},
+    ],
+)
+def test_find_nearest_addresses_returns_bad_request_if_nearest_is_invalid(
+    api_client: APIClient, params: dict
+):
+    response = api_client.get(reverse("address:address-list"), params)
     assert response.status_code == 400
 
 
@@ -325,3 +452,190 @@ def test_filter_municipalities_by_municipality_code(api_client: APIClient):
         "previous": None,
         "results": [serializer.to_representation(match)],
     }
+
+
+@mark.django_db
+@mark.parametrize(
+    "url,params",
+    [
+        (
+            "address:address-list",
+            {
+                "streetname": "Mannerheimintie",
+                "municipality": "Helsinki",
+                "postoffice": "Helsinki",
+            },
+        ),
+        (
+            "address:postalcodearea-list",
+            {"postalcodearea": "Kallio", "postoffice": "Helsinki"},
+        ),
+        ("address:municipality-list", {"municipality": "Helsinki"}),
+    ],
+)
+def test_name_filters_do_not_add_queries(api_client: APIClient, url: str, params):
+    with CaptureQueriesContext(connection) as unfiltered:
+        api_client.get(reverse(url))
+    with CaptureQueriesContext(connection) as filtered:
+        response = api_client.get(reverse(url), params)
+    assert response.status_code == 200
+    assert len(filtered) == len(unfiltered)
+
+
+@mark.django_db
+def test_name_filters_match_ids_of_cached_names(api_client: APIClient):
+    street = StreetFactory(name="Mannerheimintie")
+    AddressFactory(street=street)
+    AddressFactory(street=StreetFactory(name="Aleksanterinkatu"))
+    url = reverse("address:address-list")
+    params = {"streetname": "MANNERHEIMINTIE"}
+    # The name is resolved to ids when it is asked for the second time
+    api_client.get(url, params)
+    api_client.get(url, params)
+    with CaptureQueriesContext(connection) as unfiltered:
+        api_client.get(url)
+    with CaptureQueriesContext(connection) as filtered:
+        response = api_client.get(url, params)
+    assert response.status_code == 200
+    assert response.data["count"] == 1
+    assert len(filtered) == len(unfiltered)
+    assert f"IN ({street.pk})" in filtered.captured_queries[-1]["sql"]
+
+
+@mark.django_db
+def test_filter_municipalities_by_name_matching_several_languages(
+    api_client: APIClient,
+):
+    municipality = MunicipalityFactory(name="Inkoo")
+    municipality.set_current_language("sv")
+    municipality.name = "INKOO"
+    municipality.save()
+    response = api_client.get(
+        reverse("address:municipality-list"), {"municipality": "inkoo"}
+    )
+    assert response.status_code == 200
+    assert response.data["count"] == 1
+
+
+@mark.django_db
+def test_get_address_list_with_cursor(api_client: APIClient):
+    addresses = [AddressFactory() for _ in range(3)]
+    url = reverse("address:address-list")
+
+    response = api_client.get(url, {"cursor": "", "page_size": 2})
+    assert response.status_code == 200
+    first_page = response.json()
+    assert "count" not in first_page
+    response = api_client.get(first_page["next"])
+    assert response.status_code == 200
+    second_page = response.json()
+
+    results = first_page["results"] + second_page["results"]
+    assert [result["location"]["coordinates"] for result in results] == [
+        list(address.location.coords) for address in addresses
+    ]
+    assert second_page["next"] is None
+
+
+@mark.django_db
+@mark.parametrize(
+    "params",
+    [{"q": "Mannerheimintie"}, {"lat": 60.17, "lon": 24.94, "nearest": 5}],
+)
+def test_get_address_list_with_cursor_returns_bad_request_if_not_ordered_by_key(
+    api_client: APIClient, params: dict
+):
+    response = api_client.get(reverse("address:address-list"), {**params, "cursor": ""})
+    assert response.status_code == 400
+
+
+@mark.django_db
+def test_get_address_list_with_capped_count(api_client: APIClient, monkeypatch):
+    monkeypatch.setattr(AddressViewSet, "count_strategy", CappedCount(2))
+    for _ in range(3):
+        AddressFactory()
+    url = reverse("address:address-list")
+
+    response = api_client.get(url, {"page_size": 2})
+    assert response.status_code == 200
+    first_page = response.json()
+    assert first_page["count"] == 2
+    assert first_page["count_exact"] is False
+    response = api_client.get(first_page["next"])
+    assert response.status_code == 200
+    second_page = response.json()
+    assert len(second_page["results"]) == 1
+    assert second_page["next"] is None
+
+
+@mark.django_db
+def test_get_address_list_with_requested_count_cap(api_client: APIClient):
+    for _ in range(3):
+        AddressFactory()
+    url = reverse("address:address-list")
+
+    response = api_client.get(url)
+    assert response.json()["count"] == 3
+    assert "count_exact" not in response.json()
+    response = api_client.get(url, {"count_cap": 2})
+    assert response.status_code == 200
+    assert response.json()["count"] == 2
+    assert response.json()["count_exact"] is False
+    response = api_client.get(url, {"count_cap": 0})
+    assert response.status_code == 400
+
+
+@mark.django_db
+def test_get_address_list_with_estimated_count(api_client: APIClient, monkeypatch):
+    monkeypatch.setattr(AddressViewSet, "count_strategy", EstimatedCount(0))
+    AddressFactory()
+    response = api_client.get(reverse("address:address-list"))
+    assert response.status_code == 200
+    assert response.json()["count_exact"] is False
+    assert len(response.json()["results"]) == 1
+
+
+@mark.django_db
+def test_count_addresses_only(api_client: APIClient):
+    municipality = MunicipalityFactory(name="Helsinki")
+    for _ in range(3):
+        AddressFactory(municipality=municipality)
+    AddressFactory(municipality=MunicipalityFactory(name="Vantaa"))
+    response = api_client.get(
+        reverse("address:address-list"),
+        {"municipality": "Helsinki", "count_only": "true"},
+    )
+    assert response.status_code == 200
+    assert response.json() == {"count": 3}
+
+
+@mark.django_db
+def test_area_coordinates_are_rounded_to_precision(api_client: APIClient):
+    area = MultiPolygon(
+        Polygon.from_bbox((24.9012345678, 60.1012345678, 25.0, 60.2)), srid=4326
+    )
+    municipality = MunicipalityFactory(area=area)
+    AddressFactory(municipality=municipality)
+    params = {"area": "true", "precision": 2}
+
+    municipalities = api_client.get(reverse("address:municipality-list"), params)
+    addresses = api_client.get(reverse("address:address-list"), params)
+
+    assert municipalities.status_code == addresses.status_code == 200
+    expected = {
+        "type": "MultiPolygon",
+        "coordinates": [
+            [[[24.9, 60.1], [24.9, 60.2], [25, 60.2], [25, 60.1], [24.9, 60.1]]]
+        ],
+    }
+    assert municipalities.json()["results"][0]["area"] == expected
+    assert addresses.json()["results"][0]["municipality"]["area"] == expected
+
+
+@mark.django_db
+@mark.parametrize("precision", ["x", -1, 16])
+def test_get_address_list_returns_bad_request_if_precision_is_invalid(
+    api_client: APIClient, precision
+):
+    response = api_client.get(reverse("address:address-list"), {"precision": precision})
+    assert response.status_code == 400
@@ -0,0 +1,99 @@
+"""
+Tests for finding the municipality and postal code area containing a location.
+"""
+
+from django.contrib.gis.geos import MultiPolygon, Polygon
+from django.urls import reverse
+from pytest import fixture, mark
+from rest_framework.test import APIClient
+
+from address.services.area_lookup import area_lookup
+from address.tests.factories import MunicipalityFactory, PostalCodeAreaFactory
+
+
+def _area(bbox: tuple) -> MultiPolygon:
+    return MultiPolygon(Polygon.from_bbox(bbox), srid=4326)
+
+
+@fixture
+def areas():
+    MunicipalityFactory(
+        name="Helsinki", code="091", area=_area((24.8, 60.1, 25.2, 60.3))
+    )
+    MunicipalityFactory(name="Vantaa", code="092", area=_area((24.8, 60.3, 25.2, 60.4)))
+    PostalCodeAreaFactory(postal_code="00100", area=_area((24.9, 60.15, 24.95, 60.2)))
+
+
+@mark.django_db
+def test_area_lookup(api_client: APIClient, areas):
+    response = api_client.get(
+        reverse("address:area-lookup-list"), {"lat": 60.17, "lon": 24.93}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["municipality"]["code"] == "091"
+    assert data["municipality"]["area"] is None
+    assert data["postal_code_area"]["postal_code"] == "00100"
+
+
+@mark.django_db
+def test_area_lookup_outside_areas(api_client: APIClient, areas):
+    response = api_client.get(
+        reverse("address:area-lookup-list"), {"lat": 60.35, "lon": 25.0}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["municipality"]["code"] == "092"
+    assert data["postal_code_area"] is None
+
+
+@mark.django_db
+def test_area_lookup_batch(api_client: APIClient, areas):
+    response = api_client.post(
+        reverse("address:area-lookup-batch"),
+        {
+            "locations": [
+                {"lat": 60.35, "lon": 25.0},
+                {"lat": 61.0, "lon": 25.0},
+                {"lat": 60.17, "lon": 24.93},
+            ]
+        },
+        format="json",
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["municipality"] and r["municipality"]["code"] for r in results] == [
+        "092",
+        None,
+        "091",
+    ]
+
+
+@mark.django_db
+def test_area_lookup_does_not_query_database_once_loaded(
+    django_assert_num_queries, areas
+):
+    area_lookup.find(24.93, 60.17)
+    with django_assert_num_queries(0):
+        match = area_lookup.find(25.0, 60.35)
+    assert match.municipality.code == "092"
+
+
+@mark.django_db
+@mark.parametrize(
+    "params",
+    [
+        {},
+        {"lat": 60.17},
+        {"lat": "x", "lon": 24.93},
+        {"lat": "nan", "lon": 24.93},
+        {"lat": 60.17, "lon": "inf"},
+        {"lat": -90.5, "lon": 24.93},
+        {"lat": 60.17, "lon": 181},
+    ],
+)
+def test_area_lookup_returns_bad_request_if_location_is_invalid(
+    api_client: APIClient, params: dict
+):
+    response = api_client.get(reverse("address:area-lookup-list"), params)
+    assert response.status_code == 400
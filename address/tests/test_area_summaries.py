@@ -0,0 +1,75 @@
+"""
+Tests for the bounding boxes, centroids and label points of the areas.
+"""
+
+from django.contrib.gis.geos import MultiPolygon, Polygon
+from django.urls import reverse
+from pytest import mark
+from rest_framework.test import APIClient
+
+from address.models import Municipality
+from address.tests.factories import MunicipalityFactory
+
+
+def _l_shaped_area() -> MultiPolygon:
+    # The centroid of an L-shaped area is outside of it
+    return MultiPolygon(
+        Polygon(
+            ((24.0, 60.0), (25.0, 60.0), (25.0, 60.1), (24.1, 60.1), (24.1, 60.5))
+            + ((24.0, 60.5), (24.0, 60.0)),
+            srid=4326,
+        ),
+        srid=4326,
+    )
+
+
+@mark.django_db
+def test_area_summaries_are_stored():
+    MunicipalityFactory(area=_l_shaped_area())
+
+    municipality = Municipality.objects.get()
+    assert municipality.area_bbox.extent == (24.0, 60.0, 25.0, 60.5)
+    assert not municipality.area.contains(municipality.area_centroid)
+    assert municipality.area.contains(municipality.area_label_point)
+
+
+@mark.django_db
+def test_area_summaries_are_stored_when_area_changes():
+    municipality = MunicipalityFactory(area=None)
+    assert Municipality.objects.get().area_label_point is None
+
+    municipality.area = _l_shaped_area()
+    municipality.save()
+
+    municipality = Municipality.objects.get()
+    assert municipality.area_bbox.extent == (24.0, 60.0, 25.0, 60.5)
+    assert municipality.area.contains(municipality.area_label_point)
+
+
+@mark.django_db
+def test_municipality_api_returns_area_bbox(api_client: APIClient):
+    MunicipalityFactory(area=_l_shaped_area())
+
+    response = api_client.get(
+        reverse("address:municipality-list"), {"area": "bbox", "geom_format": "ewkt"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["results"][0]["area"] == [24.0, 60.0, 25.0, 60.5]
+
+
+@mark.django_db
+@mark.parametrize("summary", ["centroid", "label_point"])
+def test_municipality_api_returns_area_point(api_client: APIClient, summary):
+    MunicipalityFactory(area=_l_shaped_area())
+    point = getattr(Municipality.objects.get(), f"area_{summary}")
+
+    response = api_client.get(
+        reverse("address:municipality-list"), {"area": summary, "precision": 3}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["results"][0]["area"] == {
+        "type": "Point",
+        "coordinates": [round(point.x, 3), round(point.y, 3)],
+    }
@@ -0,0 +1,75 @@
+"""
+Tests for updating the data derived from the areas when they change.
+"""
+
+import json
+from io import StringIO
+
+from django.contrib.gis.geos import MultiPolygon, Point, Polygon
+from django.core.management import call_command
+from django.urls import reverse
+from pytest import mark
+from rest_framework.test import APIClient
+
+from address.models import (
+    AreaTopology,
+    DatasetVersion,
+    Municipality,
+    MunicipalitySimplification,
+)
+from address.services.area_update import finish_area_updates, update_area
+from address.tests.factories import AddressFactory, MunicipalityFactory
+
+
+def _square(xmin: float, ymin: float, xmax: float, ymax: float) -> MultiPolygon:
+    return MultiPolygon(Polygon.from_bbox((xmin, ymin, xmax, ymax)), srid=4326)
+
+
+@mark.django_db
+def test_update_area_updates_addresses_within_area():
+    municipality = MunicipalityFactory(name="Helsinki", area=_square(24, 60, 25, 61))
+    vantaa = MunicipalityFactory(name="Vantaa")
+    AddressFactory(municipality=vantaa, location=Point(24.5, 60.5, srid=4326))
+
+    assert update_area(municipality) == 1
+
+
+@mark.django_db
+def test_finish_area_updates(api_client: APIClient):
+    MunicipalityFactory(name="Helsinki", code="091", area=_square(24, 60, 25, 61))
+    version = DatasetVersion.current()
+
+    finish_area_updates(Municipality)
+
+    assert MunicipalitySimplification.objects.exists()
+    topology = json.loads(AreaTopology.objects.get(name="municipality").topology)
+    (geometry,) = topology["objects"]["municipality"]["geometries"]
+    assert geometry["properties"]["code"] == "091"
+    assert DatasetVersion.current() == version + 1
+    response = api_client.get(
+        reverse("address:municipality-list"), {"format": "topojson"}
+    )
+    assert response.json() == topology
+
+
+@mark.django_db
+def test_finish_area_updates_without_simplifying():
+    MunicipalityFactory(area=_square(24, 60, 25, 61))
+
+    finish_area_updates(Municipality, simplify=False)
+
+    assert not MunicipalitySimplification.objects.exists()
+    assert AreaTopology.objects.filter(name="municipality").exists()
+
+
+@mark.django_db
+def test_refresh_address_data_command():
+    MunicipalityFactory(area=_square(24, 60, 25, 61))
+    version = DatasetVersion.current()
+
+    call_command("refresh_address_data", stdout=StringIO())
+
+    assert MunicipalitySimplification.objects.exists()
+    assert AreaTopology.objects.filter(name="municipality").exists()
+    assert AreaTopology.objects.filter(name="postal_code_area").exists()
+    assert DatasetVersion.current() == version + 1
@@ -0,0 +1,92 @@
+"""
+Tests for the street, postal code area and municipality autocomplete API.
+"""
+
+from django.urls import reverse
+from pytest import mark
+from rest_framework.test import APIClient
+
+from address.tests.factories import (
+    MunicipalityFactory,
+    PostalCodeAreaFactory,
+    StreetFactory,
+)
+
+
+@mark.django_db
+def test_autocomplete_street_with_municipality(api_client: APIClient):
+    municipality = MunicipalityFactory(name="Helsinki", code="091")
+    StreetFactory(name="Mannerheimintie", municipality=municipality)
+    StreetFactory(name="Aleksanterinkatu", municipality=municipality)
+
+    response = api_client.get(reverse("address:autocomplete-list"), {"q": "manner"})
+
+    assert response.status_code == 200
+    assert response.json()["results"] == [
+        {
+            "type": "street",
+            "name": {
+                "fi": "Mannerheimintie",
+                "sv": "Mannerheimintie",
+                "en": "Mannerheimintie",
+            },
+            "municipality": {
+                "code": "091",
+                "name": {"fi": "Helsinki", "sv": "Helsinki", "en": "Helsinki"},
+            },
+        }
+    ]
+
+
+@mark.django_db
+def test_autocomplete_ranks_prefix_matches_first(api_client: APIClient):
+    StreetFactory(name="Pikku Huopalahdentie")
+    PostalCodeAreaFactory(name="Huopalahti", postal_code="00350")
+
+    response = api_client.get(reverse("address:autocomplete-list"), {"q": "huopa"})
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["type"] for result in results] == ["postal_code_area", "street"]
+    assert results[0]["postal_code"] == "00350"
+
+
+@mark.django_db
+def test_autocomplete_matches_any_language(api_client: APIClient):
+    municipality = MunicipalityFactory(name="Helsinki")
+    municipality.set_current_language("sv")
+    municipality.name = "Helsingfors"
+    municipality.save()
+
+    response = api_client.get(reverse("address:autocomplete-list"), {"q": "helsingf"})
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert len(results) == 1
+    assert results[0]["type"] == "municipality"
+    assert results[0]["name"]["sv"] == "Helsingfors"
+
+
+@mark.django_db
+def test_autocomplete_limit(api_client: APIClient):
+    for name in ["Kalliotie", "Kalliokatu", "Kalliopolku"]:
+        StreetFactory(name=name)
+
+    response = api_client.get(
+        reverse("address:autocomplete-list"), {"q": "kallio", "limit": 2}
+    )
+
+    assert response.status_code == 200
+    assert len(response.json()["results"]) == 2
+
+
+@mark.django_db
+@mark.parametrize(
+    "params",
+    [{}, {"q": "ma"}, {"q": "manner", "limit": "x"}, {"q": "manner", "limit": 0}],
+)
+def test_autocomplete_returns_bad_request_if_parameters_are_invalid(
+    api_client: APIClient, params: dict
+):
+    response = api_client.get(reverse("address:autocomplete-list"), params)
+    assert response.status_code == 400
@@ -0,0 +1,145 @@
+"""
+Tests for geocoding and reverse geocoding many addresses with a single request.
+"""
+
+from django.contrib.gis.geos import Point
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from pytest import mark
+from rest_framework.test import APIClient
+
+from address.services.batch_geocoding import MAX_BATCH_ADDRESSES, MAX_BATCH_LOCATIONS
+from address.tests.factories import AddressFactory, MunicipalityFactory, StreetFactory
+
+
+@mark.django_db
+def test_batch_geocoding_returns_a_result_for_each_address_in_order(
+    api_client: APIClient,
+):
+    helsinki = MunicipalityFactory(name="Helsinki", code="091")
+    vantaa = MunicipalityFactory(name="Vantaa", code="092")
+    in_helsinki = AddressFactory(
+        street=StreetFactory(name="Kalliotie", municipality=helsinki),
+        municipality=helsinki,
+        number="1",
+        number_end="",
+        letter="",
+    )
+    in_vantaa = AddressFactory(
+        street=StreetFactory(name="Kalliotie", municipality=vantaa),
+        municipality=vantaa,
+        number="1",
+        number_end="",
+        letter="",
+    )
+
+    response = api_client.post(
+        reverse("address:address-batch"),
+        {
+            "addresses": [
+                {
+                    "streetname": "kalliotie",
+                    "streetnumber": "1",
+                    "municipality": "Vantaa",
+                },
+                {"streetname": "Tuntematon tie"},
+                {"q": "Kalliotie 1 Helsinki"},
+            ]
+        },
+        format="json",
+    )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert len(results) == 3
+    assert results[0]["municipality"]["code"] == in_vantaa.municipality.code
+    assert results[1] is None
+    assert results[2]["municipality"]["code"] == in_helsinki.municipality.code
+
+
+@mark.django_db
+def test_batch_geocoding_query_count_does_not_depend_on_batch_size(
+    api_client: APIClient,
+):
+    AddressFactory(street=StreetFactory(name="Kalliotie"))
+    url = reverse("address:address-batch")
+
+    with CaptureQueriesContext(connection) as single:
+        api_client.post(url, {"addresses": [{"q": "Kalliotie"}]}, format="json")
+    with CaptureQueriesContext(connection) as many:
+        api_client.post(url, {"addresses": [{"q": "Kalliotie"}] * 50}, format="json")
+
+    assert len(many) == len(single)
+
+
+@mark.django_db
+@mark.parametrize(
+    "addresses",
+    [
+        [],
+        [{}],
+        [{"streetnumber": "1"}],
+        [{"q": "Kalliotie 1", "streetname": "Kalliotie"}],
+        [{"q": "Kalliotie"}] * (MAX_BATCH_ADDRESSES + 1),
+    ],
+)
+def test_batch_geocoding_returns_bad_request_if_addresses_are_invalid(
+    api_client: APIClient, addresses: list
+):
+    response = api_client.post(
+        reverse("address:address-batch"), {"addresses": addresses}, format="json"
+    )
+    assert response.status_code == 400
+
+
+@mark.django_db
+def test_batch_reverse_geocoding_returns_nearest_address_for_each_location(
+    api_client: APIClient,
+):
+    west = AddressFactory(location=Point(24.90, 60.17, srid=4326))
+    east = AddressFactory(location=Point(25.10, 60.17, srid=4326))
+
+    response = api_client.post(
+        reverse("address:address-reverse-batch"),
+        {
+            "locations": [
+                {"lat": 60.17, "lon": 25.101},
+                {"lat": 60.17, "lon": 24.899},
+                {"lat": 61.0, "lon": 25.0},
+            ],
+            "distance": 1000,
+        },
+        format="json",
+    )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert len(results) == 3
+    assert results[0]["location"]["coordinates"] == list(east.location.coords)
+    assert results[1]["location"]["coordinates"] == list(west.location.coords)
+    assert 50 < results[0]["distance"] < 60
+    assert results[2] is None
+
+
+@mark.django_db
+@mark.parametrize(
+    "data",
+    [
+        {"locations": []},
+        {"locations": [{"lat": 60.17}]},
+        {"locations": [{"lat": 91, "lon": 25}]},
+        {"locations": [{"lat": "nan", "lon": 25}]},
+        {"locations": [{"lat": 60.17, "lon": "-inf"}]},
+        {"locations": [{"lat": 60.17, "lon": 25}], "distance": "nan"},
+        {"locations": [{"lat": 60.17, "lon": 25}], "distance": -1},
+        {"locations": [{"lat": 60.17, "lon": 25}] * (MAX_BATCH_LOCATIONS + 1)},
+    ],
+)
+def test_batch_reverse_geocoding_returns_bad_request_if_locations_are_invalid(
+    api_client: APIClient, data: dict
+):
+    response = api_client.post(
+        reverse("address:address-reverse-batch"), data, format="json"
+    )
+    assert response.status_code == 400
@@ -0,0 +1,61 @@
+"""
+Tests for clipping the area geometries to a bounding box.
+"""
+
+import json
+
+from django.contrib.gis.geos import GEOSGeometry, MultiPolygon, Polygon
+from django.urls import reverse
+from pytest import mark
+from rest_framework.test import APIClient
+
+from address.tests.factories import MunicipalityFactory, PostalCodeAreaFactory
+
+
+def _square(xmin: float, ymin: float, xmax: float, ymax: float) -> MultiPolygon:
+    return MultiPolygon(Polygon.from_bbox((xmin, ymin, xmax, ymax)), srid=4326)
+
+
+@mark.django_db
+@mark.parametrize("area_format", ["geojson", "ewkt"])
+def test_municipality_api_clips_area_to_bbox(api_client: APIClient, area_format):
+    # The stored formatted area is not returned for a clipped area
+    MunicipalityFactory(area=_square(24.0, 60.0, 26.0, 61.0))
+
+    response = api_client.get(
+        reverse("address:municipality-list"),
+        {"area": "true", "geom_format": area_format, "clip_bbox": "25,60.5,27,62"},
+    )
+
+    assert response.status_code == 200
+    area = response.json()["results"][0]["area"]
+    if area_format == "geojson":
+        assert area["type"] == "MultiPolygon"
+        area = GEOSGeometry(json.dumps(area))
+    else:
+        area = GEOSGeometry(area)
+    assert area.extent == (25.0, 60.5, 26.0, 61.0)
+
+
+@mark.django_db
+def test_postal_code_area_api_returns_only_areas_intersecting_clip_bbox(
+    api_client: APIClient,
+):
+    PostalCodeAreaFactory(postal_code="00100", area=_square(24.0, 60.0, 25.0, 61.0))
+    PostalCodeAreaFactory(postal_code="00200", area=_square(26.0, 60.0, 27.0, 61.0))
+
+    response = api_client.get(
+        reverse("address:postalcodearea-list"), {"clip_bbox": "24.5,60.5,25.5,61.5"}
+    )
+
+    assert response.status_code == 200
+    assert [r["postal_code"] for r in response.json()["results"]] == ["00100"]
+
+
+@mark.django_db
+def test_clip_bbox_returns_bad_request_if_invalid(api_client: APIClient):
+    response = api_client.get(
+        reverse("address:municipality-list"), {"area": "true", "clip_bbox": "1,2,3"}
+    )
+
+    assert response.status_code == 400
@@ -0,0 +1,91 @@
+"""
+Tests that the address JSON built by PostgreSQL matches the serializers.
+"""
+
+from datetime import UTC, datetime
+
+from django.contrib.gis.geos import Point
+from django.urls import reverse
+from pytest import mark
+from rest_framework.test import APIClient
+
+from address.models import Address
+from address.services.search import refresh_address_search
+from address.tests.factories import (
+    AddressFactory,
+    MunicipalityFactory,
+    PostalCodeAreaFactory,
+    StreetFactory,
+)
+
+
+def _get_both_ways(api_client: APIClient, settings, params: dict) -> tuple:
+    url = reverse("address:address-list")
+    settings.ADDRESS_JSON_IN_DATABASE = False
+    serialized = api_client.get(url, params)
+    settings.ADDRESS_JSON_IN_DATABASE = True
+    built_in_database = api_client.get(url, params)
+    assert serialized.status_code == built_in_database.status_code == 200
+    return serialized.json(), built_in_database.json()
+
+
+@mark.django_db
+def test_address_json_built_in_database_matches_serializers(
+    api_client: APIClient, settings
+):
+    municipality = MunicipalityFactory(name="Helsinki", code="091")
+    municipality.set_current_language("sv")
+    municipality.name = "Helsingfors"
+    municipality.save()
+    street = StreetFactory(name="Mannerheimintie", municipality=municipality)
+    postal_code_area = PostalCodeAreaFactory(name="Kamppi", postal_code="00100")
+    postal_code_area.set_current_language("fi")
+    postal_code_area.post_office = "HELSINKI"
+    postal_code_area.save()
+    AddressFactory(
+        street=street,
+        municipality=municipality,
+        postal_code_area=postal_code_area,
+        number="42",
+        number_end="44",
+        letter="B",
+    )
+    AddressFactory(municipality=municipality, postal_code_area=None, letter="")
+    # Both with and without microseconds
+    Address.objects.filter(street=street).update(
+        modified_at=datetime(2024, 1, 1, 12, tzinfo=UTC)
+    )
+    refresh_address_search()
+
+    serialized, built_in_database = _get_both_ways(api_client, settings, {})
+
+    assert built_in_database == serialized
+
+
+@mark.django_db
+def test_address_json_built_in_database_matches_serializers_when_searching(
+    api_client: APIClient, settings
+):
+    for name in ["Kalliotie", "Kalliokatu"]:
+        AddressFactory(street=StreetFactory(name=name))
+
+    serialized, built_in_database = _get_both_ways(
+        api_client, settings, {"q": "Kalliotie", "page_size": 1}
+    )
+
+    assert built_in_database == serialized
+
+
+@mark.django_db
+def test_address_json_built_in_database_rounds_coordinates(
+    api_client: APIClient, settings
+):
+    AddressFactory(location=Point(25.0708149, 60.4129251, srid=4326))
+    refresh_address_search()
+
+    serialized, built_in_database = _get_both_ways(
+        api_client, settings, {"precision": 3}
+    )
+
+    assert built_in_database == serialized
+    assert serialized["results"][0]["location"]["coordinates"] == [25.071, 60.413]
@@ -0,0 +1,133 @@
+"""
+Tests for the stored formatted area geometries.
+"""
+
+import json
+
+from django.contrib.gis.geos import GEOSGeometry, MultiPolygon, Polygon
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from pytest import mark
+from rest_framework.test import APIClient
+
+from address.checks import check_formatted_area_precision
+from address.models import FORMATTED_AREA_PRECISION, Municipality
+from address.tests.factories import MunicipalityFactory
+from geo_search.renderers import JSONRenderer, RawJSON
+
+
+def _area() -> MultiPolygon:
+    return MultiPolygon(
+        Polygon.from_bbox((24.91234567891, 60.1, 25.0, 60.2)), srid=4326
+    )
+
+
+@mark.django_db
+def test_formatted_areas_are_stored():
+    municipality = MunicipalityFactory(area=_area())
+
+    stored = Municipality.objects.only("area_geojson", "area_ewkt").get()
+    geojson = json.loads(stored.area_geojson)
+    assert geojson["type"] == "MultiPolygon"
+    assert geojson["coordinates"][0][0][0] == [24.9123457, 60.1]
+    assert GEOSGeometry(stored.area_ewkt).equals_exact(
+        municipality.area, tolerance=1e-7
+    )
+
+
+@mark.django_db
+def test_formatted_areas_are_stored_when_area_changes():
+    municipality = MunicipalityFactory(area=_area())
+
+    municipality.area = MultiPolygon(Polygon.from_bbox((1, 2, 3, 4)), srid=4326)
+    municipality.save()
+
+    stored = Municipality.objects.only("area_geojson").get()
+    assert json.loads(stored.area_geojson)["coordinates"][0][0][0] == [1, 2]
+
+
+@mark.django_db
+def test_formatted_areas_are_deferred_by_default():
+    MunicipalityFactory(area=_area())
+
+    municipality = Municipality.objects.get()
+
+    assert municipality.get_deferred_fields() == {"area_geojson", "area_ewkt"}
+
+
+@mark.django_db
+@mark.parametrize("area_format", ["geojson", "ewkt"])
+def test_area_api_returns_stored_formatted_area(
+    api_client: APIClient, area_format: str
+):
+    municipality = MunicipalityFactory(area=_area())
+
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(
+            reverse("address:municipality-list"),
+            {"area": "true", "geom_format": area_format},
+        )
+
+    assert response.status_code == 200
+    area = response.json()["results"][0]["area"]
+    if area_format == "geojson":
+        assert area["coordinates"][0][0][0] == [24.9123457, 60.1]
+    else:
+        assert GEOSGeometry(area).equals_exact(municipality.area, tolerance=1e-7)
+    # The stored text is returned, not the area formatted anew
+    sql = " ".join(query["sql"] for query in queries.captured_queries)
+    assert f'"address_municipality"."area_{area_format}"' in sql
+    assert "ST_As" not in sql
+
+
+@mark.django_db
+def test_area_api_formats_area_with_other_precision(api_client: APIClient):
+    MunicipalityFactory(area=_area())
+
+    response = api_client.get(
+        reverse("address:municipality-list"),
+        {"area": "true", "geom_format": "geojson", "precision": 2},
+    )
+
+    assert response.status_code == 200
+    area = response.json()["results"][0]["area"]
+    assert area["coordinates"][0][0][0] == [24.91, 60.1]
+
+
+@mark.django_db
+def test_area_api_formats_area_with_other_default_precision(
+    api_client: APIClient, settings
+):
+    settings.COORDINATE_PRECISION = 3
+    MunicipalityFactory(area=_area())
+
+    response = api_client.get(
+        reverse("address:municipality-list"),
+        {"area": "true", "geom_format": "geojson"},
+    )
+
+    assert response.status_code == 200
+    area = response.json()["results"][0]["area"]
+    assert area["coordinates"][0][0][0] == [24.912, 60.1]
+
+
+def test_json_renderer_splices_raw_json():
+    data = {"area": RawJSON('{"type": "Point"}'), "name": "a", "list": [RawJSON("1")]}
+
+    rendered = JSONRenderer().render(data)
+
+    assert json.loads(rendered) == {
+        "area": {"type": "Point"},
+        "name": "a",
+        "list": [1],
+    }
+
+
+def test_check_formatted_area_precision(settings):
+    settings.COORDINATE_PRECISION = FORMATTED_AREA_PRECISION
+    assert check_formatted_area_precision(None) == []
+
+    settings.COORDINATE_PRECISION = FORMATTED_AREA_PRECISION - 1
+    (warning,) = check_formatted_area_precision(None)
+    assert warning.id == "address.W001"
@@ -0,0 +1,153 @@
+"""
+Tests for the binary geometry formats of the areas and the FlatGeobuf downloads.
+"""
+
+import base64
+
+from django.contrib.gis.geos import GEOSGeometry, MultiPolygon, Polygon
+from django.db import connection
+from django.urls import reverse
+from pytest import mark
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from address.api import streaming
+from address.api.serializers import MunicipalitySerializer
+from address.api.twkb import multipolygon_twkb
+from address.api.views import AddressViewSet
+from address.tests.factories import AddressFactory, MunicipalityFactory
+
+
+def _area() -> MultiPolygon:
+    return MultiPolygon(
+        Polygon.from_bbox((24.9012345678, 60.1012345678, 25.0, 60.2)), srid=4326
+    )
+
+
+def test_multipolygon_twkb():
+    area = MultiPolygon(Polygon.from_bbox((0, 0, 1, 1)), srid=4326)
+    assert multipolygon_twkb(area, 0) == bytes.fromhex("060001010500000002020000010100")
+
+
+@mark.django_db
+@mark.parametrize(
+    "area",
+    [
+        # A point repeated after rounding
+        Polygon(((0, 0), (0, 1), (0.01, 1), (1, 1), (1, 0), (0, 0))),
+        # A ring collapsing to a point, which keeps its minimum of points
+        Polygon(((0, 0), (0, 0.1), (0.1, 0.1), (0.1, 0), (0, 0))),
+        # A hole collapsing to a point
+        Polygon(
+            ((0, 0), (0, 3), (3, 3), (3, 0), (0, 0)),
+            ((1, 1), (1.1, 1), (1.1, 1.1), (1, 1.1), (1, 1)),
+        ),
+    ],
+)
+def test_multipolygon_twkb_matches_postgis(area: Polygon):
+    area = MultiPolygon(area, srid=4326)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT ST_AsTWKB(ST_GeomFromEWKB(%s), 0)", [memoryview(area.ewkb)]
+        )
+        (expected,) = cursor.fetchone()
+    assert multipolygon_twkb(area, 0) == bytes(expected)
+
+
+@mark.django_db
+@mark.parametrize("geom_format", ["wkb", "wkb_base64"])
+def test_municipality_area_as_wkb(api_client: APIClient, geom_format: str):
+    municipality = MunicipalityFactory(area=_area())
+
+    response = api_client.get(
+        reverse("address:municipality-list"),
+        {"area": "true", "geom_format": geom_format},
+    )
+
+    assert response.status_code == 200
+    area = response.json()["results"][0]["area"]
+    wkb = bytes.fromhex(area) if geom_format == "wkb" else base64.b64decode(area)
+    assert GEOSGeometry(memoryview(wkb)).equals_exact(municipality.area)
+
+
+@mark.django_db
+def test_municipality_area_as_twkb_matches_python_encoding(api_client: APIClient):
+    municipality = MunicipalityFactory(area=_area())
+
+    response = api_client.get(
+        reverse("address:municipality-list"),
+        {"area": "true", "geom_format": "twkb", "precision": 4},
+    )
+
+    assert response.status_code == 200
+    assert base64.b64decode(response.json()["results"][0]["area"]) == (
+        multipolygon_twkb(municipality.area, 4)
+    )
+
+
+@mark.django_db
+def test_serializer_formats_area_as_twkb():
+    municipality = MunicipalityFactory(area=_area())
+    params = {"area": "true", "geom_format": "twkb", "precision": 4}
+    request = Request(APIRequestFactory().get("/", params))
+
+    actual = MunicipalitySerializer(context={"request": request}).to_representation(
+        municipality
+    )
+
+    assert (
+        actual["area"]
+        == base64.b64encode(multipolygon_twkb(municipality.area, 4)).decode()
+    )
+
+
+@mark.django_db
+def test_download_addresses_as_flatgeobuf(api_client: APIClient):
+    AddressFactory()
+
+    response = api_client.get(reverse("address:address-list"), {"stream": "flatgeobuf"})
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/flatgeobuf"
+    assert b"".join(response.streaming_content).startswith(b"fgb\x03")
+
+
+@mark.django_db
+def test_download_addresses_as_flatgeobuf_in_chunks(api_client: APIClient, monkeypatch):
+    monkeypatch.setattr(streaming, "FLATGEOBUF_CHUNK_BYTES", 100)
+    AddressFactory()
+
+    response = api_client.get(reverse("address:address-list"), {"stream": "flatgeobuf"})
+
+    chunks = list(response.streaming_content)
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    assert b"".join(chunks).startswith(b"fgb\x03")
+
+
+@mark.django_db
+def test_download_addresses_as_flatgeobuf_returns_bad_request_if_too_many(
+    api_client: APIClient, monkeypatch
+):
+    monkeypatch.setattr(AddressViewSet, "flatgeobuf_max_rows", 1)
+    AddressFactory.create_batch(2)
+
+    response = api_client.get(reverse("address:address-list"), {"stream": "flatgeobuf"})
+
+    assert response.status_code == 400
+
+
+@mark.django_db
+def test_download_municipalities_as_flatgeobuf(api_client: APIClient):
+    MunicipalityFactory(name="Helsinki", area=_area())
+
+    response = api_client.get(
+        reverse("address:municipality-list"), {"stream": "flatgeobuf"}
+    )
+
+    assert response.status_code == 200
+    content = b"".join(response.streaming_content)
+    assert content.startswith(b"fgb\x03")
+    # The properties are stored in the header and the features
+    assert b"name_fi" in content
+    assert b"Helsinki" in content
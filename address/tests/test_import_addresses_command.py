@@ -1,7 +1,7 @@
 from django.core.management import call_command
 from pytest import mark
 
-from address.models import Address, Municipality, Street
+from address.models import Address, AddressSearch, Municipality, Street
 
 
 @mark.django_db
@@ -10,3 +10,4 @@ def test_import_addresses_creates_addresses_from_shapefile(shapefile):
     assert Municipality.objects.count() == 1
     assert Street.objects.count() == 7
     assert Address.objects.count() == 37
+    assert AddressSearch.objects.count() == 37
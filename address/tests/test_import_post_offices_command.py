@@ -2,13 +2,14 @@
 Tests for the import_post_offices management command.
 """
 
+import json
 import zipfile
 from pathlib import Path
 
 from django.core.management import call_command
 from pytest import mark
 
-from address.models import PostalCodeArea
+from address.models import AreaTopology, PostalCodeArea
 from address.tests.factories import PostalCodeAreaFactory
 
 
@@ -170,3 +171,17 @@ def test_import_post_offices_handles_whitespace(tmp_path):
         "sv": "HELSINGFORS",
         "en": "HELSINKI",
     }
+
+
+@mark.django_db
+def test_import_post_offices_rebuilds_topology(tmp_path):
+    """Test that the topology of the postal code areas has the new names."""
+    PostalCodeAreaFactory(postal_code="00900")
+
+    zip_file = tmp_path / "postal_codes.zip"
+    create_test_zip(zip_file, [("00900", "HELSINKI", "HELSINGFORS")])
+    call_command("import_post_offices", str(zip_file))
+
+    topology = json.loads(AreaTopology.objects.get(name="postal_code_area").topology)
+    (geometry,) = topology["objects"]["postal_code_area"]["geometries"]
+    assert geometry["properties"]["post_office_sv"] == "HELSINGFORS"
@@ -1,3 +1,5 @@
+from django.conf import settings
+from django.contrib.gis.geos import Point
 from pytest import mark
 
 from .factories import (
@@ -123,3 +125,14 @@ def test_address_string_representation_without_number_end_and_letter():
     address = AddressFactory(number_end="", letter="")
     expected = f"{address.street} {address.number}, {address.municipality}"
     assert str(address) == expected
+
+
+@mark.django_db
+def test_address_projected_location_follows_location():
+    address = AddressFactory(
+        location=Point(x=24.9428, y=60.1666, srid=settings.PROJECTION_SRID)
+    )
+    address.refresh_from_db()
+    assert address.projected_location.srid == settings.METRIC_PROJECTION_SRID
+    expected = address.location.transform(settings.METRIC_PROJECTION_SRID, clone=True)
+    assert address.projected_location.distance(expected) < 0.001
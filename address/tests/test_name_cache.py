@@ -0,0 +1,57 @@
+"""
+Tests for the cache of names resolved to ids.
+"""
+
+import logging
+
+from pytest import mark
+
+from address.models import DatasetVersion
+from address.services.name_cache import NameCache
+
+
+@mark.django_db
+def test_name_cache_resolves_names_missed_twice():
+    cache = NameCache(max_size=10, version_ttl=60)
+    assert cache.get(("street", "A"), lambda: frozenset({1})) is None
+    assert cache.get(("street", "A"), lambda: frozenset({1})) == {1}
+    assert cache.get(("street", "A"), lambda: frozenset({2})) == {1}
+    info = cache.info()
+    assert (info.hits, info.misses, info.size) == (1, 2, 1)
+
+
+@mark.django_db
+def test_name_cache_evicts_least_recently_used():
+    cache = NameCache(max_size=2, version_ttl=60)
+    for key, ids in [("A", {1}), ("B", {2}), ("A", {1}), ("C", {3})]:
+        cache.get(("street", key), lambda ids=ids: frozenset(ids))
+        cache.get(("street", key), lambda ids=ids: frozenset(ids))
+    assert cache.get(("street", "A"), lambda: frozenset()) == {1}
+    assert cache.get(("street", "B"), lambda: frozenset()) is None
+
+
+@mark.django_db
+def test_name_cache_is_invalidated_by_dataset_version():
+    cache = NameCache(max_size=10, version_ttl=0)
+    cache.get(("street", "A"), lambda: frozenset({1}))
+    cache.get(("street", "A"), lambda: frozenset({1}))
+    DatasetVersion.bump()
+    assert cache.get(("street", "A"), lambda: frozenset({2})) == {2}
+    assert cache.info().version == 1
+
+
+@mark.django_db
+def test_name_cache_logs_hits_and_misses_when_invalidated(caplog):
+    caplog.set_level(logging.INFO, logger="address.services.name_cache")
+    cache = NameCache(max_size=10, version_ttl=0)
+    for _ in range(3):
+        cache.get(("street", "A"), lambda: frozenset({1}))
+    DatasetVersion.bump()
+
+    cache.get(("street", "A"), lambda: frozenset({1}))
+
+    assert (
+        "Name cache of dataset version 0: 1 hits, 2 misses, 1 names cached"
+        in caplog.messages
+    )
+    assert (cache.info().hits, cache.info().misses) == (0, 1)
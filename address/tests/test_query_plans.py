@@ -0,0 +1,76 @@
+"""
+Tests that the case-insensitive name filters are answered from the UPPER() indexes.
+"""
+
+from django.db import connection
+from django.db.models import QuerySet
+from pytest import mark
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from address.api.views import AddressViewSet
+from address.models import Municipality, PostalCodeArea, Street
+
+
+def _address_queryset(params: dict) -> QuerySet:
+    view = AddressViewSet()
+    view.request = Request(APIRequestFactory().get("/", params))
+    view.format_kwarg = None
+    return view.get_queryset().order_by()
+
+
+def _explain(queryset: QuerySet) -> str:
+    # The test tables are empty, so sequential scans would always be the cheapest
+    with connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+    return queryset.explain()
+
+
+@mark.django_db
+@mark.parametrize(
+    "params,index",
+    [
+        ({"streetname": "Mannerheimintie"}, "idx_address_search_street_name_fi_upper"),
+        ({"municipality": "Helsinki"}, "idx_address_search_municipality_name_sv_upper"),
+        ({"postalcode": "00100"}, "idx_address_search_postal_code_upper"),
+        (
+            {"postalcodearea": "Kallio"},
+            "idx_address_search_postal_code_area_name_en_upper",
+        ),
+        ({"postoffice": "Helsinki"}, "idx_address_search_post_office_fi_upper"),
+    ],
+)
+def test_address_name_filters_use_upper_indexes(params: dict, index: str):
+    assert index in _explain(_address_queryset(params))
+
+
+@mark.django_db
+@mark.parametrize(
+    "queryset,index",
+    [
+        (
+            lambda: Street.objects.filter(translations__name__iexact="Mannerheimintie"),
+            "idx_street_name_upper",
+        ),
+        (
+            lambda: Municipality.objects.filter(translations__name__iexact="Helsinki"),
+            "idx_municipality_name_upper",
+        ),
+        (
+            lambda: PostalCodeArea.objects.filter(translations__name__iexact="Kallio"),
+            "idx_postal_area_name_upper",
+        ),
+        (
+            lambda: PostalCodeArea.objects.filter(
+                translations__post_office__iexact="Helsinki"
+            ),
+            "idx_post_office_upper",
+        ),
+        (
+            lambda: PostalCodeArea.objects.filter(postal_code__iexact="00100"),
+            "idx_postal_code_upper",
+        ),
+    ],
+)
+def test_model_name_filters_use_upper_indexes(queryset, index: str):
+    assert index in _explain(queryset())
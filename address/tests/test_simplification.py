@@ -0,0 +1,154 @@
+"""
+Tests for the simplified municipality and postal code areas.
+"""
+
+from django.contrib.gis.geos import GEOSGeometry, MultiPolygon, Point, Polygon
+from django.urls import reverse
+from pytest import mark
+from rest_framework.test import APIClient
+
+from address.models import Municipality, MunicipalitySimplification
+from address.services.simplification import (
+    SIMPLIFICATION_TOLERANCES,
+    precomputed_tolerance,
+    simplify_areas,
+    tolerance_for_zoom,
+)
+from address.tests.factories import MunicipalityFactory
+
+
+def _detailed_area() -> MultiPolygon:
+    # A circle with thousands of vertices, like a municipality with a long coastline
+    return MultiPolygon(
+        Point(25.0, 60.2, srid=4326).buffer(0.1, quadsegs=1000), srid=4326
+    )
+
+
+@mark.django_db
+def test_simplify_area_with_each_tolerance():
+    municipality = MunicipalityFactory(area=_detailed_area())
+
+    simplify_areas(Municipality)
+
+    simplifications = MunicipalitySimplification.objects.filter(
+        municipality=municipality
+    ).order_by("tolerance")
+    assert [s.tolerance for s in simplifications] == list(SIMPLIFICATION_TOLERANCES)
+    num_points = [s.area.num_points for s in simplifications]
+    assert num_points == sorted(num_points, reverse=True)
+    assert num_points[0] < municipality.area.num_points
+    assert all(s.area.valid for s in simplifications)
+
+
+def _wavy_halves() -> tuple[MultiPolygon, MultiPolygon]:
+    # Two halves of a box, sharing a boundary that zigzags about 30 meters
+    # sideways, which the tolerances of 50 meters and more simplify away
+    boundary = [(24.9 + 0.0005 * (i % 2), 60.1 + 0.2 * i / 200) for i in range(201)]
+    west = Polygon([(24.8, 60.3), (24.8, 60.1), *boundary, (24.8, 60.3)])
+    east = Polygon([*boundary, (25.0, 60.3), (25.0, 60.1), boundary[0]])
+    return MultiPolygon(west, srid=4326), MultiPolygon(east, srid=4326)
+
+
+@mark.django_db
+def test_simplified_neighbouring_areas_have_no_gaps_or_overlaps():
+    west, east = _wavy_halves()
+    MunicipalityFactory(name="Länsi", code="001", area=west)
+    MunicipalityFactory(name="Itä", code="002", area=east)
+
+    simplify_areas(Municipality)
+
+    for tolerance in SIMPLIFICATION_TOLERANCES:
+        simplified_west, simplified_east = [
+            s.area
+            for s in MunicipalitySimplification.objects.filter(
+                tolerance=tolerance
+            ).order_by("municipality__code")
+        ]
+        assert simplified_west.intersection(simplified_east).area < 1e-12
+        union = simplified_west.union(simplified_east)
+        assert union.geom_type == "Polygon"
+        assert union.num_interior_rings == 0
+    # The shared boundary is simplified to a straight line
+    simplified_west = MunicipalitySimplification.objects.get(
+        municipality__code="001", tolerance=50
+    ).area
+    assert simplified_west.num_points == 5
+
+
+@mark.django_db
+def test_simplify_replaces_previous_simplifications():
+    MunicipalityFactory(area=_detailed_area())
+    simplify_areas(Municipality)
+
+    simplify_areas(Municipality)
+
+    assert MunicipalitySimplification.objects.count() == len(SIMPLIFICATION_TOLERANCES)
+
+
+def test_precomputed_tolerance():
+    assert precomputed_tolerance(5) is None
+    assert precomputed_tolerance(10) == 10
+    assert precomputed_tolerance(100) == 50
+    assert precomputed_tolerance(10000) == 1000
+
+
+def test_tolerance_for_zoom():
+    assert tolerance_for_zoom(5) == 1000
+    assert tolerance_for_zoom(10) == 50
+    assert tolerance_for_zoom(18) is None
+
+
+@mark.django_db
+@mark.parametrize("params", [{"simplify": 300}, {"zoom": 8}])
+def test_municipality_api_returns_simplified_area(api_client: APIClient, params):
+    municipality = MunicipalityFactory(area=_detailed_area())
+    simplify_areas(Municipality)
+    simplified_area = MunicipalitySimplification.objects.get(
+        municipality=municipality, tolerance=250
+    ).area
+
+    response = api_client.get(
+        reverse("address:municipality-list"),
+        {"area": "true", "geom_format": "ewkt", **params},
+    )
+
+    assert response.status_code == 200
+    area = GEOSGeometry(response.json()["results"][0]["area"])
+    assert area.equals_exact(simplified_area, tolerance=1e-7)
+
+
+@mark.django_db
+def test_municipality_api_returns_full_area_below_smallest_tolerance(
+    api_client: APIClient,
+):
+    municipality = MunicipalityFactory(area=_detailed_area())
+    simplify_areas(Municipality)
+
+    response = api_client.get(
+        reverse("address:municipality-list"),
+        {"area": "true", "geom_format": "ewkt", "simplify": 1},
+    )
+
+    assert response.status_code == 200
+    area = GEOSGeometry(response.json()["results"][0]["area"])
+    assert area.equals_exact(municipality.area, tolerance=1e-7)
+
+
+@mark.django_db
+@mark.parametrize(
+    "params",
+    [
+        {"simplify": "x"},
+        {"simplify": -1},
+        {"zoom": "x"},
+        {"zoom": 23},
+        {"simplify": 10, "zoom": 10},
+    ],
+)
+def test_simplification_returns_bad_request_if_parameters_are_invalid(
+    api_client: APIClient, params: dict
+):
+    response = api_client.get(
+        reverse("address:postalcodearea-list"), {"area": "true", **params}
+    )
+    assert response.status_code == 400
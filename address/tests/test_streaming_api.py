@@ -0,0 +1,77 @@
+"""
+Tests for streaming the address, postal code area and municipality lists.
+"""
+
+import csv
+import json
+
+from django.urls import reverse
+from pytest import mark
+from rest_framework.test import APIClient
+
+from address.tests.factories import (
+    AddressFactory,
+    MunicipalityFactory,
+    PostalCodeAreaFactory,
+    StreetFactory,
+)
+
+
+def _content(response) -> str:
+    return b"".join(response.streaming_content).decode()
+
+
+@mark.django_db
+def test_stream_addresses_as_ndjson(api_client: APIClient):
+    helsinki = MunicipalityFactory(name="Helsinki", code="091")
+    for number in ["1", "2", "3"]:
+        AddressFactory(municipality=helsinki, number=number)
+    AddressFactory(municipality=MunicipalityFactory(name="Vantaa", code="092"))
+
+    response = api_client.get(
+        reverse("address:address-list"),
+        {"municipality": "Helsinki", "stream": "ndjson"},
+    )
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in _content(response).splitlines()]
+    assert [row["number"] for row in rows] == ["1", "2", "3"]
+    assert all(row["municipality"]["code"] == "091" for row in rows)
+
+
+@mark.django_db
+def test_stream_addresses_as_csv(api_client: APIClient):
+    address = AddressFactory(street=StreetFactory(name="Kalliotie"), number="4")
+
+    response = api_client.get(reverse("address:address-list"), {"stream": "csv"})
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "text/csv; charset=utf-8"
+    rows = list(csv.DictReader(_content(response).splitlines()))
+    assert len(rows) == 1
+    assert rows[0]["street.name.fi"] == "Kalliotie"
+    assert rows[0]["number"] == "4"
+    assert json.loads(rows[0]["location"])["coordinates"] == list(
+        address.location.coords
+    )
+
+
+@mark.django_db
+@mark.parametrize("url", ["address:postalcodearea-list", "address:municipality-list"])
+def test_stream_areas_as_csv(api_client: APIClient, url: str):
+    MunicipalityFactory(name="Helsinki", code="091")
+    PostalCodeAreaFactory(name="Kallio", postal_code="00530")
+
+    response = api_client.get(reverse(url), {"stream": "csv"})
+
+    assert response.status_code == 200
+    rows = list(csv.DictReader(_content(response).splitlines()))
+    assert len(rows) == 1
+    assert rows[0]["name.fi"] in ["Helsinki", "Kallio"]
+
+
+@mark.django_db
+def test_stream_returns_bad_request_if_format_is_invalid(api_client: APIClient):
+    response = api_client.get(reverse("address:address-list"), {"stream": "xml"})
+    assert response.status_code == 400
@@ -0,0 +1,63 @@
+"""
+Tests for the subdivided municipality and postal code areas.
+"""
+
+from django.contrib.gis.geos import MultiPolygon, Point
+from pytest import mark
+
+from address.models import Address, MunicipalitySubdivision
+from address.services.subdivision import (
+    MAX_SUBDIVISION_VERTICES,
+    subdivide,
+    update_addresses_within,
+)
+from address.tests.factories import AddressFactory, MunicipalityFactory
+
+
+def _detailed_area() -> MultiPolygon:
+    # A circle with thousands of vertices, like a municipality with a long coastline
+    return MultiPolygon(
+        Point(25.0, 60.2, srid=4326).buffer(0.1, quadsegs=1000), srid=4326
+    )
+
+
+@mark.django_db
+def test_subdivide_area_into_pieces_with_bounded_vertices():
+    municipality = MunicipalityFactory(area=_detailed_area())
+
+    subdivide(municipality)
+
+    pieces = MunicipalitySubdivision.objects.filter(municipality=municipality)
+    assert pieces.count() > 1
+    assert all(
+        piece.geometry.num_points <= MAX_SUBDIVISION_VERTICES for piece in pieces
+    )
+    union = pieces[0].geometry
+    for piece in pieces[1:]:
+        union = union.union(piece.geometry)
+    assert abs(union.area - municipality.area.area) < 1e-9
+
+
+@mark.django_db
+def test_subdivide_replaces_previous_pieces():
+    municipality = MunicipalityFactory(area=_detailed_area())
+    subdivide(municipality)
+    count = MunicipalitySubdivision.objects.count()
+
+    subdivide(municipality)
+
+    assert MunicipalitySubdivision.objects.count() == count
+
+
+@mark.django_db
+def test_update_addresses_within_area():
+    municipality = MunicipalityFactory(name="Helsinki", area=_detailed_area())
+    subdivide(municipality)
+    vantaa = MunicipalityFactory(name="Vantaa")
+    inside = AddressFactory(municipality=vantaa, location=Point(25.0, 60.2, srid=4326))
+    outside = AddressFactory(municipality=vantaa, location=Point(26.0, 60.2, srid=4326))
+
+    assert update_addresses_within(municipality) == 1
+
+    assert Address.objects.get(pk=inside.pk).municipality == municipality
+    assert Address.objects.get(pk=outside.pk).municipality == vantaa
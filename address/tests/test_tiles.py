@@ -0,0 +1,132 @@
+"""
+Tests for the vector tiles and the tile cache.
+"""
+
+import gzip
+
+from django.contrib.gis.geos import MultiPolygon, Polygon
+from django.core.management import call_command
+from django.urls import reverse
+from pytest import mark
+from rest_framework.test import APIClient
+
+from address.models import DatasetVersion
+from address.services.tile_cache import TileCache, tile_cache
+from address.services.tiles import (
+    ADDRESS_MIN_ZOOM,
+    TILE_LAYERS,
+    is_valid_tile,
+    render_tile,
+    tiles_within,
+)
+from address.tests.factories import MunicipalityFactory
+
+
+def _area() -> MultiPolygon:
+    return MultiPolygon(Polygon.from_bbox((24.9, 60.1, 25.0, 60.2)), srid=4326)
+
+
+def _tile_url(layer: str, z: int, x: int, y: int) -> str:
+    return reverse("address:tile", kwargs={"layer": layer, "z": z, "x": x, "y": y})
+
+
+def test_tiles_within_extent():
+    assert list(tiles_within((24.9, 60.1, 25.0, 60.2), 0, 1)) == [
+        (0, 0, 0),
+        (1, 1, 0),
+    ]
+    tiles = list(tiles_within((24.9, 60.1, 25.0, 60.2), 10, 10))
+    assert tiles == [(10, 582, 296), (10, 583, 296)]
+
+
+def test_is_valid_tile():
+    assert is_valid_tile(0, 0, 0)
+    assert is_valid_tile(2, 3, 3)
+    assert not is_valid_tile(2, 4, 0)
+    assert not is_valid_tile(-1, 0, 0)
+    assert not is_valid_tile(23, 0, 0)
+
+
+@mark.django_db
+def test_get_municipality_tile(api_client: APIClient):
+    MunicipalityFactory(name="Helsinki", code="091", area=_area())
+    [(z, x, y)] = tiles_within(_area().extent, 9, 9)
+
+    response = api_client.get(_tile_url("municipality", z, x, y))
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/vnd.mapbox-vector-tile"
+    assert b"municipality" in response.content
+    assert b"Helsinki" in response.content
+
+
+@mark.django_db
+def test_get_gzipped_tile(api_client: APIClient):
+    MunicipalityFactory(name="Helsinki", area=_area())
+
+    response = api_client.get(
+        _tile_url("municipality", 0, 0, 0), HTTP_ACCEPT_ENCODING="gzip"
+    )
+
+    assert response.status_code == 200
+    assert response["Content-Encoding"] == "gzip"
+    assert b"Helsinki" in gzip.decompress(response.content)
+
+
+@mark.django_db
+def test_address_tiles_are_empty_below_min_zoom():
+    assert render_tile(TILE_LAYERS["address"], ADDRESS_MIN_ZOOM - 1, 0, 0) == b""
+
+
+@mark.django_db
+@mark.parametrize("layer,z,x,y", [("street", 0, 0, 0), ("municipality", 1, 2, 0)])
+def test_get_tile_returns_not_found(api_client: APIClient, layer, z, x, y):
+    response = api_client.get(_tile_url(layer, z, x, y))
+    assert response.status_code == 404
+
+
+@mark.django_db
+def test_tile_cache_stores_tiles_until_import(tmp_path):
+    cache = TileCache(str(tmp_path), version_ttl=0)
+    renders = []
+
+    def render() -> bytes:
+        renders.append(1)
+        return b"tile"
+
+    assert gzip.decompress(cache.get("municipality", 1, 0, 0, render)) == b"tile"
+    cache.get("municipality", 1, 0, 0, render)
+    assert len(renders) == 1
+    assert (tmp_path / "municipality.mbtiles").exists()
+
+    DatasetVersion.bump()
+    cache.get("municipality", 1, 0, 0, render)
+    assert len(renders) == 2
+
+
+@mark.django_db
+def test_tile_cache_does_not_store_tiles_rendered_during_import(tmp_path):
+    cache = TileCache(str(tmp_path), version_ttl=3600)
+    renders = []
+
+    def render() -> bytes:
+        if not renders:
+            DatasetVersion.bump()
+        renders.append(1)
+        return b"tile"
+
+    cache.get("municipality", 1, 0, 0, render)
+    cache.get("municipality", 1, 0, 0, render)
+    assert len(renders) == 2
+
+
+@mark.django_db
+def test_seed_tiles_command(tmp_path, monkeypatch):
+    monkeypatch.setattr(tile_cache, "directory", str(tmp_path))
+    MunicipalityFactory(code="091", area=_area())
+
+    call_command("seed_tiles", "uusimaa", max_zoom=2, layer=["municipality"])
+
+    renders = []
+    tile_cache.get("municipality", 2, 2, 1, lambda: renders.append(1) or b"")
+    assert renders == []
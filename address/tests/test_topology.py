@@ -0,0 +1,156 @@
+"""
+Tests for the TopoJSON topologies of the areas.
+"""
+
+from django.contrib.gis.geos import MultiPolygon, Polygon
+from django.core.management import call_command
+from django.urls import reverse
+from pytest import approx, mark
+from rest_framework.test import APIClient
+
+from address.models import AreaTopology, PostalCodeArea
+from address.services.topology import (
+    build_topology,
+    filter_topology,
+    store_topology,
+)
+from address.tests.factories import PostalCodeAreaFactory
+
+
+def _square(xmin: float, ymin: float, xmax: float, ymax: float) -> MultiPolygon:
+    return MultiPolygon(Polygon.from_bbox((xmin, ymin, xmax, ymax)), srid=4326)
+
+
+def _decoded_rings(topology: dict, geometry: dict) -> list[list[tuple]]:
+    (scale_x, scale_y) = topology["transform"]["scale"]
+    (translate_x, translate_y) = topology["transform"]["translate"]
+    arcs = []
+    for arc in topology["arcs"]:
+        x = y = 0
+        points = []
+        for dx, dy in arc:
+            x, y = x + dx, y + dy
+            points.append((x * scale_x + translate_x, y * scale_y + translate_y))
+        arcs.append(points)
+    rings = []
+    for polygon in geometry["arcs"]:
+        for ring in polygon:
+            points = []
+            for index in ring:
+                arc = arcs[index] if index >= 0 else arcs[~index][::-1]
+                points.extend(arc if not points else arc[1:])
+            rings.append(points)
+    return rings
+
+
+def test_build_topology_shares_the_common_boundary():
+    topology = build_topology(
+        "areas",
+        [
+            (1, {"code": "1"}, _square(24.0, 60.0, 25.0, 61.0)),
+            (2, {"code": "2"}, _square(25.0, 60.0, 26.0, 61.0)),
+            (3, {"code": "3"}, None),
+        ],
+    )
+
+    geometries = topology["objects"]["areas"]["geometries"]
+    assert [g["id"] for g in geometries] == [1, 2, 3]
+    assert geometries[0]["properties"] == {"code": "1"}
+    assert geometries[2]["type"] is None
+    # The shared edge is one arc, which the second area traverses reversed
+    assert len(topology["arcs"]) == 3
+    arcs_1 = {index for ring in geometries[0]["arcs"][0] for index in ring}
+    arcs_2 = {
+        ~index for ring in geometries[1]["arcs"][0] for index in ring if index < 0
+    }
+    assert arcs_1 & arcs_2
+    (ring,) = _decoded_rings(topology, geometries[1])
+    assert ring[0] == ring[-1]
+    assert len(ring) == 5
+    assert Polygon(ring).extent == approx((25.0, 60.0, 26.0, 61.0), abs=1e-5)
+
+
+def test_filter_topology_keeps_only_the_arcs_of_the_areas():
+    topology = build_topology(
+        "areas",
+        [
+            (1, {}, _square(24.0, 60.0, 25.0, 61.0)),
+            (2, {}, _square(25.0, 60.0, 26.0, 61.0)),
+            (3, {}, _square(30.0, 60.0, 31.0, 61.0)),
+        ],
+    )
+
+    filtered = filter_topology(topology, {2})
+
+    (geometry,) = filtered["objects"]["areas"]["geometries"]
+    assert geometry["id"] == 2
+    assert len(filtered["arcs"]) == 2
+    (ring,) = _decoded_rings(filtered, geometry)
+    assert len(ring) == 5
+    assert Polygon(ring).extent == approx((25.0, 60.0, 26.0, 61.0), abs=1e-5)
+
+
+@mark.django_db
+def test_postal_code_area_api_returns_stored_topology(api_client: APIClient):
+    PostalCodeAreaFactory(postal_code="00100", area=_square(24.0, 60.0, 25.0, 61.0))
+    PostalCodeAreaFactory(postal_code="00200", area=_square(25.0, 60.0, 26.0, 61.0))
+    store_topology(PostalCodeArea)
+    # The stored topology is returned, not built anew
+    AreaTopology.objects.filter(name="postal_code_area").update(
+        topology='{"type":"Topology","objects":{},"arcs":[]}'
+    )
+
+    response = api_client.get(
+        reverse("address:postalcodearea-list"), {"format": "topojson"}
+    )
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/json"
+    assert response.json() == {"type": "Topology", "objects": {}, "arcs": []}
+
+
+@mark.django_db
+def test_postal_code_area_api_returns_filtered_topology(api_client: APIClient):
+    PostalCodeAreaFactory(postal_code="00100", area=_square(24.0, 60.0, 25.0, 61.0))
+    PostalCodeAreaFactory(postal_code="00200", area=_square(25.0, 60.0, 26.0, 61.0))
+    store_topology(PostalCodeArea)
+
+    response = api_client.get(
+        reverse("address:postalcodearea-list"),
+        {"format": "topojson", "postalcode": "00200"},
+    )
+
+    assert response.status_code == 200
+    topology = response.json()
+    (geometry,) = topology["objects"]["postal_code_area"]["geometries"]
+    assert geometry["properties"]["postal_code"] == "00200"
+    assert geometry["properties"]["name_fi"]
+    assert len(topology["arcs"]) == 2
+
+
+@mark.django_db
+def test_postal_code_area_api_returns_empty_topology_if_not_stored(
+    api_client: APIClient,
+):
+    PostalCodeAreaFactory(postal_code="00100", area=_square(24.0, 60.0, 25.0, 61.0))
+
+    response = api_client.get(
+        reverse("address:postalcodearea-list"), {"format": "topojson"}
+    )
+
+    assert response.status_code == 200
+    topology = response.json()
+    assert topology["objects"]["postal_code_area"]["geometries"] == []
+    assert topology["arcs"] == []
+    # The topology is built only by the imports
+    assert not AreaTopology.objects.exists()
+
+
+@mark.django_db
+def test_delete_address_data_deletes_topologies():
+    PostalCodeAreaFactory(postal_code="00100", area=_square(24.0, 60.0, 25.0, 61.0))
+    store_topology(PostalCodeArea)
+
+    call_command("delete_address_data")
+
+    assert not AreaTopology.objects.exists()
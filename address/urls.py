@@ -1,13 +1,27 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .api.views import AddressViewSet, MunicipalityViewSet, PostalCodeAreaViewSet
+from .api.tile_views import TileView
+from .api.views import (
+    AddressViewSet,
+    AreaLookupViewSet,
+    AutocompleteViewSet,
+    MunicipalityViewSet,
+    PostalCodeAreaViewSet,
+)
 
 router = DefaultRouter()
-router.register(r"address", AddressViewSet)
+router.register(r"address", AddressViewSet, basename="address")
 router.register(r"postal_code_area", PostalCodeAreaViewSet)
 router.register(r"municipality", MunicipalityViewSet)
+router.register(r"autocomplete", AutocompleteViewSet, basename="autocomplete")
+router.register(r"area_lookup", AreaLookupViewSet, basename="area-lookup")
 
 urlpatterns = [
     path("", include(router.urls)),
+    path(
+        "tiles/<str:layer>/<int:z>/<int:x>/<int:y>.mvt",
+        TileView.as_view(),
+        name="tile",
+    ),
 ]
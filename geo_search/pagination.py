@@ -1,10 +1,191 @@
+import json
+from dataclasses import dataclass
+from functools import cached_property, partial
 from urllib.parse import unquote
 
-from rest_framework.pagination import PageNumberPagination
+from django.core.paginator import EmptyPage, Page, Paginator
+from django.db.models import QuerySet
+from rest_framework.exceptions import ParseError
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+
+from .utils import strtobool
+
+
+class ExactCount:
+    """Count the results exactly with COUNT(*)."""
+
+    def count(self, queryset: QuerySet) -> tuple[int, bool]:
+        return queryset.count(), True
+
+
+@dataclass
+class CappedCount:
+    """
+    Count the results exactly up to the cap. Larger result sets are counted as
+    the cap, so the count stops after scanning the cap.
+    """
+
+    cap: int
+
+    def count(self, queryset: QuerySet) -> tuple[int, bool]:
+        count = queryset[: self.cap + 1].count()
+        if count > self.cap:
+            return self.cap, False
+        return count, True
+
+
+@dataclass
+class EstimatedCount:
+    """
+    Count the results exactly if the query planner estimates that there are less
+    than the threshold of them. Otherwise, use the planner estimate, which costs
+    only the planning of the query.
+    """
+
+    threshold: int
+
+    def count(self, queryset: QuerySet) -> tuple[int, bool]:
+        plan = json.loads(queryset.explain(format="json"))
+        # The plan is unwrapped from its list if the driver parsed the JSON
+        if isinstance(plan, list):
+            plan = plan[0]
+        estimate = plan["Plan"]["Plan Rows"]
+        if estimate < self.threshold:
+            return queryset.count(), True
+        return estimate, False
+
+
+class CountingPaginator(Paginator):
+    """
+    A paginator that counts the results with the given count strategy. If the
+    count is not exact, the pages are not limited by it, and the next page is
+    known to exist by fetching one extra result.
+    """
+
+    def __init__(self, object_list, per_page, count_strategy, **kwargs) -> None:
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_strategy = count_strategy
+
+    @cached_property
+    def _count(self) -> tuple[int, bool]:
+        return self.count_strategy.count(self.object_list)
+
+    @property
+    def count(self) -> int:
+        return self._count[0]
+
+    @property
+    def count_exact(self) -> bool:
+        return self._count[1]
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if self.count_exact:
+                raise
+            return int(number)
+
+    def page(self, number):
+        if self.count_exact:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        results = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not results and number > 1:
+            raise EmptyPage(self.error_messages["no_results"])
+        return InexactCountPage(
+            results[: self.per_page], number, self, len(results) > self.per_page
+        )
+
+
+class InexactCountPage(Page):
+    def __init__(self, object_list, number, paginator, has_next: bool) -> None:
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self) -> bool:
+        return self._has_next
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination ordered by the primary key. Each page continues from the
+    last key of the previous page, so every page costs the same regardless of
+    its depth, and the results are not counted.
+    """
+
+    ordering = "pk"
+    page_size_query_param = "page_size"
+
+    def decode_cursor(self, request):
+        # An empty cursor requests the first page
+        if not request.query_params.get(self.cursor_query_param):
+            return None
+        return super().decode_cursor(request)
 
 
 class Pagination(PageNumberPagination):
+    """
+    Page number pagination by default. Giving the `cursor` parameter, even
+    empty, switches to keyset pagination, see KeysetPagination.
+
+    The results are counted with the `count_strategy` of the view, exactly by
+    default. The `count_cap` parameter caps the count instead, see CappedCount.
+    Inexact counts are flagged with `"count_exact": false` in the response. With
+    the `count_only` parameter, only the count is returned.
+    """
+
     page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    count_only_query_param = "count_only"
+    count_cap_query_param = "count_cap"
+
+    keyset = None
+    count_only = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        count_strategy = self._count_strategy(request, view)
+        if strtobool(request.query_params.get(self.count_only_query_param)):
+            self.count_only = count_strategy.count(queryset)
+            return []
+        if self.cursor_query_param in request.query_params:
+            return self._paginate_by_keyset(queryset, request, view)
+        self.django_paginator_class = partial(
+            CountingPaginator, count_strategy=count_strategy
+        )
+        return super().paginate_queryset(queryset, request, view)
+
+    def _count_strategy(self, request, view):
+        count_cap = request.query_params.get(self.count_cap_query_param)
+        if count_cap is None:
+            return getattr(view, "count_strategy", None) or ExactCount()
+        try:
+            count_cap = int(count_cap)
+        except ValueError:
+            raise ParseError(f"'{self.count_cap_query_param}' must be an integer")
+        if count_cap < 1:
+            raise ParseError(f"'{self.count_cap_query_param}' must be positive")
+        return CappedCount(count_cap)
+
+    def _paginate_by_keyset(self, queryset, request, view):
+        if queryset.query.is_sliced or queryset.query.order_by not in [(), ("pk",)]:
+            raise ParseError(
+                f"'{self.cursor_query_param}' cannot be used with this search"
+            )
+        self.keyset = KeysetPagination()
+        return self.keyset.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.count_only:
+            count, exact = self.count_only
+            return Response(_flag_inexact({"count": count}, exact))
+        if self.keyset:
+            return self.keyset.get_paginated_response(data)
+        response = super().get_paginated_response(data)
+        _flag_inexact(response.data, self.page.paginator.count_exact)
+        return response
 
     def get_next_link(self):
         link = super().get_next_link()
@@ -17,3 +198,52 @@ class Pagination(PageNumberPagination):
         if link:
             link = unquote(link)
         return link
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": (
+                    "Pagination cursor. Give an empty value to get the first page "
+                    "by keyset pagination, and follow the `next` links from there. "
+                    "The pages are not counted. Cannot be used with `q` or "
+                    "`nearest`."
+                ),
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.count_only_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Return only the count of the results when set to "
+                "true or 1",
+                "schema": {"type": "boolean"},
+            },
+            {
+                "name": self.count_cap_query_param,
+                "required": False,
+                "in": "query",
+                "description": (
+                    "Count the results only up to this number, which is faster for "
+                    "large result sets. A larger count is returned as this number, "
+                    'and flagged with `"count_exact": false`.'
+                ),
+                "schema": {"type": "integer", "minimum": 1},
+            },
+        ]
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_exact"] = {
+            "type": "boolean",
+            "description": "Given as false if the count is an estimate or capped",
+        }
+        return response_schema
+
+
+def _flag_inexact(data: dict, exact: bool) -> dict:
+    if not exact:
+        data["count_exact"] = False
+    return data
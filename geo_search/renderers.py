@@ -0,0 +1,46 @@
+import re
+from uuid import uuid4
+
+from rest_framework import renderers
+
+
+class RawJSON:
+    """JSON text, e.g. a geometry formatted by PostGIS, rendered as is."""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    """
+    A JSON renderer splicing the RawJSON values into the rendered JSON as is,
+    without parsing them into Python objects first.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        raw_texts: list[str] = []
+        # The raw values are rendered as placeholder strings, which are then
+        # replaced with the texts. The token keeps the placeholders unique.
+        token = uuid4().hex
+
+        class Encoder(self.encoder_class):
+            def default(self, obj):
+                if isinstance(obj, RawJSON):
+                    raw_texts.append(obj.text)
+                    return f"{token}:{len(raw_texts) - 1}"
+                return super().default(obj)
+
+        self.encoder_class = Encoder
+        try:
+            rendered = super().render(data, accepted_media_type, renderer_context)
+        finally:
+            del self.encoder_class
+        if not raw_texts:
+            return rendered
+        return re.sub(
+            rf'"{token}:(\d+)"'.encode(),
+            lambda match: raw_texts[int(match[1])].encode(),
+            rendered,
+        )
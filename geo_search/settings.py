@@ -41,6 +41,11 @@ env = Env(
     SENTRY_TRACES_IGNORE_PATHS=(list, ["/healthz", "/readiness"]),
     REQUIRE_AUTHORIZATION=(bool, True),
     DJANGO_LOG_LEVEL=(str, "INFO"),
+    NAME_CACHE_SIZE=(int, 10000),
+    ADDRESS_JSON_IN_DATABASE=(bool, False),
+    DATASET_VERSION_TTL=(float, 60),
+    COORDINATE_PRECISION=(int, 7),
+    TILE_CACHE_DIR=(str, ""),
 )
 
 env_path = BASE_DIR / ".env"
@@ -175,9 +180,32 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # SRID for the locations stored in the application database
 PROJECTION_SRID = 4326  # WGS84
 
+# SRID for the metric copies of the locations, used for distances in meters
+METRIC_PROJECTION_SRID = 3067  # ETRS-TM35FIN
+
+# How often (in seconds) the in-memory caches of the data check whether the data
+# has been imported again
+DATASET_VERSION_TTL = env.float("DATASET_VERSION_TTL")
+
+# Maximum number of names in the per-process cache of the name filters
+NAME_CACHE_SIZE = env.int("NAME_CACHE_SIZE")
+
+# Whether the JSON of the address list pages is built by PostgreSQL instead of
+# the serializers, when the areas are not requested
+ADDRESS_JSON_IN_DATABASE = env.bool("ADDRESS_JSON_IN_DATABASE")
+
+# Default number of decimals of the coordinates in the API output. Seven decimals
+# of a degree are about a centimetre. The stored formatted areas are at
+# address.models.FORMATTED_AREA_PRECISION, which a system check compares to this.
+COORDINATE_PRECISION = env.int("COORDINATE_PRECISION")
+
+# Directory of the MBTiles files of the rendered vector tiles. The tiles are
+# rendered for every request if this is empty.
+TILE_CACHE_DIR = env.str("TILE_CACHE_DIR")
+
 REST_FRAMEWORK = {
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        "geo_search.renderers.JSONRenderer",
         "rest_framework.renderers.BrowsableAPIRenderer",
         "rest_framework_xml.renderers.XMLRenderer",
     ],